@@ -0,0 +1,70 @@
+"""Compare per-symbol fetching with multi-ticker batch fetching.
+
+Runs against the synthetic provider, so no network access is needed:
+
+    python benchmarks/bench_batch_fetch.py --symbols 500 --latency 0.15
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from typing import List
+
+from src.batch_fetch import BatchFetcher
+from src.providers import SyntheticProvider
+
+
+def run_legacy(provider: SyntheticProvider, symbols: List[str]) -> int:
+    """the old _process_batch loop: one request plus a 0.1s sleep per symbol"""
+    priced = 0
+    for symbol in symbols:
+        hist = provider.history(symbol, period='1y')
+        if not hist.empty:
+            priced += 1
+        time.sleep(0.1)
+    return priced
+
+
+def run_batch(provider: SyntheticProvider, symbols: List[str], batch_size: int) -> int:
+    fetcher = BatchFetcher(batch_size, provider)
+    priced = 0
+    for _, closes, _, _ in fetcher.fetch(symbols, period='1y'):
+        priced += closes.shape[1]
+    return priced
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.15, help='seconds per mock round trip')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--legacy-sample', type=int, default=50,
+                        help='symbols to time on the serial path before extrapolating (0 = all)')
+    args = parser.parse_args()
+
+    symbols = SyntheticProvider(universe_size=args.symbols).symbol_universe('sp500')
+
+    # the legacy path is strictly serial, so a sample scales linearly
+    sample = symbols if args.legacy_sample <= 0 else symbols[:args.legacy_sample]
+    provider = SyntheticProvider(latency=args.latency)
+    start = time.perf_counter()
+    run_legacy(provider, sample)
+    legacy_elapsed = (time.perf_counter() - start) * len(symbols) / len(sample)
+    legacy_requests = provider.requests * len(symbols) // len(sample)
+
+    provider = SyntheticProvider(latency=args.latency)
+    start = time.perf_counter()
+    priced = run_batch(provider, symbols, args.batch_size)
+    batch_elapsed = time.perf_counter() - start
+
+    print(f"symbols: {len(symbols)}  latency: {args.latency:.3f}s  batch size: {args.batch_size}")
+    note = "" if len(sample) == len(symbols) else f" (extrapolated from {len(sample)})"
+    print(f"per-symbol : {legacy_elapsed:8.2f}s  {legacy_requests:5d} requests{note}")
+    print(f"batched    : {batch_elapsed:8.2f}s  {provider.requests:5d} requests  {priced} priced")
+    print(f"speedup    : {legacy_elapsed / batch_elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure cold start of the interactive tool and fail past a time budget.
+
+Each run starts a fresh interpreter, imports main, shows the menu and exits
+(answers "0"). The child also records which heavy modules got imported and
+any socket connection attempted, both of which fail the check:
+
+    python benchmarks/bench_startup.py --runs 5 --budget 0.5
+"""
+import sys
+import os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import json
+import subprocess
+import time
+
+# modules that must not load before a menu option needs them
+HEAVY_MODULES = ['pandas', 'numpy', 'yfinance', 'matplotlib', 'pandas_market_calendars']
+
+CHILD = f"""
+import io, json, socket, sys, time
+start = time.perf_counter()
+connections = []
+def refuse(self, address, *args):
+    connections.append(str(address))
+    raise OSError("network disabled during startup benchmark")
+socket.socket.connect = refuse
+sys.stdin = io.StringIO("0\\n")
+sys.path.insert(0, {ROOT!r})
+import main
+imported = time.perf_counter()
+main.main()
+finished = time.perf_counter()
+sys.stderr.write(json.dumps({{
+    'import': imported - start,
+    'menu': finished - start,
+    'heavy': [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+    'connections': connections,
+}}) + "\\n")
+"""
+
+
+def run_once() -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, capture_output=True, text=True)
+    total = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup run failed:\n{proc.stderr}")
+    report = json.loads(proc.stderr.strip().splitlines()[-1])
+    report['process'] = total
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=0.5,
+                        help='max seconds from interpreter launch to exit (best of runs)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    reports = [run_once() for _ in range(args.runs)]
+    best = {key: min(report[key] for report in reports) for key in ('import', 'menu', 'process')}
+    heavy = sorted({name for report in reports for name in report['heavy']})
+    connections = sorted({address for report in reports for address in report['connections']})
+
+    failures = []
+    if best['process'] > args.budget:
+        failures.append(f"cold start {best['process']:.3f}s exceeds budget {args.budget:.3f}s")
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if connections:
+        failures.append(f"network connections at startup: {', '.join(connections)}")
+
+    if args.json:
+        print(json.dumps({'runs': args.runs, 'budget': args.budget, 'best': best, 'heavy_modules': heavy,
+                          'connections': connections, 'failures': failures}, indent=2))
+    else:
+        print(f"runs: {args.runs}  budget: {args.budget:.3f}s")
+        print(f"import main : {best['import'] * 1000:8.1f} ms")
+        print(f"menu shown  : {best['menu'] * 1000:8.1f} ms")
+        print(f"process     : {best['process'] * 1000:8.1f} ms")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
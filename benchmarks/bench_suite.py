@@ -0,0 +1,302 @@
+"""End-to-end benchmark suite on the synthetic, latency-injecting provider.
+
+Covers S&P 500 and all-market scans (cold and warm local store), custom
+periods, info lookups, trading-calendar checks and chart rendering. Each
+scenario reports wall time, throughput, per-stage timings and peak traced
+memory; results are written as JSON so two versions can be compared:
+
+    python benchmarks/bench_suite.py --output before.json
+    python benchmarks/bench_suite.py --output after.json --compare before.json
+    python benchmarks/bench_suite.py --only sp500_scan_cold,calendar --latency 0.2
+
+Everything runs in a throwaway cache directory and needs no network access.
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# keep the suite's price store, universe and calendar caches out of the user's cache
+os.environ['STOCK_ANALYZER_CACHE'] = tempfile.mkdtemp(prefix='stock-bench-')
+os.environ['STOCK_DATA_PROVIDER'] = 'synthetic'
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+
+from src.cross_section import summarize_returns
+from src.info_cache import InfoCache
+from src.ohlcv_store import OHLCVStore
+from src.providers import SyntheticProvider
+from src.ranking import StreamingTopK
+from src.stock_analysis import StockAnalysis
+from src.universe import MIN_UNIVERSE_SIZE, UniverseCache
+from src.visualization import StockVisualizer
+from utils import trading_calendar
+from utils.constants import CACHE_DIR
+from utils.validators import get_last_trading_day, is_market_open
+
+
+class Stages:
+    """accumulate named stage timings inside one scenario"""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+
+class Suite:
+    """scenarios sharing one provider configuration
+
+    Each returns (items processed, unit, extra fields). Setting extra['seconds']
+    replaces the scenario's wall time as its headline (to leave out setup).
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        # build the calendar and run one tiny scan up front, so one-time setup
+        # (calendar build, thread pools, lazy imports) lands in no scenario
+        is_market_open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            warmup = SyntheticProvider(universe_size=20)
+            self.analysis(warmup, 'warmup').scheduler.fetch(warmup.symbol_universe('sp500'), period=args.period)
+
+    def provider(self) -> SyntheticProvider:
+        return SyntheticProvider(latency=self.args.latency, jitter=self.args.jitter,
+                                 universe_size=self.args.universe)
+
+    def analysis(self, provider: SyntheticProvider, name: str) -> StockAnalysis:
+        """fresh analysis with its own empty price store and universe cache"""
+        root = os.path.join(CACHE_DIR, name)
+        shutil.rmtree(root, ignore_errors=True)
+        analysis = StockAnalysis(provider, OHLCVStore(os.path.join(root, 'ohlcv')))
+        analysis.universe = UniverseCache(provider, directory=os.path.join(root, 'universe'))
+        return analysis
+
+    def _scan(self, stages: Stages, analysis: StockAnalysis, sp500: bool):
+        """one movers scan broken into universe / fetch / compute / rank stages"""
+        with stages('universe'):
+            symbols = analysis._get_all_stock_symbols(sp500)
+        with stages('fetch'):
+            results, stats = analysis.scheduler.fetch(symbols, period=self.args.period)
+        with stages('compute'):
+            tables = [summarize_returns(r.closes, r.volumes) for r in results if not r.closes.empty]
+        with stages('rank'):
+            ranking = StreamingTopK(20)
+            for table in tables:
+                ranking.push(table)
+            ranking.leaderboard()
+        return len(symbols)
+
+    def _scan_scenario(self, stages: Stages, name: str, sp500: bool, warm: bool):
+        """staged scan plus an end-to-end get_gainers_losers, each on a store in the same state
+
+        The end-to-end time is the scenario's headline number.
+        """
+        provider = self.provider()
+        staged = self.analysis(provider, name + '_staged')
+        full = self.analysis(provider, name)
+        if warm:
+            # fill both stores first; only the second scans are measured
+            with contextlib.redirect_stdout(io.StringIO()):
+                staged.get_gainers_losers(self.args.period, 20, sp500)
+                full.get_gainers_losers(self.args.period, 20, sp500)
+        count = self._scan(stages, staged, sp500)
+        requests_before = provider.requests
+        with stages('end_to_end'):
+            full.get_gainers_losers(self.args.period, 20, sp500)
+        return count, 'symbols', {'requests': provider.requests - requests_before,
+                                  'seconds': stages.seconds['end_to_end']}
+
+    def sp500_scan_cold(self, stages: Stages):
+        return self._scan_scenario(stages, 'sp500_cold', True, warm=False)
+
+    def sp500_scan_warm(self, stages: Stages):
+        return self._scan_scenario(stages, 'sp500_warm', True, warm=True)
+
+    def all_market_scan(self, stages: Stages):
+        return self._scan_scenario(stages, 'all_cold', False, warm=False)
+
+    def custom_period(self, stages: Stages):
+        provider = self.provider()
+        analysis = self.analysis(provider, 'custom')
+        end = get_last_trading_day(datetime.now() - timedelta(days=7))
+        start = end - timedelta(days=90)
+        with stages('custom_period'):
+            df = analysis.get_custom_period_data(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), True)
+        return len(df), 'symbols', {'requests': provider.requests}
+
+    def info_lookups(self, stages: Stages):
+        provider = self.provider()
+        symbols = provider.symbol_universe('sp500')[:self.args.info_symbols]
+        cache = InfoCache(provider, quote_ttl=0)
+        with stages('cold'):
+            cache.get_many(symbols)
+        with stages('quote_refresh'):
+            cache.get_many(symbols)
+        cache.quote_ttl = 3600
+        with stages('warm'):
+            for symbol in symbols:
+                cache.get(symbol)
+        return len(symbols) * 3, 'lookups', {'requests': provider.requests}
+
+    def calendar(self, stages: Stages):
+        trading_calendar._calendar = None
+        with stages('load'):
+            is_market_open()
+        base = datetime(2024, 1, 2, 10, 30)
+        moments = [base + timedelta(hours=7 * i) for i in range(self.args.calendar_checks)]
+        with stages('is_market_open'):
+            for moment in moments:
+                is_market_open(moment)
+        with stages('last_trading_day'):
+            for moment in moments:
+                get_last_trading_day(moment)
+        return len(moments) * 2, 'checks', {}
+
+    def chart(self, stages: Stages):
+        provider = self.provider()
+        analysis = self.analysis(provider, 'chart')
+        visualizer = StockVisualizer()
+        symbols = provider.symbol_universe('sp500')[:self.args.charts]
+        for symbol in symbols:
+            with stages('data'):
+                data = analysis.display_stock_graph(symbol, '1y')
+            with stages('render'):
+                visualizer.save_stock_chart(data, symbol, '1y', io.BytesIO())
+        return len(symbols), 'charts', {}
+
+
+SCENARIOS = ['sp500_scan_cold', 'sp500_scan_warm', 'all_market_scan', 'custom_period',
+             'info_lookups', 'calendar', 'chart']
+
+
+def measure(run: Callable[[Stages], tuple], repeat: int, memory: bool = True) -> Dict:
+    """time a scenario `repeat` times (median run reported), then trace one more run for peak memory
+
+    tracemalloc slows allocation-heavy code several times over, so the
+    memory run is kept out of the timings.
+    """
+    runs = []
+    for _ in range(repeat):
+        stages = Stages()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            count, unit, extra = run(stages)
+        elapsed = time.perf_counter() - start
+        runs.append({'seconds': elapsed, 'count': count, 'unit': unit, 'stages': stages.seconds, **extra})
+        runs[-1]['wall_seconds'] = elapsed
+
+    result = dict(sorted(runs, key=lambda run: run['seconds'])[len(runs) // 2])
+    result['throughput'] = result['count'] / result['seconds'] if result['seconds'] else 0.0
+    result['runs'] = [round(run['seconds'], 4) for run in runs]
+    result['stdev'] = statistics.pstdev(result['runs']) if len(runs) > 1 else 0.0
+
+    result['peak_mb'] = None
+    if memory:
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(Stages())
+        result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def compare(results: Dict, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['scenarios']
+    print(f"\nversus {baseline_path}:")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = (result['seconds'] - old['seconds']) / old['seconds'] * 100 if old['seconds'] else 0.0
+        print(f"  {name:18s} {old['seconds']:8.3f}s -> {result['seconds']:8.3f}s  ({change:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', help='comma-separated scenarios (default: all)')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per mock round trip')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency per request')
+    parser.add_argument('--universe', type=int, default=500,
+                        help=f"S&P size, at least {MIN_UNIVERSE_SIZE['sp500']}; all-market is 12x")
+    parser.add_argument('--period', default='1mo', help='scan period')
+    parser.add_argument('--info-symbols', type=int, default=100)
+    parser.add_argument('--calendar-checks', type=int, default=5000)
+    parser.add_argument('--charts', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced peak-memory run')
+    parser.add_argument('--output', help='write JSON results here')
+    parser.add_argument('--compare', help='baseline JSON results to compare against')
+    args = parser.parse_args()
+
+    if args.universe < MIN_UNIVERSE_SIZE['sp500']:
+        # smaller listings are rejected as incomplete and the scan falls back to 50 defaults
+        parser.error(f"--universe must be at least {MIN_UNIVERSE_SIZE['sp500']}")
+    names = args.only.split(',') if args.only else SCENARIOS
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    suite = Suite(args)
+    results = {}
+    for name in names:
+        result = measure(getattr(suite, name), args.repeat, not args.no_memory)
+        results[name] = result
+        stages = '  '.join(f"{stage} {seconds:.3f}s" for stage, seconds in result['stages'].items())
+        peak = f"peak {result['peak_mb']:7.1f} MB" if result['peak_mb'] is not None else ""
+        print(f"{name:18s} {result['seconds']:8.3f}s  {result['throughput']:10.1f} {result['unit']}/s  "
+              f"{peak}  | {stages}")
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'params': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'scenarios': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nresults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,73 @@
 # import required modules
+# (pandas, yfinance and matplotlib load inside the menu options that use them,
+# so the menu comes up without them)
 from src.menu import Menu
-from src.stock_data import StockData
-from src.stock_analysis import StockAnalysis
-from src.visualization import StockVisualizer
 from utils.constants import MenuOptions, TIME_PERIODS
-from src.utils import display_dataframe, validate_dates
-from datetime import datetime
-import pandas as pd
+import os
+import sys
 import time
-from typing import Dict
+from typing import Dict, TYPE_CHECKING
 from utils.validators import validate_ticker, validate_dates
-from src.stock_info import StockInfo
+from utils.logging import log_failed_analysis
+from src.display import display_dataframe
 
-def display_dataframe(df: pd.DataFrame, title: str = ""):
-    """format and display dataframes"""
-    # check if data exists
-    if df.empty:
-        print("\nNo data available")
-        return
-        
-    # print title if provided
-    if title:
-        print(f"\n{title}")
-    print("-" * 80)
-    
-    # format numbers for display
-    if 'Change%' in df.columns:
-        df = df.copy()
-        df['Change%'] = df['Change%'].apply(lambda x: f"{x:+.2f}%")
-        df['Start Price'] = df['Start Price'].apply(lambda x: f"${x:,.2f}")
-        df['End Price'] = df['End Price'].apply(lambda x: f"${x:,.2f}")
-        df['Volume'] = df['Volume'].apply(lambda x: f"{x:,}")
-    
-    print(df.to_string(index=False))
-    print("-" * 80)
+if TYPE_CHECKING:
+    from src.stock_analysis import StockAnalysis
 
-def log_failed_analysis(ticker: str, period: str, error_msg: str):
-    """Log failed stock analysis attempts"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    with open("failed_analysis.txt", "a") as f:
-        if not f.tell():  # If file is empty, write header
-            f.write(f"Analysis Date: {timestamp}\n")
-            f.write(f"Period: {period}\n\n")
-        f.write(f"{ticker}: {error_msg}\n")
+_stock_analysis = None
+
+def get_result_limit(label: str) -> int:
+    """ask how many rows to show"""
+    while True:
+        try:
+            limit = input(f"\nHow many {label} would you like to see? (min = 1, default = 20): ").strip()
+            if not limit:  # If user just hits enter, use default
+                return 20
+            limit = int(limit)
+            if 1 <= limit <= 100:
+                return limit
+            print("Please enter a number between 1 and 100")
+        except ValueError:
+            print("Please enter a valid number")
+
+def get_stock_analysis() -> 'StockAnalysis':
+    """create the analysis engine on first use"""
+    global _stock_analysis
+    if _stock_analysis is None:
+        from src.stock_analysis import StockAnalysis
+        _stock_analysis = StockAnalysis()
+    return _stock_analysis
+
+def show_multi_period_movers(limit: int, analyze_sp500: bool):
+    """gainers and losers for every daily period from one fetch"""
+    try:
+        print("\nFetching data... This might take a few minutes.")
+        start_time = time.time()
+        report, available_stocks = get_stock_analysis().get_multi_period_movers(None, limit, analyze_sp500)
+        if report.empty:
+            print("\nNo data available")
+            return
+        print(f"\nAnalysis completed in {time.time() - start_time:.2f} seconds")
+        for (period, side), rows in report.groupby(['Period', 'Side'], sort=False):
+            title = f"Top {len(rows)} {'Gainers' if side == 'gainer' else 'Losers'} ({period})"
+            display_dataframe(rows.drop(columns=['Period', 'Side', 'Rank']), title)
+    except ValueError as e:
+        print(f"\nError: {e}")
+        log_failed_analysis("Analysis", "all", str(e))
+
+def write_metrics():
+    """refresh the run report named by STOCK_ANALYZER_METRICS (and its .prom twin) after each action"""
+    path = os.environ.get('STOCK_ANALYZER_METRICS')
+    if not path:
+        return
+    from src.metrics import get_metrics
+    metrics = get_metrics()
+    metrics.write_report(path)
+    metrics.write_prometheus(os.path.splitext(path)[0] + '.prom')
 
 def main():
     # initialize main objects
     menu = Menu()
-    stock_analysis = StockAnalysis()
-    visualizer = StockVisualizer()
     
     # main program loop
     while True:
@@ -63,28 +81,22 @@ def main():
             
             # handle gainers/losers analysis    
             if choice == MenuOptions.GAINERS_LOSERS:
-                period = menu.display_time_periods()
+                period = menu.display_time_periods(include_all=True)
                 if period == "0":
                     continue
                 
-                while True:
-                    try:
-                        limit = input("\nHow many top gainers/losers would you like to see? (min = 1, default = 20): ").strip()
-                        if not limit:  # If user just hits enter, use default
-                            limit = 20
-                            break
-                        limit = int(limit)
-                        if 1 <= limit <= 100:
-                            break
-                        print("Please enter a number between 1 and 100")
-                    except ValueError:
-                        print("Please enter a valid number")
+                limit = get_result_limit("top gainers/losers")
                 
                 analyze_sp500 = menu.get_analysis_scope()
+                if period == "all":
+                    show_multi_period_movers(limit, analyze_sp500)
+                    write_metrics()
+                    input("\nPress Enter to continue...")
+                    continue
                 try:
                     print("\nFetching data... This might take a few minutes.")
                     start_time = time.time()
-                    gainers, losers, available_stocks = stock_analysis.get_gainers_losers(period, limit, analyze_sp500)
+                    gainers, losers, available_stocks = get_stock_analysis().get_gainers_losers(period, limit, analyze_sp500)
                     elapsed_time = time.time() - start_time
                     
                     if gainers.empty or losers.empty:
@@ -120,14 +132,16 @@ def main():
                         continue
                 
                 print("\nFetching data... This might take a few minutes.")
-                data = stock_analysis.get_custom_period_data(start_date, end_date, analyze_all)
-                display_dataframe(data, "Custom Period Analysis")
+                data = get_stock_analysis().get_custom_period_data(start_date, end_date, analyze_all)
+                # full-market results run to thousands of rows; page them on a terminal
+                display_dataframe(data, "Custom Period Analysis", pause=sys.stdin.isatty())
             
             # handle stock info display    
             elif choice == MenuOptions.STOCK_INFO:
                 ticker = input("Enter the stock ticker symbol (ex. AAPL): ").upper()
                 try:
                     validate_ticker(ticker)
+                    from src.stock_info import StockInfo
                     info = StockInfo.get_basic_info(ticker)
                     
                     print(f"\nStock Information for {ticker}")
@@ -171,14 +185,62 @@ def main():
                     continue
                     
                 try:
-                    data = stock_analysis.display_stock_graph(ticker, period)
-                    visualizer.plot_stock_data(data, ticker, period)
+                    data = get_stock_analysis().display_stock_graph(ticker, period)
+                    from src.visualization import StockVisualizer
+                    StockVisualizer().plot_stock_data(data, ticker, period)
                 except Exception as e:
                     print(f"Error creating graph: {e}")
             
+            # handle volatility ranking
+            elif choice == MenuOptions.VOLATILITY:
+                period = menu.display_volatility_periods()
+                if period == "0":
+                    continue
+                
+                limit = get_result_limit("most/least volatile stocks")
+                analyze_sp500 = menu.get_analysis_scope()
+                try:
+                    print("\nFetching data... This might take a few minutes.")
+                    start_time = time.time()
+                    most, least, available_stocks = get_stock_analysis().get_volatility_ranking(period, limit, analyze_sp500)
+                    elapsed_time = time.time() - start_time
+                    
+                    if most.empty:
+                        print("\nNo data available for the selected period")
+                    else:
+                        actual_limit = min(limit, available_stocks)
+                        print(f"\nAnalysis completed in {elapsed_time:.2f} seconds")
+                        display_dataframe(most, f"Top {actual_limit} Most Volatile (annualized)")
+                        display_dataframe(least, f"Top {actual_limit} Least Volatile (annualized)")
+                except ValueError as e:
+                    error_msg = str(e)
+                    print(f"\nError: {error_msg}")
+                    log_failed_analysis("Volatility", period, error_msg)
+            
+            # handle live movers board
+            elif choice == MenuOptions.LIVE_MONITOR:
+                window = menu.display_monitor_windows()
+                if window == "0":
+                    continue
+                
+                limit = get_result_limit("top gainers/losers")
+                analyze_sp500 = menu.get_analysis_scope()
+                try:
+                    from src.live_monitor import LiveMoversMonitor
+                    analysis = get_stock_analysis()
+                    symbols = analysis._get_all_stock_symbols(analyze_sp500)
+                    print("\nStarting live monitor... press Ctrl+C to return to the menu.")
+                    LiveMoversMonitor(analysis, window, limit).run(symbols)
+                except ValueError as e:
+                    error_msg = str(e)
+                    print(f"\nError: {error_msg}")
+                    log_failed_analysis("Monitor", window, error_msg)
+            
             else:
                 print("Invalid option. Please try again.")
             
+            write_metrics()
+            
             # wait for user input before continuing
             if choice != MenuOptions.EXIT:
                 input("\nPress Enter to continue...")
@@ -189,4 +251,8 @@ def main():
                 input("\nPress Enter to continue...")
 
 if __name__ == "__main__":
+    # any arguments run a single non-interactive command (see src/cli.py)
+    if len(sys.argv) > 1:
+        from src import cli
+        sys.exit(cli.main(sys.argv[1:]))
     main()
\ No newline at end of file
@@ -13,4 +13,10 @@ setup(
         'pandas_market_calendars>=4.1.4',
         'pytz>=2023.3'
     ],
+    extras_require={
+        'parquet': ['pyarrow>=12.0.0'],
+    },
+    entry_points={
+        'console_scripts': ['stock-analyzer=src.cli:main'],
+    },
 ) 
\ No newline at end of file
@@ -0,0 +1,110 @@
+# import required modules
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+
+class AIMDController:
+    """additive-increase / multiplicative-decrease limits for concurrency and request rate
+
+    Every `concurrency` successes in a row raise both limits by one step. A rate
+    limit (429) response, or a sustained error ratio above `error_threshold`,
+    halves them. Decreases are spaced by `cooldown` seconds so one burst of
+    concurrent failures only counts once.
+    """
+
+    def __init__(self, concurrency: int = 4, rate: float = 4.0, min_concurrency: int = 1,
+                 max_concurrency: int = 16, min_rate: float = 0.5, max_rate: float = 20.0,
+                 rate_step: float = 1.0, decrease: float = 0.5, error_threshold: float = 0.25,
+                 cooldown: float = 1.0):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.decrease = decrease
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+
+        self.error_ratio = 0.0  # exponentially weighted share of failed requests
+        self.successes = 0
+        self.decreases = 0
+        self.peak_concurrency = concurrency
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def start_scan(self):
+        """start per-scan stats afresh; the learned limits carry over"""
+        with self._lock:
+            self.peak_concurrency = self.concurrency
+
+    def record_success(self):
+        with self._lock:
+            self.error_ratio *= 0.9
+            self.successes += 1
+            if self.successes >= self.concurrency:
+                self.successes = 0
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                self.rate = min(self.max_rate, self.rate + self.rate_step)
+                self.peak_concurrency = max(self.peak_concurrency, self.concurrency)
+
+    def record_failure(self, rate_limited: bool = False):
+        with self._lock:
+            self.error_ratio = self.error_ratio * 0.9 + 0.1
+            self.successes = 0
+            if not rate_limited and self.error_ratio < self.error_threshold:
+                return
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.decreases += 1
+            self.concurrency = max(self.min_concurrency, int(self.concurrency * self.decrease))
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+
+class AdaptiveSlots:
+    """async context manager admitting at most controller.concurrency holders at a time
+
+    Calls abandoned after a timeout keep their worker thread busy, so they
+    stay counted against the limit until that thread actually returns.
+    """
+
+    def __init__(self, controller: AIMDController):
+        self.controller = controller
+        self.in_flight = 0
+        self.abandoned = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight + self.abandoned < self.controller.concurrency)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def abandon(self, future: Future):
+        """keep counting a timed-out call until its worker thread finishes"""
+        loop = asyncio.get_running_loop()
+        self.abandoned += 1
+
+        def finished(_):
+            try:
+                loop.call_soon_threadsafe(lambda: loop.create_task(self._release_abandoned()))
+            except RuntimeError:
+                # the scan is over and its loop closed; nothing is waiting on the slot
+                pass
+
+        future.add_done_callback(finished)
+
+    async def _release_abandoned(self):
+        async with self._condition:
+            self.abandoned -= 1
+            self._condition.notify_all()
@@ -0,0 +1,217 @@
+# import required modules
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from src.adaptive_concurrency import AIMDController, AdaptiveSlots
+from src.batch_fetch import BatchFetcher
+from src.metrics import get_metrics
+from src.providers import RateLimitError
+
+
+class TokenBucket:
+    """async token bucket: sustained `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class BatchResult:
+    """outcome of one batch request
+
+    Frames are left out of repr(): asyncio.run formats the main task's result
+    while restoring the SIGINT handler, and printing every frame took seconds.
+    """
+    symbols: List[str]
+    closes: pd.DataFrame = field(repr=False)
+    volumes: pd.DataFrame = field(repr=False)
+    failed: List[str]
+    attempts: int = 1
+    error: Optional[str] = None
+    retry_pass: int = 0  # 0 for the main pass, 1+ for requeued symbols
+    fields: Dict[str, pd.DataFrame] = field(default_factory=dict, repr=False)  # every OHLCV field, time x symbol
+
+
+@dataclass
+class FetchStats:
+    """throughput and latency for one scan"""
+    symbols: int = 0
+    priced: int = 0
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    requeued: int = 0
+    peak_concurrency: int = 0
+    final_concurrency: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.symbols / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def coverage(self) -> float:
+        return self.priced / self.symbols if self.symbols else 1.0
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Fetched {self.priced}/{self.symbols} symbols in {self.elapsed:.2f}s "
+            f"({self.throughput:.1f} symbols/s, {self.requests} requests, {self.retries} retries) "
+            f"latency p50 {self.percentile(50):.2f}s p99 {self.percentile(99):.2f}s",
+            f"Coverage: {self.coverage * 100:.1f}% priced, {self.requeued} symbols requeued, "
+            f"{self.rate_limited} rate limited, concurrency peak {self.peak_concurrency} final {self.final_concurrency}",
+        ]
+        if self.missing:
+            lines.append(f"Note: {len(self.missing)} symbols could not be priced and are missing from the results")
+        return "\n".join(lines)
+
+
+class AsyncFetchScheduler:
+    """run batch requests concurrently under adaptive concurrency and a token-bucket rate limit
+
+    Symbols that fail in the main pass are requeued into up to `retry_passes`
+    follow-up passes instead of being dropped.
+    """
+
+    def __init__(self, fetcher: BatchFetcher, concurrency: int = 4, rate: float = 4.0,
+                 timeout: float = 30.0, retries: int = 1, backoff: float = 0.5, retry_passes: int = 1,
+                 controller: Optional[AIMDController] = None):
+        self.fetcher = fetcher
+        self.controller = controller or AIMDController(concurrency=concurrency, rate=rate)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_passes = retry_passes
+
+    async def _fetch_batch(self, batch: List[str], history_kwargs: dict, bucket: TokenBucket,
+                           slots: AdaptiveSlots, executor: ThreadPoolExecutor,
+                           stats: FetchStats, retry_pass: int) -> BatchResult:
+        """fetch one batch with timeout and jittered exponential-backoff retries"""
+        symbols = self.fetcher.clean(batch)
+        error = None
+        metrics = get_metrics()
+
+        for attempt in range(1, self.retries + 2):
+            async with slots:
+                bucket.rate = self.controller.rate
+                await bucket.acquire()
+                started = time.perf_counter()
+                stats.requests += 1
+                # the provider call is blocking, so it runs on the worker pool; the timeout is passed
+                # down too, since cancelling the wait here can't stop the worker thread
+                future = executor.submit(self.fetcher.provider.bulk_history, symbols,
+                                         **{'timeout': self.timeout, **history_kwargs})
+                try:
+                    wide = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+                    latency = time.perf_counter() - started
+                    stats.latencies.append(latency)
+                    metrics.observe('fetch_latency_seconds', latency)
+                    metrics.inc('fetch_requests_total', outcome='ok')
+                    self.controller.record_success()
+                    fields, failed = self.fetcher.split_fields(wide, symbols)
+                    return BatchResult(symbols, fields.get('Close', pd.DataFrame()), fields.get('Volume', pd.DataFrame()),
+                                       failed, attempt, retry_pass=retry_pass, fields=fields)
+                except Exception as e:
+                    if not future.done():
+                        slots.abandon(future)
+                    latency = time.perf_counter() - started
+                    stats.latencies.append(latency)
+                    rate_limited = isinstance(e, RateLimitError)
+                    metrics.observe('fetch_latency_seconds', latency)
+                    metrics.inc('fetch_requests_total', outcome='rate_limited' if rate_limited else 'error')
+                    stats.rate_limited += rate_limited
+                    self.controller.record_failure(rate_limited)
+                    error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+            if attempt <= self.retries:
+                stats.retries += 1
+                metrics.inc('fetch_retries_total')
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+        return BatchResult(symbols, pd.DataFrame(), pd.DataFrame(), symbols, self.retries + 1, error, retry_pass)
+
+    async def fetch_async(self, symbols: List[str], on_result: Optional[Callable[[BatchResult], None]] = None,
+                          keep_frames: bool = True, **history_kwargs) -> Tuple[List[BatchResult], FetchStats]:
+        """fetch every symbol and return results (main pass in batch order, then retry passes) plus scan stats
+
+        With keep_frames=False the price frames are released once on_result has
+        consumed them, so memory stays flat for streaming consumers.
+        """
+        stats = FetchStats(symbols=len(symbols))
+        self.controller.start_scan()
+        bucket = TokenBucket(self.controller.rate, capacity=self.controller.concurrency)
+        slots = AdaptiveSlots(self.controller)
+        started = time.perf_counter()
+        results: List[BatchResult] = []
+        pending = list(symbols)
+
+        executor = ThreadPoolExecutor(max_workers=self.controller.max_concurrency)
+        try:
+            async def run(batch, retry_pass):
+                result = await self._fetch_batch(batch, history_kwargs, bucket, slots, executor, stats, retry_pass)
+                if on_result is not None:
+                    on_result(result)
+                if not keep_frames:
+                    result.closes = result.volumes = pd.DataFrame()
+                    result.fields = {}
+                return result
+
+            for retry_pass in range(self.retry_passes + 1):
+                if retry_pass:
+                    stats.requeued += len(pending)
+                    await asyncio.sleep(self.backoff * random.uniform(0.5, 1.5))
+                batches = list(self.fetcher.batches(pending))
+                pass_results = await asyncio.gather(*(run(batch, retry_pass) for batch in batches))
+                results.extend(pass_results)
+                pending = [symbol for result in pass_results for symbol in result.failed]
+                if not pending:
+                    break
+        finally:
+            # don't wait on calls abandoned after a timeout; they finish (and are dropped) in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        stats.elapsed = time.perf_counter() - started
+        stats.missing = pending
+        metrics = get_metrics()
+        metrics.inc('fetch_symbols_total', len(symbols))
+        metrics.inc('fetch_requeued_symbols_total', stats.requeued)
+        metrics.inc('fetch_failed_symbols_total', len(pending))
+        stats.priced = len(symbols) - len(pending)
+        stats.peak_concurrency = self.controller.peak_concurrency
+        stats.final_concurrency = self.controller.concurrency
+        return results, stats
+
+    def fetch(self, symbols: List[str], on_result: Optional[Callable[[BatchResult], None]] = None,
+              keep_frames: bool = True, **history_kwargs) -> Tuple[List[BatchResult], FetchStats]:
+        """blocking wrapper around fetch_async"""
+        return asyncio.run(self.fetch_async(symbols, on_result, keep_frames, **history_kwargs))
@@ -0,0 +1,78 @@
+# import required modules
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+
+from src.providers import MarketDataProvider, PRICE_FIELDS, get_provider
+
+
+class BatchFetcher:
+    """download price history for many symbols in multi-ticker requests"""
+
+    def __init__(self, batch_size: int = 50, provider: Optional[MarketDataProvider] = None):
+        self.batch_size = batch_size
+        self.provider = provider or get_provider()
+
+    def batches(self, symbols: List[str]) -> Iterator[List[str]]:
+        """split symbols into request sized batches"""
+        for i in range(0, len(symbols), self.batch_size):
+            yield symbols[i:i + self.batch_size]
+
+    @staticmethod
+    def clean(symbols: List[str]) -> List[str]:
+        """strip display decorations from symbols"""
+        return [sym.strip('$').strip() for sym in symbols]
+
+    def fetch_batch(self, symbols: List[str], **history_kwargs) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+        """fetch one batch and return (closes, volumes, failed symbols)"""
+        clean_symbols = self.clean(symbols)
+        try:
+            wide = self.provider.bulk_history(clean_symbols, **history_kwargs)
+        except Exception:
+            return pd.DataFrame(), pd.DataFrame(), clean_symbols
+        return self.split_batch(wide, clean_symbols)
+
+    def split_batch(self, wide: Optional[pd.DataFrame], clean_symbols: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+        """split a bulk response into (closes, volumes, failed symbols)"""
+        frames, failed = self.split_fields(wide, clean_symbols)
+        return frames.get('Close', pd.DataFrame()), frames.get('Volume', pd.DataFrame()), failed
+
+    def split_fields(self, wide: Optional[pd.DataFrame], clean_symbols: List[str]) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+        """split a bulk response into {field: time x symbol frame} for priced symbols, plus failed symbols"""
+        frames = split_wide_frame(wide, clean_symbols)
+        closes = frames.get('Close', pd.DataFrame())
+
+        # symbols with no close at all count as failed
+        priced = set(closes.columns[closes.notna().any()]) if not closes.empty else set()
+        failed = [sym for sym in clean_symbols if sym not in priced]
+        if not priced:
+            return {}, failed
+        columns = [sym for sym in clean_symbols if sym in priced]
+        return {field: frame.reindex(columns=columns) for field, frame in frames.items()}, failed
+
+    def fetch(self, symbols: List[str], **history_kwargs) -> Iterator[Tuple[List[str], pd.DataFrame, pd.DataFrame, List[str]]]:
+        """fetch all symbols batch by batch, yielding (batch, closes, volumes, failed)"""
+        for batch in self.batches(symbols):
+            closes, volumes, failed = self.fetch_batch(batch, **history_kwargs)
+            yield batch, closes, volumes, failed
+
+
+def split_wide_frame(wide: Optional[pd.DataFrame], symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """split a multi-ticker download into one time x symbol frame per price field"""
+    if wide is None or wide.empty:
+        return {}
+
+    frames = {}
+    if isinstance(wide.columns, pd.MultiIndex):
+        # yfinance puts the price field on the outer level with group_by='column',
+        # and the ticker on the outer level with group_by='ticker'
+        field_level = 0 if set(wide.columns.get_level_values(0)) & set(PRICE_FIELDS) else 1
+        for field in PRICE_FIELDS:
+            if field in wide.columns.get_level_values(field_level):
+                frame = wide.xs(field, axis=1, level=field_level)
+                frames[field] = frame.reindex(columns=[sym for sym in symbols if sym in frame.columns])
+    else:
+        # single ticker downloads come back with flat columns
+        for field in PRICE_FIELDS:
+            if field in wide.columns and symbols:
+                frames[field] = wide[[field]].rename(columns={field: symbols[0]})
+    return frames
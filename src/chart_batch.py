@@ -0,0 +1,165 @@
+# import required modules
+import io
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from src.async_fetch import BatchResult
+from src.metrics import get_metrics
+
+# chart size inside a contact sheet (inches at `SHEET_DPI`)
+SHEET_CHART_SIZE = (6.0, 4.0)
+SHEET_DPI = 80
+
+
+def leaderboard_symbols(*frames: pd.DataFrame) -> List[str]:
+    """symbols from get_gainers_losers (or any frames with a Symbol column), in order, without repeats"""
+    symbols = []
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame) and 'Symbol' in frame.columns:
+            symbols.extend(frame['Symbol'].astype(str))
+    return list(dict.fromkeys(symbols))
+
+
+def _chart_frames(result: BatchResult) -> Dict[str, pd.DataFrame]:
+    """one OHLCV + moving-average frame per symbol from a batch's time x symbol fields"""
+    closes = result.fields.get('Close')
+    if closes is None or closes.empty:
+        return {}
+
+    frames = {}
+    for symbol in closes.columns:
+        frame = pd.DataFrame({name: field[symbol] for name, field in result.fields.items() if symbol in field})
+        frame = frame[frame['Close'].notna()]
+        if frame.empty:
+            continue
+        # same windows as display_stock_graph, over the symbol's own bars: the batch's shared
+        # index has gaps wherever another symbol traded and this one didn't
+        if len(frame) >= 20:
+            frame['SMA_20'] = frame['Close'].rolling(20).mean()
+        if len(frame) >= 50:
+            frame['SMA_50'] = frame['Close'].rolling(50).mean()
+        frames[symbol] = frame
+    return frames
+
+
+def _render(data: pd.DataFrame, ticker: str, period: str, format: str, size: Tuple[float, float],
+            dpi: int) -> bytes:
+    """render one chart to bytes (runs in a worker process)"""
+    from src.visualization import StockVisualizer
+
+    return StockVisualizer(width=size[0], height=size[1], dpi=dpi).render_chart(data, ticker, period, format)
+
+
+class ChartBatch:
+    """charts for many symbols: histories fetched in bulk, rendered in a process pool
+
+    Rendering starts as soon as each fetch batch lands, so downloading and
+    drawing overlap. Charts go to a directory (one file per symbol) and/or
+    one contact sheet.
+    """
+
+    def __init__(self, analysis, workers: Optional[int] = None):
+        self.analysis = analysis
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    def render(self, symbols: Iterable[str], period: str = '6mo',
+               styles: Sequence[Tuple[str, Tuple[float, float], int]] = (('png', (12, 8), 100),)
+               ) -> Tuple[List[Dict[str, bytes]], List[str]]:
+        """([{symbol: image bytes} in input order, per (format, size, dpi) style], symbols without data)
+
+        Each symbol is fetched and turned into a chart frame once, then drawn
+        in every style.
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not symbols:
+            return [{} for _ in styles], []
+
+        futures: Dict[Tuple[str, int], Future] = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # start the workers before the fetch threads do
+            pool.submit(int).result()
+
+            def on_result(result: BatchResult):
+                for symbol, frame in _chart_frames(result).items():
+                    for position, (format, size, dpi) in enumerate(styles):
+                        futures[symbol, position] = pool.submit(_render, frame, symbol, period, format, size, dpi)
+
+            metrics = get_metrics()
+            with metrics.span('fetch', symbols=len(symbols)):
+                _, stats = self.analysis.scheduler.fetch(symbols, on_result, keep_frames=False, period=period)
+            with metrics.span('render', charts=len(futures)):
+                rendered = [{} for _ in styles]
+                for symbol in symbols:
+                    for position, images in enumerate(rendered):
+                        future = futures.get((symbol, position))
+                        if future is not None:
+                            try:
+                                images[symbol] = future.result()
+                            except Exception as e:
+                                print(f"Could not render {symbol}: {e}")
+
+        self.analysis._log_failed_symbols(stats.missing, period, len(symbols), source='chart')
+        return rendered, [symbol for symbol in symbols if not all(symbol in images for images in rendered)]
+
+    def write(self, symbols: Iterable[str], period: str = '6mo', directory: Optional[str] = None,
+              format: str = 'png', sheet: Optional[str] = None, columns: int = 4) -> Tuple[List[str], int, List[str]]:
+        """per-symbol files in `directory` and/or a contact sheet at `sheet`, from one fetch
+
+        Returns (paths written, charts on the sheet, symbols without data).
+        """
+        styles = []
+        if directory:
+            styles.append((format, (12, 8), 100))
+        if sheet:
+            styles.append(('png', SHEET_CHART_SIZE, SHEET_DPI))
+        rendered, missing = self.render(symbols, period, styles)
+        paths = _save_directory(rendered.pop(0), directory, period, format) if directory else []
+        count = _save_contact_sheet(rendered.pop(0), sheet, columns) if sheet else 0
+        return paths, count, missing
+
+    def write_directory(self, symbols: Iterable[str], directory: str, period: str = '6mo',
+                        format: str = 'png') -> Tuple[List[str], List[str]]:
+        """one <SYMBOL>_<period>.<format> file per symbol; returns (paths written, symbols without data)"""
+        paths, _, missing = self.write(symbols, period, directory=directory, format=format)
+        return paths, missing
+
+    def write_contact_sheet(self, symbols: Iterable[str], path: str, period: str = '6mo',
+                            columns: int = 4) -> Tuple[int, List[str]]:
+        """tile small charts into one PNG, `columns` per row; returns (charts on the sheet, symbols without data)"""
+        _, count, missing = self.write(symbols, period, sheet=path, columns=columns)
+        return count, missing
+
+
+def _save_directory(images: Dict[str, bytes], directory: str, period: str, format: str) -> List[str]:
+    """one <SYMBOL>_<period>.<format> file per image; returns the paths written"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for symbol, image in images.items():
+        path = os.path.join(directory, f"{symbol}_{period}.{format}")
+        with open(path, 'wb') as f:
+            f.write(image)
+        paths.append(path)
+    return paths
+
+
+def _save_contact_sheet(images: Dict[str, bytes], path: str, columns: int) -> int:
+    """tile PNG charts into one PNG, `columns` per row; returns the charts on the sheet"""
+    from matplotlib import image as mpimg
+
+    if not images:
+        raise ValueError("No charts to put on the contact sheet")
+
+    tiles = [mpimg.imread(io.BytesIO(image), format='png') for image in images.values()]
+    height, width, channels = tiles[0].shape
+    rows = -(-len(tiles) // columns)
+    sheet = np.ones((rows * height, min(columns, len(tiles)) * width, channels), dtype=tiles[0].dtype)
+    for position, tile in enumerate(tiles):
+        row, column = divmod(position, columns)
+        sheet[row * height:(row + 1) * height, column * width:(column + 1) * width] = tile[:height, :width]
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    mpimg.imsave(path, sheet, format='png')
+    return len(tiles)
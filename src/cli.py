@@ -0,0 +1,414 @@
+# non-interactive command line
+#
+# every menu action as a subcommand whose flags replace the prompts, e.g.
+#   python main.py movers --period 1d,5d,1mo --scope sp500,all --limit 10 --format csv
+#   python main.py movers --combined --period 1d,5d,1mo,ytd,1y     (one download for all periods)
+#   python main.py custom-period --start 2024-01-02 --end 2024-03-28 -o q1.parquet
+#   python main.py info AAPL MSFT --format json
+#   python main.py volatility --period 3mo --metric Parkinson%
+#   python main.py chart AAPL --period 6mo -o aapl.png
+#   python main.py serve --host 0.0.0.0 --port 8000
+#   python main.py failures --by symbol,error_class --since 7d
+#   python main.py charts --movers 1d --limit 20 --sheet movers.png
+#   python main.py charts AAPL MSFT NVDA --period 1y --out-dir charts/
+#   python main.py monitor --window 15m --limit 10               (live board, redrawn every minute)
+#   python main.py --metrics-json run.json --profile scan.prof movers --scope all
+#
+# results go to stdout (or --output); progress and notes go to stderr so the
+# output can be piped. Exit status is 0 on success, 1 on errors.
+import argparse
+import contextlib
+import os
+import sys
+from typing import List, Optional
+import pandas as pd
+
+from utils.constants import TIME_PERIODS, INTRADAY_PERIODS, REGULAR_PERIODS
+
+FORMATS = ['csv', 'json', 'parquet']
+SCOPES = {'sp500': True, 'all': False}
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _periods(allowed: List[str]):
+    def parse(value: str) -> List[str]:
+        periods = _split(value)
+        invalid = [period for period in periods if period not in allowed]
+        if invalid or not periods:
+            raise argparse.ArgumentTypeError(f"invalid period {', '.join(invalid)}; choose from {', '.join(allowed)}")
+        return periods
+    return parse
+
+
+def _scopes(value: str) -> List[str]:
+    scopes = _split(value)
+    invalid = [scope for scope in scopes if scope not in SCOPES]
+    if invalid or not scopes:
+        raise argparse.ArgumentTypeError(f"invalid scope {', '.join(invalid)}; choose from {', '.join(SCOPES)}")
+    return scopes
+
+
+def _limit(value: str) -> int:
+    limit = int(value)
+    if limit < 1:
+        raise argparse.ArgumentTypeError("limit must be at least 1")
+    return limit
+
+
+def _group_fields(value: str) -> List[str]:
+    from utils.logging import GROUP_FIELDS
+
+    fields = _split(value)
+    invalid = [name for name in fields if name not in GROUP_FIELDS]
+    if invalid or not fields:
+        raise argparse.ArgumentTypeError(f"invalid field {', '.join(invalid)}; choose from {', '.join(GROUP_FIELDS)}")
+    return fields
+
+
+def _age(value: str) -> float:
+    """'12h', '7d' or '2w' as seconds"""
+    units = {'h': 3600, 'd': 86400, 'w': 7 * 86400}
+    try:
+        return float(value[:-1]) * units[value[-1].lower()]
+    except (KeyError, ValueError, IndexError):
+        raise argparse.ArgumentTypeError("age must look like 12h, 7d or 2w")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='stock-analyzer', description="Stock analysis scans without prompts")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="write a JSON run report (stage timings, fetch latencies, cache hit ratios)")
+    parser.add_argument('--metrics-prom', metavar='PATH', help="write the run's metrics in Prometheus text format")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="cProfile and tracemalloc the command; raw stats go to PATH, a summary to the report")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def output_flags(command: argparse.ArgumentParser):
+        command.add_argument('-f', '--format', choices=FORMATS,
+                             help="output format (default: from --output extension, else csv)")
+        command.add_argument('-o', '--output', help="output file (default: stdout)")
+
+    movers = commands.add_parser('movers', help="top gainers and losers")
+    movers.add_argument('--period', type=_periods(list(TIME_PERIODS)),
+                        help="period or comma-separated periods (default: 1d, or every daily period with --combined)")
+    movers.add_argument('--combined', action='store_true',
+                        help="download daily bars once for the longest period and derive every shorter one; "
+                             "each period is measured from the close before it starts")
+    movers.add_argument('--scope', type=_scopes, default=['sp500'],
+                        help="sp500, all, or both comma-separated (default: sp500)")
+    movers.add_argument('--limit', type=_limit, default=20, help="rows per side (default: 20)")
+    output_flags(movers)
+
+    custom = commands.add_parser('custom-period', help="returns of every stock between two dates")
+    custom.add_argument('--start', required=True, help="start date YYYY-MM-DD")
+    custom.add_argument('--end', required=True, help="end date YYYY-MM-DD")
+    custom.add_argument('--scope', type=_scopes, default=['sp500'], help="sp500 or all (default: sp500)")
+    custom.add_argument('--limit', type=_limit, help="keep only the first N rows")
+    output_flags(custom)
+
+    info = commands.add_parser('info', help="basic info for one or more tickers")
+    info.add_argument('tickers', nargs='+', help="ticker symbols")
+    output_flags(info)
+
+    volatility_periods = [period for period in REGULAR_PERIODS if period != '1d']
+    volatility = commands.add_parser('volatility', help="most and least volatile stocks")
+    volatility.add_argument('--period', type=_periods(volatility_periods), default=['3mo'],
+                            help="period or comma-separated periods (default: 3mo)")
+    volatility.add_argument('--scope', type=_scopes, default=['sp500'],
+                            help="sp500, all, or both comma-separated (default: sp500)")
+    volatility.add_argument('--limit', type=_limit, default=20, help="rows per side (default: 20)")
+    volatility.add_argument('--metric', default='Realized Vol%', help="ranking column (default: 'Realized Vol%%')")
+    output_flags(volatility)
+
+    chart = commands.add_parser('chart', help="price chart image, or its data with --format")
+    chart.add_argument('ticker', help="ticker symbol")
+    chart.add_argument('--period', type=_periods(list(TIME_PERIODS)), default=['1y'], help="period (default: 1y)")
+    chart.add_argument('-o', '--output', help="image file, .png or .svg (default: <TICKER>_<period>.png)")
+    chart.add_argument('-f', '--format', choices=FORMATS, help="write the chart data instead of an image")
+
+    charts = commands.add_parser('charts', help="charts for many symbols or a movers leaderboard, rendered in parallel")
+    charts.add_argument('symbols', nargs='*', help="ticker symbols (or use --movers)")
+    charts.add_argument('--movers', type=_periods(list(TIME_PERIODS)),
+                        help="chart the gainers and losers of this movers period instead")
+    charts.add_argument('--scope', type=_scopes, default=['sp500'], help="movers scope: sp500 or all (default: sp500)")
+    charts.add_argument('--limit', type=_limit, default=20, help="movers per side (default: 20)")
+    charts.add_argument('--period', type=_periods(list(REGULAR_PERIODS)), default=['6mo'],
+                        help="chart period (default: 6mo)")
+    charts.add_argument('--out-dir', help="write one image per symbol here")
+    charts.add_argument('--sheet', help="write one contact-sheet PNG with every chart")
+    charts.add_argument('--columns', type=_limit, default=4, help="charts per contact-sheet row (default: 4)")
+    charts.add_argument('--image-format', choices=['png', 'svg'], default='png', help="per-symbol image format")
+    charts.add_argument('--workers', type=_limit, help="render processes (default: CPU count, at most 8)")
+
+    monitor = commands.add_parser('monitor', help="live intraday movers board, polled and redrawn in place")
+    monitor.add_argument('--window', choices=list(INTRADAY_PERIODS), default='15m',
+                         help="rolling window the board ranks on (default: 15m)")
+    monitor.add_argument('--interval', choices=['1m', '2m', '5m', '15m', '30m'], default='1m',
+                         help="bar size to poll (default: 1m)")
+    monitor.add_argument('--scope', type=_scopes, default=['sp500'], help="sp500 or all (default: sp500)")
+    monitor.add_argument('--limit', type=_limit, default=20, help="rows per side (default: 20)")
+    monitor.add_argument('--cadence', type=float, help="seconds between polls (default: one bar)")
+    monitor.add_argument('--budget', type=float, default=10.0,
+                         help="seconds a polling cycle may take before it is flagged (default: 10)")
+    monitor.add_argument('--cycles', type=_limit, help="stop after N polls (default: until Ctrl+C)")
+    output_flags(monitor)
+
+    failures = commands.add_parser('failures', help="journaled failures grouped by symbol, period or error class")
+    failures.add_argument('--by', type=_group_fields, default=['symbol'],
+                          help="comma-separated fields: symbol, period, error_class, source (default: symbol)")
+    failures.add_argument('--since', type=_age, help="only failures newer than this, e.g. 24h, 7d")
+    failures.add_argument('--limit', type=_limit, help="keep only the first N groups")
+    failures.add_argument('--systematic', action='store_true',
+                          help="list the symbols excluded from scans for failing repeatedly")
+    output_flags(failures)
+
+    serve = commands.add_parser('serve', help="run the HTTP API (see src/server.py)")
+    serve.add_argument('--host', default='127.0.0.1', help="bind address (default: 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=8000, help="port (default: 8000)")
+    serve.add_argument('--result-ttl', type=float, default=30,
+                       help="seconds to reuse a finished scan for identical requests (default: 30)")
+
+    return parser
+
+
+def _output_format(args: argparse.Namespace) -> str:
+    # serve and charts produce no frame and have no output flags
+    if getattr(args, 'format', None):
+        return args.format
+    extension = os.path.splitext(getattr(args, 'output', None) or '')[1].lstrip('.').lower()
+    return extension if extension in FORMATS else 'csv'
+
+
+def write_frame(df: pd.DataFrame, output_format: str, output: Optional[str] = None):
+    """write a result frame as csv/json/parquet to a file or stdout"""
+    if output_format == 'parquet':
+        buffer = sys.stdout.buffer if output is None else output
+        df.to_parquet(buffer, index=False)
+        return
+
+    if output_format == 'json':
+        text = df.to_json(orient='records', date_format='iso', indent=2) + '\n'
+    else:
+        text = df.to_csv(index=False)
+
+    if output is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    else:
+        with open(output, 'w') as f:
+            f.write(text)
+
+
+def _ranked(first: pd.DataFrame, second: pd.DataFrame, labels: List[str], **columns) -> pd.DataFrame:
+    """stack the two sides of a ranking with Side/Rank (and any fixed) columns in front"""
+    parts = []
+    for label, frame in zip(labels, (first, second)):
+        frame = frame.reset_index(drop=True)
+        frame.insert(0, 'Rank', range(1, len(frame) + 1))
+        frame.insert(0, 'Side', label)
+        parts.append(frame)
+    ranked = pd.concat(parts, ignore_index=True)
+    for position, (name, value) in enumerate(columns.items()):
+        ranked.insert(position, name, value)
+    return ranked
+
+
+def run_movers(args: argparse.Namespace, analysis) -> pd.DataFrame:
+    if args.combined:
+        return run_combined_movers(args, analysis)
+    frames = []
+    for scope in args.scope:
+        for period in args.period or ['1d']:
+            gainers, losers, _ = analysis.get_gainers_losers(period, args.limit, SCOPES[scope])
+            if not gainers.empty:
+                frames.append(_ranked(gainers, losers, ['gainer', 'loser'], Scope=scope, Period=period))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run_combined_movers(args: argparse.Namespace, analysis) -> pd.DataFrame:
+    periods = args.period or list(REGULAR_PERIODS)
+    intraday = [period for period in periods if period not in REGULAR_PERIODS]
+    if intraday:
+        raise ValueError(f"--combined works on daily bars; drop {', '.join(intraday)}")
+    frames = []
+    for scope in args.scope:
+        report, _ = analysis.get_multi_period_movers(periods, args.limit, SCOPES[scope])
+        if not report.empty:
+            report.insert(0, 'Scope', scope)
+            frames.append(report)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run_custom_period(args: argparse.Namespace, analysis) -> pd.DataFrame:
+    if len(args.scope) != 1:
+        raise ValueError("custom-period takes a single scope")
+    df = analysis.get_custom_period_data(args.start, args.end, SCOPES[args.scope[0]])
+    return df.head(args.limit) if args.limit else df
+
+
+def run_info(args: argparse.Namespace, analysis) -> pd.DataFrame:
+    from src.info_cache import get_info_cache
+    from src.stock_info import StockInfo
+    from utils.validators import validate_ticker
+
+    tickers = [ticker.upper() for ticker in args.tickers]
+    # one concurrent warm-up, then each lookup is served from the cache
+    get_info_cache().get_many(tickers)
+    rows = []
+    for ticker in tickers:
+        validate_ticker(ticker)
+        rows.append({'Symbol': ticker, **StockInfo.get_basic_info(ticker)})
+    return pd.DataFrame(rows)
+
+
+def run_volatility(args: argparse.Namespace, analysis) -> pd.DataFrame:
+    frames = []
+    for scope in args.scope:
+        for period in args.period:
+            most, least, _ = analysis.get_volatility_ranking(period, args.limit, SCOPES[scope], args.metric)
+            if not most.empty:
+                frames.append(_ranked(most, least, ['most', 'least'], Scope=scope, Period=period))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run_chart(args: argparse.Namespace, analysis) -> Optional[pd.DataFrame]:
+    from utils.validators import validate_ticker
+
+    ticker = args.ticker.upper()
+    period = args.period[0]
+    validate_ticker(ticker)
+    data = analysis.display_stock_graph(ticker, period)
+    if args.format:
+        return data.rename_axis('Date').reset_index()
+
+    from src.visualization import StockVisualizer
+
+    path = args.output or f"{ticker}_{period}.png"
+    StockVisualizer().save_stock_chart(data, ticker, period, path)
+    print(f"Chart saved to {path}", file=sys.stderr)
+    return None
+
+
+def run_charts(args: argparse.Namespace, analysis) -> None:
+    from src.chart_batch import ChartBatch, leaderboard_symbols
+
+    if not args.out_dir and not args.sheet:
+        raise ValueError("give --out-dir, --sheet or both")
+    symbols = [symbol.upper() for symbol in args.symbols]
+    if args.movers:
+        if len(args.scope) != 1:
+            raise ValueError("charts takes a single movers scope")
+        gainers, losers, _ = analysis.get_gainers_losers(args.movers[0], args.limit, SCOPES[args.scope[0]])
+        symbols += leaderboard_symbols(gainers, losers)
+    if not symbols:
+        raise ValueError("no symbols to chart")
+
+    batch = ChartBatch(analysis, args.workers)
+    period = args.period[0]
+    # one fetch feeds both the per-symbol images and the contact sheet
+    paths, count, missing = batch.write(symbols, period, directory=args.out_dir, format=args.image_format,
+                                        sheet=args.sheet, columns=args.columns)
+    if args.out_dir:
+        print(f"{len(paths)} charts written to {args.out_dir}", file=sys.stderr)
+    if args.sheet:
+        print(f"Contact sheet with {count} charts written to {args.sheet}", file=sys.stderr)
+    if missing:
+        print(f"No data for: {', '.join(missing)}", file=sys.stderr)
+    return None
+
+
+def run_monitor(args: argparse.Namespace, analysis) -> Optional[pd.DataFrame]:
+    from src.live_monitor import LiveMoversMonitor
+
+    if len(args.scope) != 1:
+        raise ValueError("monitor takes a single scope")
+    monitor = LiveMoversMonitor(analysis, args.window, args.limit, args.interval, args.cadence, args.budget)
+    gainers, losers = monitor.run(analysis._get_all_stock_symbols(SCOPES[args.scope[0]]), args.cycles)
+    # the board itself goes to the terminal; only write the final one when asked to
+    if not (args.format or args.output) or gainers.empty:
+        return None
+    return _ranked(gainers, losers, ['gainer', 'loser'], Window=args.window)
+
+
+def run_failures(args: argparse.Namespace, analysis) -> pd.DataFrame:
+    import time
+
+    journal = analysis.journal
+    if args.systematic:
+        return pd.DataFrame({'Symbol': sorted(journal.systematic_failures())})
+    since = time.time() - args.since if args.since else None
+    df = pd.DataFrame(journal.summary(args.by, since))
+    return df.head(args.limit) if args.limit else df
+
+
+def run_serve(args: argparse.Namespace, analysis) -> None:
+    from src.server import serve
+
+    serve(args.host, args.port, analysis, args.result_ttl)
+    return None
+
+
+COMMANDS = {
+    'movers': run_movers,
+    'custom-period': run_custom_period,
+    'info': run_info,
+    'volatility': run_volatility,
+    'chart': run_chart,
+    'charts': run_charts,
+    'monitor': run_monitor,
+    'failures': run_failures,
+    'serve': run_serve,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """run one subcommand; returns the process exit status"""
+    args = build_parser().parse_args(argv)
+    output_format = _output_format(args)
+
+    from src.stock_analysis import StockAnalysis
+
+    try:
+        # analysis code reports progress with print(); keep stdout for results
+        with contextlib.redirect_stdout(sys.stderr), _profiled(args.profile):
+            result = COMMANDS[args.command](args, StockAnalysis())
+        if result is not None:
+            write_frame(result, output_format, args.output)
+    except ImportError as e:
+        print(f"Error: {e} (parquet output needs pyarrow)" if output_format == 'parquet' else f"Error: {e}",
+              file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        _write_metrics(args)
+    return 0
+
+
+def _profiled(path: Optional[str]):
+    if not path:
+        return contextlib.nullcontext()
+    from src.metrics import get_metrics
+    return get_metrics().profiled(path)
+
+
+def _write_metrics(args: argparse.Namespace):
+    if not (args.metrics_json or args.metrics_prom or args.profile):
+        return
+    from src.metrics import get_metrics
+
+    metrics = get_metrics()
+    report = args.metrics_json or (os.path.splitext(args.profile)[0] + '.json' if args.profile else None)
+    if report:
+        metrics.write_report(report)
+        print(f"Run report written to {report}", file=sys.stderr)
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# import required modules
+import threading
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+RESULT_COLUMNS = ['Symbol', 'Change%', 'Start Price', 'End Price', 'Volume']
+# fixed-width row layout for ScanResults
+RESULT_DTYPE = np.dtype([('Symbol', 'U16'), ('Change%', 'f8'), ('Start Price', 'f8'),
+                         ('End Price', 'f8'), ('Volume', 'i8')])
+
+
+def first_last_valid(prices: np.ndarray):
+    """row index of the first and last non-NaN value in every column of a time x symbol array
+
+    Returns (first, last, has_data); first/last are only meaningful where has_data is True.
+    """
+    valid = ~np.isnan(prices)
+    has_data = valid.any(axis=0)
+    first = valid.argmax(axis=0)
+    last = prices.shape[0] - 1 - valid[::-1].argmax(axis=0)
+    return first, last, has_data
+
+
+def return_arrays(closes: pd.DataFrame, volumes: pd.DataFrame):
+    """(symbols, change %, start price, end price, mean volume) arrays for symbols with a valid change
+
+    closes and volumes are time x symbol frames. Each symbol is measured from its
+    own first to last valid close, so late listings and halted days (NaN rows)
+    don't break the calculation; symbols without any close are dropped.
+    """
+    prices = closes.to_numpy(dtype='f8', na_value=np.nan)
+    columns = np.arange(prices.shape[1])
+    first, last, has_data = first_last_valid(prices)
+
+    start_price = prices[first, columns]
+    end_price = prices[last, columns]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (end_price - start_price) / start_price * 100
+
+    volume = volumes.reindex(index=closes.index, columns=closes.columns).to_numpy(dtype='f8', na_value=np.nan)
+    counts = (~np.isnan(volume)).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_volume = np.where(counts > 0, np.nansum(volume, axis=0) / counts, 0.0)
+
+    keep = has_data & np.isfinite(change)
+    return (closes.columns.to_numpy()[keep], np.round(change[keep], 2), np.round(start_price[keep], 2),
+            np.round(end_price[keep], 2), mean_volume[keep].astype(np.int64))
+
+
+def summarize_returns(closes: pd.DataFrame, volumes: pd.DataFrame) -> pd.DataFrame:
+    """percent change, start/end price and mean volume for every symbol at once"""
+    if closes.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return pd.DataFrame(dict(zip(RESULT_COLUMNS, return_arrays(closes, volumes))))
+
+
+class ScanResults:
+    """one row per symbol in a preallocated NumPy structured array, filled batch by batch
+
+    A full-market scan keeps ~6000 fixed-width rows (about 100 bytes each)
+    instead of a DataFrame per batch plus the concatenated copy; a frame is
+    built once, at the end, in the order it will be shown.
+    """
+
+    __slots__ = ('rows', 'size', '_lock')
+
+    def __init__(self, capacity: int = 1024):
+        self.rows = np.empty(max(capacity, 1), dtype=RESULT_DTYPE)
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, closes: pd.DataFrame, volumes: pd.DataFrame) -> int:
+        """summarize a batch straight into the array; returns the rows added"""
+        if closes.empty:
+            return 0
+        arrays = return_arrays(closes, volumes)
+        count = len(arrays[0])
+        with self._lock:
+            if self.size + count > len(self.rows):
+                grown = np.empty(max(2 * len(self.rows), self.size + count), dtype=RESULT_DTYPE)
+                grown[:self.size] = self.rows[:self.size]
+                self.rows = grown
+            block = self.rows[self.size:self.size + count]
+            for name, values in zip(RESULT_COLUMNS, arrays):
+                block[name] = values
+            self.size += count
+        return count
+
+    def sorted(self, key: str = 'Change%', ascending: bool = False) -> np.ndarray:
+        """filled rows ordered by `key` (a copy; the array itself is left as filled)"""
+        rows = self.rows[:self.size]
+        order = np.argsort(rows[key], kind='stable')
+        return rows[order if ascending else order[::-1]]
+
+    def to_frame(self, key: Optional[str] = 'Change%', ascending: bool = False) -> pd.DataFrame:
+        rows = self.sorted(key, ascending) if key else self.rows[:self.size]
+        return pd.DataFrame({name: rows[name] for name in RESULT_COLUMNS}).astype({'Symbol': object})
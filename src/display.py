@@ -0,0 +1,88 @@
+# console rendering of result tables
+#
+# result columns (percent, currency, volume) are formatted a page at a time
+# straight from their NumPy arrays, with widths from each column's extremes,
+# so every page lines up with the header. every other column is rendered by
+# pandas exactly as DataFrame.to_string would.
+from typing import TYPE_CHECKING, Callable, Dict, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PAGE_ROWS = 500
+
+FORMATTERS: Dict[str, Callable] = {
+    'Change%': '{:+.2f}%'.format,
+    'Start Price': '${:,.2f}'.format,
+    'End Price': '${:,.2f}'.format,
+    'Volume': '{:,}'.format,
+}
+
+
+def _width(values, formatter: Callable, header: str) -> int:
+    """widest cell in a column: numbers from their extremes, anything else by scanning"""
+    if len(values) == 0:
+        return len(header)
+    if values.dtype.kind in 'iuf':
+        import numpy as np
+        finite = values[np.isfinite(values)] if values.dtype.kind == 'f' else values
+        extremes = [finite.min(), finite.max()] if len(finite) else []
+        if len(finite) < len(values):
+            extremes.append(float('nan'))
+        cells = max((len(formatter(value.item() if hasattr(value, 'item') else value)) for value in extremes),
+                    default=0)
+    else:
+        cells = max(map(len, map(formatter, values)))
+    return max(cells, len(header))
+
+
+def format_pages(df: 'pd.DataFrame', page_rows: int = PAGE_ROWS) -> Iterator[str]:
+    """the table as text, `page_rows` rows at a time; the first page starts with the header"""
+    # result tables (gainers/losers, custom periods) get currency and percent formatting
+    formatted = 'Change%' in df.columns
+    headers, columns = [], []
+    for name in df.columns:
+        if formatted and name in FORMATTERS:
+            values, formatter = df[name].to_numpy(), FORMATTERS[name]
+            width = _width(values, formatter, str(name))
+            headers.append(str(name).rjust(width))
+            columns.append((values, formatter, width))
+        else:
+            # pandas picks the precision and padding, so the column reads as DataFrame.to_string
+            header, *cells = df[[name]].to_string(index=False).split('\n')
+            headers.append(header)
+            columns.append((cells, None, len(header)))
+
+    header = ' '.join(headers)
+    for start in range(0, len(df), page_rows):
+        page = []
+        for values, formatter, width in columns:
+            if formatter is None:
+                page.append(values[start:start + page_rows])
+            else:
+                page.append([formatter(value).rjust(width) for value in values[start:start + page_rows].tolist()])
+        lines = '\n'.join(map(' '.join, zip(*page)))
+        yield f"{header}\n{lines}" if start == 0 else lines
+
+
+def display_dataframe(df: 'pd.DataFrame', title: str = "", page_rows: int = PAGE_ROWS, pause: bool = False):
+    """format and display dataframes"""
+    # check if data exists
+    if df.empty:
+        print("\nNo data available")
+        return
+
+    # print title if provided
+    if title:
+        print(f"\n{title}")
+    print("-" * 80)
+
+    shown = 0
+    for page in format_pages(df, page_rows):
+        print(page)
+        shown = min(shown + page_rows, len(df))
+        if pause and shown < len(df):
+            answer = input(f"-- {shown}/{len(df)} rows; Enter for more, q to stop -- ").strip().lower()
+            if answer == 'q':
+                break
+    print("-" * 80)
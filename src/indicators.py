@@ -0,0 +1,250 @@
+# import required modules
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, Optional
+import pandas as pd
+
+
+def _finite(value) -> bool:
+    """whether a bar field holds a usable number (a missing bar comes through as NaN)"""
+    return value is not None and math.isfinite(value)
+
+
+class Indicator(ABC):
+    """streaming indicator: update() folds in one bar in O(1) and returns the current value
+
+    Bars with a missing (non-finite) input are skipped, so one NaN close
+    can't poison the running sums for the rest of the series.
+    """
+
+    kind = "indicator"
+
+    @abstractmethod
+    def update(self, bar: Dict[str, float]) -> float:
+        """fold in one bar and return the indicator's current value"""
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state, enough to resume with from_state()"""
+        state = {key: list(value) if isinstance(value, deque) else value for key, value in self.__dict__.items()}
+        return {'kind': self.kind, **state}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'Indicator':
+        indicator = cls.__new__(cls)
+        for key, value in state.items():
+            if key != 'kind':
+                # rolling windows are the only list-valued state
+                setattr(indicator, key, deque(value) if isinstance(value, list) else value)
+        return indicator
+
+
+class SMA(Indicator):
+    """simple moving average over the last `window` closes"""
+
+    kind = "sma"
+
+    def __init__(self, window: int, field: str = 'Close'):
+        self.window = window
+        self.field = field
+        self.values = deque()
+        self.total = 0.0
+
+    def update(self, bar: Dict[str, float]) -> float:
+        value = bar[self.field]
+        if _finite(value):
+            self.values.append(value)
+            self.total += value
+            if len(self.values) > self.window:
+                self.total -= self.values.popleft()
+        return self.total / self.window if len(self.values) == self.window else math.nan
+
+
+class RollingStd(Indicator):
+    """sample standard deviation over the last `window` closes from running sums"""
+
+    kind = "std"
+
+    def __init__(self, window: int, field: str = 'Close'):
+        self.window = window
+        self.field = field
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, bar: Dict[str, float]) -> float:
+        value = bar[self.field]
+        if _finite(value):
+            self.values.append(value)
+            self.total += value
+            self.total_sq += value * value
+            if len(self.values) > self.window:
+                old = self.values.popleft()
+                self.total -= old
+                self.total_sq -= old * old
+        n = len(self.values)
+        if n < self.window or n < 2:
+            return math.nan
+        variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class EMA(Indicator):
+    """exponential moving average with pandas' span convention (alpha = 2 / (span + 1))"""
+
+    kind = "ema"
+
+    def __init__(self, span: int, field: str = 'Close'):
+        self.alpha = 2.0 / (span + 1)
+        self.field = field
+        self.value = None
+
+    def update(self, bar: Dict[str, float]) -> float:
+        price = bar[self.field]
+        if _finite(price):
+            self.value = price if self.value is None else self.alpha * price + (1 - self.alpha) * self.value
+        return self.value if self.value is not None else math.nan
+
+
+class VWAP(Indicator):
+    """volume-weighted average price, reset at each new session date"""
+
+    kind = "vwap"
+
+    def __init__(self):
+        self.session = None
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def update(self, bar: Dict[str, float]) -> float:
+        if bar.get('session') != self.session:
+            self.session = bar.get('session')
+            self.price_volume = 0.0
+            self.volume = 0.0
+        typical = (bar['High'] + bar['Low'] + bar['Close']) / 3
+        if _finite(typical) and _finite(bar['Volume']):
+            self.price_volume += typical * bar['Volume']
+            self.volume += bar['Volume']
+        return self.price_volume / self.volume if self.volume else math.nan
+
+
+class BollingerBands(Indicator):
+    """SMA +/- k rolling standard deviations; update() returns the upper band, lower is kept alongside"""
+
+    kind = "bollinger"
+
+    def __init__(self, window: int = 20, k: float = 2.0, field: str = 'Close'):
+        self.k = k
+        self.sma = SMA(window, field)
+        self.std = RollingStd(window, field)
+        self.lower = math.nan
+
+    def update(self, bar: Dict[str, float]) -> float:
+        middle = self.sma.update(bar)
+        spread = self.k * self.std.update(bar)
+        self.lower = middle - spread
+        return middle + spread
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'k': self.k, 'lower': self.lower,
+                'sma': self.sma.to_state(), 'std': self.std.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'BollingerBands':
+        bands = cls.__new__(cls)
+        bands.k = state['k']
+        bands.lower = state['lower']
+        bands.sma = SMA.from_state(state['sma'])
+        bands.std = RollingStd.from_state(state['std'])
+        return bands
+
+
+INDICATOR_TYPES = {cls.kind: cls for cls in (SMA, RollingStd, EMA, VWAP, BollingerBands)}
+
+
+class IndicatorSet:
+    """named indicators updated together, one bar at a time, with resumable state
+
+    Bars older than the last seen timestamp are ignored. A new version of the
+    last bar (a still-forming intraday bar) replaces the old one by rolling
+    back to a checkpoint taken just before it was applied.
+    """
+
+    def __init__(self, indicators: Dict[str, Indicator]):
+        self.indicators = indicators
+        self.last_ts: Optional[int] = None
+        self.values: Dict[str, float] = {}
+        self._checkpoint: Optional[Dict[str, Any]] = None
+
+    def _bar_state(self) -> Dict[str, Any]:
+        return {name: indicator.to_state() for name, indicator in self.indicators.items()}
+
+    def _restore(self, state: Dict[str, Any]):
+        self.indicators = {name: INDICATOR_TYPES[value['kind']].from_state(value) for name, value in state.items()}
+
+    def update_bar(self, ts: pd.Timestamp, bar: Dict[str, float], checkpoint: bool = True) -> Optional[Dict[str, float]]:
+        """fold in one bar; returns indicator values, or None if the bar is older than the state
+
+        The checkpoint costs O(window), so update_frame takes it only before the
+        final bar of each call - the only bar a later poll can revise.
+        """
+        ts_value = ts.value
+        if self.last_ts is not None and ts_value < self.last_ts:
+            return None
+        if self.last_ts is not None and ts_value == self.last_ts:
+            if self._checkpoint is None:
+                return None
+            self._restore(self._checkpoint)
+        if checkpoint:
+            self._checkpoint = self._bar_state()
+
+        bar = dict(bar, session=str(ts.date()))
+        values = {}
+        for name, indicator in self.indicators.items():
+            values[name] = indicator.update(bar)
+            if isinstance(indicator, BollingerBands):
+                values[f"{name}_lower"] = indicator.lower
+        self.values = values
+        self.last_ts = ts_value
+        return values
+
+    def update_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """feed the bars of frame that are new to the state; returns their indicator values"""
+        if self.last_ts is not None and not frame.empty:
+            frame = frame[frame.index.as_unit('ns').asi8 >= self.last_ts]
+        rows, index = [], []
+        columns = [col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in frame.columns]
+        last = len(frame) - 1
+        for i, (ts, values) in enumerate(zip(frame.index, frame[columns].itertuples(index=False, name=None))):
+            result = self.update_bar(ts, dict(zip(columns, values)), checkpoint=i == last)
+            if result is not None:
+                rows.append(result)
+                index.append(ts)
+        return pd.DataFrame(rows, index=pd.DatetimeIndex(index) if index else frame.index[:0])
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'last_ts': self.last_ts, 'indicators': self._bar_state(), 'checkpoint': self._checkpoint}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'IndicatorSet':
+        indicator_set = cls({})
+        indicator_set._restore(state['indicators'])
+        indicator_set.last_ts = state['last_ts']
+        indicator_set._checkpoint = state.get('checkpoint')
+        return indicator_set
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.to_state(), f)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['IndicatorSet']:
+        try:
+            with open(path) as f:
+                return cls.from_state(json.load(f))
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
@@ -0,0 +1,134 @@
+# import required modules
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.metrics import get_metrics
+from src.providers import MarketDataProvider, get_provider
+
+# info fields that move with the market; everything else is treated as slow fundamentals
+QUOTE_FIELDS = (
+    'currentPrice', 'regularMarketPrice', 'previousClose', 'open', 'dayHigh', 'dayLow',
+    'bid', 'ask', 'volume', 'regularMarketVolume', 'marketCap',
+)
+
+
+class InfoCache:
+    """per-symbol quote and fundamental info with separate TTLs
+
+    A symbol's full info is fetched once and kept for `fundamentals_ttl`
+    seconds. Within that time only the quote fields are refreshed, after
+    `quote_ttl` seconds, and for many symbols at once from a single bulk
+    request. Failed lookups (empty info) are not cached.
+    """
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None, quote_ttl: float = 60,
+                 fundamentals_ttl: float = 24 * 3600, max_workers: int = 8):
+        self.provider = provider or get_provider()
+        self.quote_ttl = quote_ttl
+        self.fundamentals_ttl = fundamentals_ttl
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _stale(self, symbols: List[str]):
+        """split symbols into (needs full info, needs quote refresh)"""
+        now = time.monotonic()
+        full, quotes = [], []
+        with self._lock:
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry is None or now - entry['fundamentals_at'] >= self.fundamentals_ttl:
+                    full.append(symbol)
+                elif now - entry['quote_at'] >= self.quote_ttl:
+                    quotes.append(symbol)
+            self.misses += len(full) + len(quotes)
+            self.hits += len(symbols) - len(full) - len(quotes)
+        get_metrics().cache_lookup('info', True, len(symbols) - len(full) - len(quotes))
+        get_metrics().cache_lookup('info', False, len(full) + len(quotes))
+        return full, quotes
+
+    def _fetch_info(self, symbol: str) -> Dict[str, Any]:
+        info = self.provider.info(symbol) or {}
+        get_metrics().inc('download_bytes_total', len(json.dumps(info, default=str)), source='info')
+        if info:
+            now = time.monotonic()
+            with self._lock:
+                self._entries[symbol] = {'info': dict(info), 'fundamentals_at': now, 'quote_at': now}
+        return info
+
+    def refresh_quotes(self, symbols: Iterable[str]):
+        """refresh quote fields of cached symbols with one bulk request"""
+        with self._lock:
+            symbols = [symbol.upper() for symbol in symbols if symbol.upper() in self._entries]
+        if not symbols:
+            return
+        quotes = self.provider.quotes(symbols)
+        now = time.monotonic()
+        with self._lock:
+            for symbol, quote in quotes.items():
+                entry = self._entries.get(symbol)
+                if entry is None:
+                    continue
+                info = entry['info']
+                # market cap moves with the price
+                old_price = info.get('currentPrice') or info.get('regularMarketPrice')
+                if info.get('marketCap') and old_price and quote.get('currentPrice'):
+                    info['marketCap'] = info['marketCap'] * quote['currentPrice'] / old_price
+                info.update(quote)
+                entry['quote_at'] = now
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """info for one symbol, fetched or refreshed only when stale"""
+        return self.get_many([symbol]).get(symbol.upper(), {})
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """info for many symbols: missing ones fetched concurrently, stale quotes refreshed in bulk"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        full, quotes = self._stale(symbols)
+
+        if len(full) == 1:
+            self._fetch_info(full[0])
+        elif full:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(full))) as pool:
+                list(pool.map(self._safe_fetch_info, full))
+        if quotes:
+            try:
+                self.refresh_quotes(quotes)
+            except Exception:
+                # a failed quote refresh serves the previous quote until the next attempt
+                pass
+
+        with self._lock:
+            return {symbol: dict(self._entries[symbol]['info']) for symbol in symbols if symbol in self._entries}
+
+    def _safe_fetch_info(self, symbol: str) -> Dict[str, Any]:
+        try:
+            return self._fetch_info(symbol)
+        except Exception:
+            return {}
+
+    def invalidate(self, symbol: Optional[str] = None, quotes_only: bool = False):
+        """drop cached info for a symbol (or every symbol); quotes_only keeps fundamentals"""
+        with self._lock:
+            symbols = [symbol.upper()] if symbol else list(self._entries)
+            for key in symbols:
+                if quotes_only and key in self._entries:
+                    self._entries[key]['quote_at'] = float('-inf')
+                else:
+                    self._entries.pop(key, None)
+
+
+_cache: Optional[InfoCache] = None
+
+
+def get_info_cache() -> InfoCache:
+    """process-wide info cache on the default provider"""
+    global _cache
+    if _cache is None:
+        _cache = InfoCache()
+    return _cache
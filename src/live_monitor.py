@@ -0,0 +1,319 @@
+# import required modules
+import sys
+import time
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+import numpy as np
+import pandas as pd
+
+from src.async_fetch import AsyncFetchScheduler, BatchResult, FetchStats
+from src.batch_fetch import BatchFetcher
+from src.cross_section import RESULT_COLUMNS, first_last_valid
+from src.display import format_pages
+from src.metrics import get_metrics
+from src.resample import EXCHANGE_TZ, INTRADAY_MINUTES
+from utils.constants import INTRADAY_PERIOD_MINUTES
+
+# rolling windows the board ranks on: the intraday periods, as movers scans measure them
+WINDOW_MINUTES: Dict[str, int] = INTRADAY_PERIOD_MINUTES
+# polls carry a bar or two per symbol, so they can ask for more symbols per request than a scan
+POLL_BATCH_SIZE = 100
+NEVER = np.iinfo(np.int64).min
+
+
+def _ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """UTC nanoseconds of a bar index (naive timestamps are exchange-local)"""
+    if index.tz is None:
+        index = index.tz_localize(EXCHANGE_TZ)
+    return index.tz_convert('UTC').as_unit('ns').asi8
+
+
+class RollingWindow:
+    """closes and volumes of the last `window` of bars for a fixed symbol list, updated in place
+
+    Only bars inside the window are held; bars that fall out of it leave
+    behind each symbol's last close, the price the window's change is
+    measured from (symbols with no earlier close use their first one in
+    the window). The latest close and the window's volume are kept per
+    symbol as bars arrive, and only symbols touched since the last
+    refresh are re-priced.
+    """
+
+    def __init__(self, symbols: List[str], window: pd.Timedelta):
+        self.symbols = np.array(symbols, dtype=object)
+        self.column = {symbol: i for i, symbol in enumerate(symbols)}
+        self.window = pd.Timedelta(window).value
+        n = len(symbols)
+        self.times = np.empty(0, dtype=np.int64)
+        self.closes = np.empty((0, n))
+        self.volumes = np.empty((0, n))
+        self.latest: Optional[int] = None
+        self.carry = np.full(n, np.nan)
+        self.carry_time = np.full(n, NEVER)
+        self.last = np.full(n, np.nan)
+        self.last_time = np.full(n, NEVER)
+        self.volume_sum = np.zeros(n)
+        self.volume_count = np.zeros(n, dtype=np.int64)
+        self.base = np.full(n, np.nan)
+        self.change = np.full(n, np.nan)
+        self._dirty = np.zeros(n, dtype=bool)
+
+    @property
+    def boundary(self) -> Optional[int]:
+        """window start: bars at or before it are out of the window"""
+        return None if self.latest is None else self.latest - self.window
+
+    def update(self, closes: pd.DataFrame, volumes: pd.DataFrame):
+        """fold a time x symbol batch of bars in; a bar seen before is replaced (it may have been partial)"""
+        if closes.empty:
+            return
+        closes = closes.loc[:, [symbol in self.column for symbol in closes.columns]].sort_index()
+        columns = np.array([self.column[symbol] for symbol in closes.columns], dtype=np.int64)
+        times = _ns(closes.index)
+        prices = closes.to_numpy(dtype='f8', na_value=np.nan)
+        volume = volumes.reindex(index=closes.index, columns=closes.columns).to_numpy(dtype='f8', na_value=np.nan)
+
+        priced = ~np.isnan(prices).all(axis=1)
+        if priced.any():
+            newest = int(times[priced].max())
+            if self.latest is None or newest > self.latest:
+                self.latest = newest
+                self._evict()
+        if self.latest is None:
+            return
+
+        old = times <= self.boundary
+        if old.any():
+            self._fold(times[old], prices[old], columns)
+        if (~old).any():
+            self._write(times[~old], prices[~old], volume[~old], columns)
+
+    def _fold(self, times: np.ndarray, prices: np.ndarray, columns: np.ndarray):
+        """move each column's last close before the window start into `carry`"""
+        _, last, has_data = first_last_valid(prices)
+        at = times[last]
+        keep = has_data & (at >= self.carry_time[columns])
+        self.carry[columns[keep]] = prices[last, np.arange(len(columns))][keep]
+        self.carry_time[columns[keep]] = at[keep]
+        self._dirty[columns[keep]] = True
+
+    def _write(self, times: np.ndarray, prices: np.ndarray, volume: np.ndarray, columns: np.ndarray):
+        merged = np.union1d(self.times, times)
+        if len(merged) != len(self.times):
+            # room for the new bar rows (almost always appended at the end)
+            rows = np.searchsorted(merged, self.times)
+            closes = np.full((len(merged), len(self.symbols)), np.nan)
+            volumes = np.full_like(closes, np.nan)
+            closes[rows], volumes[rows] = self.closes, self.volumes
+            self.times, self.closes, self.volumes = merged, closes, volumes
+
+        cells = np.ix_(np.searchsorted(self.times, times), columns)
+        previous_close, previous_volume = self.closes[cells], self.volumes[cells]
+        # a missing value (no trade reported) never erases one already held
+        written_close = np.where(np.isnan(prices), previous_close, prices)
+        written_volume = np.where(np.isnan(volume), previous_volume, volume)
+        self.closes[cells], self.volumes[cells] = written_close, written_volume
+        self.volume_sum[columns] += np.nansum(written_volume, axis=0) - np.nansum(previous_volume, axis=0)
+        self.volume_count[columns] += ((~np.isnan(written_volume)).sum(axis=0)
+                                       - (~np.isnan(previous_volume)).sum(axis=0))
+
+        _, last, has_data = first_last_valid(prices)
+        at = times[last]
+        newer = has_data & (at >= self.last_time[columns])
+        self.last[columns[newer]] = prices[last, np.arange(len(columns))][newer]
+        self.last_time[columns[newer]] = at[newer]
+        self._dirty[columns] = True
+
+    def _evict(self):
+        """drop rows the window start has passed, keeping their closes as the new base prices"""
+        count = int(np.searchsorted(self.times, self.boundary, side='right'))
+        if count == 0:
+            return
+        closes, volumes = self.closes[:count], self.volumes[:count]
+        self._fold(self.times[:count], closes, np.arange(len(self.symbols)))
+        self.volume_sum -= np.nansum(volumes, axis=0)
+        self.volume_count -= (~np.isnan(volumes)).sum(axis=0)
+        self._dirty |= ~np.isnan(volumes).all(axis=0)
+        self.times, self.closes, self.volumes = self.times[count:], self.closes[count:], self.volumes[count:]
+
+    def refresh(self) -> int:
+        """re-price symbols touched since the last refresh; returns how many were"""
+        dirty = np.flatnonzero(self._dirty)
+        if len(dirty) == 0:
+            return 0
+        base = self.carry[dirty]
+        missing = np.isnan(base)
+        if missing.any() and len(self.times):
+            first, _, has_data = first_last_valid(self.closes[:, dirty[missing]])
+            firsts = self.closes[first, dirty[missing]]
+            base[missing] = np.where(has_data, firsts, np.nan)
+        self.base[dirty] = base
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.change[dirty] = (self.last[dirty] - base) / base * 100
+        self._dirty[dirty] = False
+        return len(dirty)
+
+    def leaderboard(self, limit: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """current (gainers, losers) over the window, best first, as RESULT_COLUMNS rows"""
+        self.refresh()
+        ranked = np.flatnonzero(np.isfinite(self.change))
+        if len(ranked) == 0:
+            return pd.DataFrame(columns=RESULT_COLUMNS), pd.DataFrame(columns=RESULT_COLUMNS)
+        k = min(limit, len(ranked))
+        change = self.change[ranked]
+        top = ranked[np.argpartition(-change, k - 1)[:k]]
+        bottom = ranked[np.argpartition(change, k - 1)[:k]]
+        return (self._rows(top[np.argsort(-self.change[top], kind='stable')]),
+                self._rows(bottom[np.argsort(self.change[bottom], kind='stable')]))
+
+    def _rows(self, columns: np.ndarray) -> pd.DataFrame:
+        count = self.volume_count[columns]
+        mean_volume = np.where(count > 0, self.volume_sum[columns] / np.maximum(count, 1), 0.0)
+        return pd.DataFrame({
+            'Symbol': self.symbols[columns],
+            'Change%': np.round(self.change[columns], 2),
+            'Start Price': np.round(self.base[columns], 2),
+            'End Price': np.round(self.last[columns], 2),
+            'Volume': mean_volume.astype(np.int64),
+        })
+
+    @property
+    def ranked(self) -> int:
+        return int(np.isfinite(self.change).sum())
+
+
+class LiveMoversMonitor:
+    """intraday movers board kept current by polling only bars newer than the ones already held
+
+    Every `cadence` seconds all symbols are polled in bulk, each from the
+    newest bar its last successful poll returned (that bar is fetched again
+    since it may still have been forming). Bars live in memory only, not in
+    the price store. A poll that runs past `budget` seconds is reported, and
+    batches that time out simply catch up on the next cycle.
+    """
+
+    def __init__(self, analysis, window: str = '15m', limit: int = 20, interval: str = '1m',
+                 cadence: Optional[float] = None, budget: float = 10.0,
+                 clock: Optional[Callable[[], pd.Timestamp]] = None):
+        if window not in WINDOW_MINUTES:
+            raise ValueError(f"Invalid window. Must be one of {list(WINDOW_MINUTES)}")
+        if interval not in INTRADAY_MINUTES or INTRADAY_MINUTES[interval] > WINDOW_MINUTES[window]:
+            raise ValueError(f"Invalid interval {interval} for a {window} window")
+        self.analysis = analysis
+        self.window = window
+        self.limit = limit
+        self.interval = interval
+        self.cadence = cadence if cadence is not None else INTRADAY_MINUTES[interval] * 60.0
+        self.budget = budget
+        self.clock = clock or (lambda: pd.Timestamp.now(tz='UTC'))
+        # one attempt per batch and no requeue pass: a slow or empty batch waits for the next cycle
+        self.scheduler = AsyncFetchScheduler(BatchFetcher(POLL_BATCH_SIZE, analysis.provider),
+                                             timeout=budget, retries=0, retry_passes=0)
+        self.rolling: Optional[RollingWindow] = None
+        self.seen = np.empty(0, dtype=np.int64)
+        self.cycles = 0
+
+    def start(self, symbols: List[str]):
+        """track these symbols from scratch"""
+        symbols = list(dict.fromkeys(BatchFetcher.clean(symbols)))
+        self.rolling = RollingWindow(symbols, pd.Timedelta(minutes=WINDOW_MINUTES[self.window]))
+        self.seen = np.full(len(symbols), NEVER)
+        self.cycles = 0
+
+    def _seed_start(self) -> pd.Timestamp:
+        """where a symbol's first poll starts: far enough back to hold the window and the bar before it"""
+        from utils.trading_calendar import get_trading_calendar
+
+        now = self.clock()
+        calendar = get_trading_calendar(now.date())
+        bar = pd.Timedelta(minutes=INTRADAY_MINUTES[self.interval])
+        # outside trading hours the window ends at the last session's close
+        session = calendar.latest_session(now)
+        end = min(now, pd.Timestamp(session[2])) if session is not None else now
+        start = end - pd.Timedelta(minutes=WINDOW_MINUTES[self.window]) - bar
+        # a window starting overnight is measured from the previous session's last bar
+        session = calendar.latest_session(start)
+        if session is not None and start > pd.Timestamp(session[2]):
+            start = pd.Timestamp(session[2]) - bar
+        return start.tz_convert(EXCHANGE_TZ)
+
+    def poll(self) -> Tuple[float, FetchStats]:
+        """one polling cycle: (seconds taken, fetch stats merged over the cycle's requests)"""
+        if self.rolling is None:
+            raise ValueError("Call start() with the symbols to monitor first")
+        started = time.perf_counter()
+        rolling = self.rolling
+        total = FetchStats()
+
+        def on_result(result: BatchResult):
+            if result.error is not None:
+                return
+            rolling.update(result.closes, result.volumes)
+            if not result.closes.empty:
+                newest = int(_ns(result.closes.index).max())
+                columns = [rolling.column[symbol] for symbol in result.symbols if symbol in rolling.column]
+                self.seen[columns] = np.maximum(self.seen[columns], newest)
+
+        # symbols polled up to the same bar share requests (normally that is all of them)
+        marks, groups = np.unique(self.seen, return_inverse=True)
+        for position, mark in enumerate(marks):
+            symbols = list(rolling.symbols[groups == position])
+            start = self._seed_start() if mark == NEVER else pd.Timestamp(int(mark), tz='UTC').tz_convert(EXCHANGE_TZ)
+            _, stats = self.scheduler.fetch(symbols, on_result, keep_frames=False, start=start, interval=self.interval)
+            total.symbols += stats.symbols
+            total.priced += stats.priced
+            total.requests += stats.requests
+            total.latencies.extend(stats.latencies)
+            total.peak_concurrency = max(total.peak_concurrency, stats.peak_concurrency)
+
+        elapsed = time.perf_counter() - started
+        total.elapsed = elapsed
+        self.cycles += 1
+        metrics = get_metrics()
+        metrics.observe('live_cycle_seconds', elapsed)
+        metrics.inc('live_cycles_total', outcome='ok' if elapsed <= self.budget else 'over_budget')
+        return elapsed, total
+
+    def leaderboard(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """current (gainers, losers)"""
+        if self.rolling is None:
+            return pd.DataFrame(columns=RESULT_COLUMNS), pd.DataFrame(columns=RESULT_COLUMNS)
+        return self.rolling.leaderboard(self.limit)
+
+    def render(self, elapsed: float, stats: FetchStats) -> str:
+        """the board as text: header, status line, gainers and losers"""
+        gainers, losers = self.leaderboard()
+        latest = self.rolling.latest
+        as_of = (pd.Timestamp(latest, tz='UTC').tz_convert(EXCHANGE_TZ).strftime('%Y-%m-%d %H:%M')
+                 if latest is not None else 'no bars yet')
+        over = ', OVER BUDGET' if elapsed > self.budget else ''
+        lines = [
+            f"Live movers: {self.window} window, {self.interval} bars, as of {as_of} ET",
+            f"Cycle {self.cycles}: {stats.priced}/{len(self.rolling.symbols)} symbols priced, "
+            f"{self.rolling.ranked} ranked, {elapsed:.2f}s (budget {self.budget:.0f}s{over}), "
+            f"every {self.cadence:.0f}s; Ctrl+C to stop",
+        ]
+        for title, frame in ((f"Top {len(gainers)} Gainers", gainers), (f"Top {len(losers)} Losers", losers)):
+            lines += ["", title, "-" * 80]
+            lines += list(format_pages(frame, max(len(frame), 1))) if not frame.empty else ["No data available"]
+        return "\n".join(lines)
+
+    def run(self, symbols: List[str], cycles: Optional[int] = None,
+            stream: Optional[TextIO] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """poll on the cadence and redraw the board until Ctrl+C (or `cycles` polls); returns the last board"""
+        stream = stream or sys.stdout
+        # on a terminal the board is redrawn in place, otherwise each cycle is appended
+        redraw = stream.isatty()
+        self.start(symbols)
+        next_poll = time.monotonic()
+        try:
+            while cycles is None or self.cycles < cycles:
+                elapsed, stats = self.poll()
+                stream.write(("\033[H\033[J" if redraw else "") + self.render(elapsed, stats) + "\n\n")
+                stream.flush()
+                if cycles is not None and self.cycles >= cycles:
+                    break
+                next_poll = max(next_poll + self.cadence, time.monotonic())
+                time.sleep(max(0.0, next_poll - time.monotonic()))
+        except KeyboardInterrupt:
+            stream.write(f"\nMonitor stopped after {self.cycles} cycles\n")
+        return self.leaderboard()
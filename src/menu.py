@@ -4,7 +4,6 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.constants import TIME_PERIODS, MenuOptions
-from src.stock_info import StockInfo
 from typing import Optional
 from utils.validators import is_market_open, get_last_trading_day
 from utils.constants import TIME_PERIODS, INTRADAY_PERIODS, REGULAR_PERIODS
@@ -19,11 +18,13 @@ class Menu:
         print("3 --- Get general stock info")
         print("4 --- Show options (Coming Soon)")
         print("5 --- Display graph of set time period")
+        print("6 --- Get most and least volatile stocks for given time period")
+        print("7 --- Watch live intraday gainers and losers")
         print("0 --- Exit")
         return input("\nEnter your choice: ")
 
     @staticmethod
-    def display_time_periods(include_max: bool = False) -> str:
+    def display_time_periods(include_max: bool = False, include_all: bool = False) -> str:
         """show available time periods"""
         print("\nChoose one of the options below:")
         
@@ -38,6 +39,9 @@ class Menu:
             if period != "max" or include_max:
                 print(f"{period} --- {description}")
                 
+        if include_all:
+            print("all --- Every daily period above, from one download")
+        
         if not market_open:
             print("\nNote: Intraday options are hidden because the market is currently closed.")
             
@@ -45,6 +49,25 @@ class Menu:
         choice = input("\nEnter your choice: ")
         return choice
 
+    @staticmethod
+    def display_volatility_periods() -> str:
+        """show time periods with enough daily bars for volatility"""
+        print("\nChoose one of the options below:")
+        for period, description in REGULAR_PERIODS.items():
+            if period != "1d":
+                print(f"{period} --- {description}")
+        print("0 --- Go back")
+        return input("\nEnter your choice: ")
+
+    @staticmethod
+    def display_monitor_windows() -> str:
+        """show rolling windows for the live movers board"""
+        print("\nChoose the window to rank gainers and losers on:")
+        for period, description in INTRADAY_PERIODS.items():
+            print(f"{period} --- {description}")
+        print("0 --- Go back")
+        return input("\nEnter your choice: ")
+
     @staticmethod
     def get_analysis_scope() -> bool:
         """get user preference for analysis scope"""
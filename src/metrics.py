@@ -0,0 +1,224 @@
+# import required modules
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# upper bounds (seconds) for latency and stage histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running, rows = 0, []
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            running += count
+            rows.append(('+Inf' if bound == float('inf') else repr(bound), running))
+        return rows
+
+
+class Metrics:
+    """process-wide counters, histograms and stage spans
+
+    Everything is keyed by metric name plus a sorted tuple of label pairs.
+    Updates take one lock and a dict lookup, cheap enough for the scan hot
+    path (a few calls per batch, not per symbol).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.spans: List[Dict] = []
+        self.profile: Optional[Dict] = None
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def span(self, stage: str, **attributes) -> Iterator[None]:
+        """time a stage (universe, fetch, compute, rank, render, ...)"""
+        start = time.perf_counter()
+        started_at = time.time()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('stage_seconds', elapsed, stage=stage)
+            with self._lock:
+                # many short spans (per batch) are summarized by the histogram; keep a bounded log
+                if len(self.spans) < 10_000:
+                    self.spans.append({'stage': stage, 'start': started_at, 'seconds': elapsed, **attributes})
+
+    def cache_lookup(self, cache: str, hit: bool, count: int = 1):
+        self.inc('cache_requests_total', count, cache=cache, result='hit' if hit else 'miss')
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters.clear()
+            self.histograms.clear()
+            self.spans.clear()
+            self.profile = None
+
+    # --- export -------------------------------------------------------------
+
+    def to_prometheus(self, prefix: str = 'stock_analyzer_') -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{prefix}{name}{_labels(labels)} {value:g}")
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{prefix}{name}_bucket{_labels(labels + (('le', bound),))} {count}")
+                    lines.append(f"{prefix}{name}_sum{_labels(labels)} {histogram.total:g}")
+                    lines.append(f"{prefix}{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> Dict:
+        """JSON-ready run report: stage totals, counters, histogram summaries, cache hit ratios"""
+        with self._lock:
+            counters = {name: {_label_text(labels): value for labels, value in series.items()}
+                        for name, series in self.counters.items()}
+            histograms = {
+                name: {_label_text(labels): {'count': h.count, 'sum': h.total,
+                                             'mean': h.total / h.count if h.count else 0.0,
+                                             'buckets': dict(h.cumulative())}
+                       for labels, h in series.items()}
+                for name, series in self.histograms.items()
+            }
+            stages = {dict(labels)['stage']: {'count': h.count, 'seconds': h.total}
+                      for labels, h in self.histograms.get('stage_seconds', {}).items()}
+
+            caches: Dict[str, Dict[str, float]] = {}
+            for labels, value in self.counters.get('cache_requests_total', {}).items():
+                label = dict(labels)
+                caches.setdefault(label['cache'], {'hit': 0, 'miss': 0})[label['result']] += value
+            spans = list(self.spans)
+            profile = self.profile
+
+        for totals in caches.values():
+            lookups = totals['hit'] + totals['miss']
+            totals['hit_ratio'] = totals['hit'] / lookups if lookups else 0.0
+
+        return {
+            'started': self.started,
+            'elapsed': time.time() - self.started,
+            'stages': stages,
+            'caches': caches,
+            'counters': counters,
+            'histograms': histograms,
+            'spans': spans,
+            'profile': profile,
+        }
+
+    def write_report(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus())
+
+    @contextlib.contextmanager
+    def profiled(self, path: Optional[str] = None, memory: bool = True, top: int = 25) -> Iterator[None]:
+        """cProfile (and optionally tracemalloc) one block, e.g. a single scan
+
+        The top functions by cumulative time and the top allocation sites go
+        into the run report; with `path` the raw profile is dumped for
+        snakeviz/pstats as well.
+        """
+        import cProfile
+        import io
+        import pstats
+        import tracemalloc
+
+        profiler = cProfile.Profile()
+        if memory:
+            tracemalloc.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profile = {}
+            if memory:
+                snapshot = tracemalloc.take_snapshot()
+                profile['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                tracemalloc.stop()
+                profile['top_allocations'] = [
+                    {'site': str(stat.traceback), 'kb': stat.size / 1024, 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:top]
+                ]
+            if path:
+                profiler.dump_stats(path)
+                profile['profile_path'] = path
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(top)
+            profile['top_functions'] = text.getvalue()
+            with self._lock:
+                self.profile = profile
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ','.join(f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels: Labels) -> str:
+    return ','.join(f"{key}={value}" for key, value in labels) or 'total'
+
+
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Metrics:
+    """process-wide metrics registry"""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
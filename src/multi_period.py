@@ -0,0 +1,146 @@
+# import required modules
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from src.cross_section import RESULT_COLUMNS, first_last_valid
+from src.ranking import StreamingTopK
+from utils.constants import REGULAR_PERIODS, SESSION_PERIODS
+
+EXCHANGE_TZ = 'America/New_York'
+
+# session periods (SESSION_PERIODS) count back by position; everything else is a calendar offset
+CALENDAR_PERIODS: Dict[str, pd.DateOffset] = {
+    '1mo': pd.DateOffset(months=1), '3mo': pd.DateOffset(months=3), '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1), '2y': pd.DateOffset(years=2), '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def anchor_date(period: str, last_session: date) -> Optional[date]:
+    """calendar date whose close a period is measured from (None: from the first bar)
+
+    Session periods are resolved by position instead, see anchor_rows.
+    """
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return date(last_session.year - 1, 12, 31)
+    if period in CALENDAR_PERIODS:
+        return (pd.Timestamp(last_session) - CALENDAR_PERIODS[period]).date()
+    raise ValueError(f"Invalid period. Must be one of {list(REGULAR_PERIODS.keys())}")
+
+
+def fetch_start(periods: List[str], today: date) -> Optional[date]:
+    """earliest calendar date the longest requested period needs (None when 'max' is requested)"""
+    if 'max' in periods:
+        return None
+    starts = []
+    for period in periods:
+        if period in SESSION_PERIODS:
+            # sessions back, with room for weekends and holidays
+            starts.append(today - timedelta(days=SESSION_PERIODS[period] * 7 // 5 + 7))
+        else:
+            starts.append(anchor_date(period, today) - timedelta(days=7))
+    return min(starts)
+
+
+def anchor_rows(dates: np.ndarray, periods: List[str]) -> Dict[str, int]:
+    """row of the base close for each period in a sessions index (-1: before the data starts)"""
+    last = len(dates) - 1
+    last_session = pd.Timestamp(dates[-1]).date()
+    rows = {}
+    for period in periods:
+        if period in SESSION_PERIODS:
+            rows[period] = last - SESSION_PERIODS[period]
+        elif period == 'max':
+            rows[period] = 0
+        else:
+            anchor = np.datetime64(anchor_date(period, last_session))
+            # the last session on or before the anchor
+            rows[period] = int(np.searchsorted(dates, anchor, side='right')) - 1
+    return rows
+
+
+def period_returns(closes: pd.DataFrame, volumes: pd.DataFrame, periods: List[str]) -> Dict[str, pd.DataFrame]:
+    """result rows (RESULT_COLUMNS) for every period from one time x symbol daily frame
+
+    Each period runs from the close of its anchor session to each symbol's
+    latest close. Symbols listed after the anchor are measured from their
+    first close. Volume is the mean over the period's sessions.
+    """
+    if closes.empty:
+        return {period: pd.DataFrame(columns=RESULT_COLUMNS) for period in periods}
+
+    index = closes.index
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        index = index.tz_convert(EXCHANGE_TZ).tz_localize(None)
+    dates = index.normalize().to_numpy(dtype='datetime64[D]')
+
+    prices = closes.to_numpy(dtype='f8', na_value=np.nan)
+    filled = closes.ffill().to_numpy(dtype='f8', na_value=np.nan)
+    columns = np.arange(prices.shape[1])
+    first, last, has_data = first_last_valid(prices)
+    end_price = prices[last, columns]
+
+    volume = volumes.reindex(index=closes.index, columns=closes.columns).to_numpy(dtype='f8', na_value=np.nan)
+    # running sums give every period's mean volume without slicing per period
+    volume_sum = np.vstack([np.zeros(volume.shape[1]), np.nancumsum(volume, axis=0)])
+    volume_count = np.vstack([np.zeros(volume.shape[1]), np.cumsum(~np.isnan(volume), axis=0)])
+    symbols = closes.columns.to_numpy()
+
+    results = {}
+    for period, row in anchor_rows(dates, periods).items():
+        base_row = np.maximum(np.full(len(columns), row), first)
+        start_price = filled[base_row, columns]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (end_price - start_price) / start_price * 100
+            sessions = volume_count[last + 1, columns] - volume_count[base_row + 1, columns]
+            traded = volume_sum[last + 1, columns] - volume_sum[base_row + 1, columns]
+            mean_volume = np.where(sessions > 0, traded / sessions, 0.0)
+        # a period needs at least one session after its base close
+        keep = has_data & np.isfinite(change) & (last > base_row)
+        results[period] = pd.DataFrame({
+            'Symbol': symbols[keep],
+            'Change%': np.round(change[keep], 2),
+            'Start Price': np.round(start_price[keep], 2),
+            'End Price': np.round(end_price[keep], 2),
+            'Volume': mean_volume[keep].astype(np.int64),
+        })
+    return results
+
+
+class MultiPeriodMovers:
+    """top-K gainers and losers for several periods, fed batch by batch from one daily fetch"""
+
+    def __init__(self, periods: List[str], limit: int = 20):
+        invalid = [period for period in periods if period not in REGULAR_PERIODS]
+        if invalid or not periods:
+            raise ValueError(f"Invalid period {', '.join(invalid)}. Must be one of {list(REGULAR_PERIODS.keys())}")
+        self.periods = list(dict.fromkeys(periods))
+        self.rankings = {period: StreamingTopK(limit) for period in self.periods}
+
+    def push(self, closes: pd.DataFrame, volumes: pd.DataFrame):
+        for period, rows in period_returns(closes, volumes, self.periods).items():
+            self.rankings[period].push(rows)
+
+    def leaderboards(self) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame, int]]:
+        """{period: (gainers, losers, symbols ranked)}"""
+        return {period: (*ranking.leaderboard(), ranking.count) for period, ranking in self.rankings.items()}
+
+    def report(self) -> pd.DataFrame:
+        """one table: Period, Side, Rank and the result columns, periods in request order"""
+        parts = []
+        for period, (gainers, losers, _) in self.leaderboards().items():
+            for side, frame in (('gainer', gainers), ('loser', losers)):
+                if frame.empty:
+                    continue
+                frame = frame.reset_index(drop=True)
+                frame.insert(0, 'Rank', range(1, len(frame) + 1))
+                frame.insert(0, 'Side', side)
+                frame.insert(0, 'Period', period)
+                parts.append(frame)
+        if not parts:
+            return pd.DataFrame(columns=['Period', 'Side', 'Rank'] + RESULT_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
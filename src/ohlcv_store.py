@@ -0,0 +1,193 @@
+# import required modules
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from utils.constants import (CACHE_DIR, INTRADAY_PERIOD_MINUTES, PERIOD_DAYS, PRICE_FIELDS, SESSION_PERIODS,
+                             TIME_PERIODS)
+
+# one record per bar; ts is UTC nanoseconds
+BAR_DTYPE = np.dtype([('ts', 'i8')] + [(field, 'f8') for field in PRICE_FIELDS])
+EXCHANGE_TZ = 'America/New_York'
+# relative close difference on an already-stored bar that means upstream re-adjusted the series
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def resolve_window(period: Optional[str] = None, start=None, end=None,
+                   now: Optional[datetime] = None) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """turn period/start/end request arguments into a UTC [start, end) window
+
+    A start of None means "from the first available bar" and an end of None
+    means "up to now". Periods end at the latest session that has opened, so
+    on a weekend or before the open '1d' is still the last session: intraday
+    periods are the last minutes of trading, '1d'/'5d' the last sessions,
+    and longer periods calendar spans back from the last session's date.
+    """
+    end_ts = _utc(end) if end is not None else None
+    if start is not None:
+        return _utc(start), end_ts
+    if period == 'max':
+        return None, end_ts
+    period = period or '1mo'
+    if period not in PERIOD_DAYS and period != 'ytd' and period not in INTRADAY_PERIOD_MINUTES:
+        raise ValueError(f"Invalid period. Must be one of {list(TIME_PERIODS.keys())}")
+
+    from utils.trading_calendar import get_trading_calendar
+
+    if end_ts is not None:
+        anchor = end_ts
+    else:
+        anchor = _utc(now) if now is not None else pd.Timestamp.now(tz='UTC')
+    calendar = get_trading_calendar(anchor.tz_convert(EXCHANGE_TZ).date())
+    session = calendar.latest_session(anchor)
+
+    if period in INTRADAY_PERIOD_MINUTES:
+        # inside a session the window ends now, otherwise at the last close
+        close = min(anchor, pd.Timestamp(session[2])) if session is not None else anchor
+        return close - timedelta(minutes=INTRADAY_PERIOD_MINUTES[period]), end_ts
+
+    last_day = session[0] if session is not None else anchor.tz_convert(EXCHANGE_TZ).date()
+    if period in SESSION_PERIODS:
+        days = calendar.sessions_before(anchor, SESSION_PERIODS[period])
+        first_day = days[0].item() if len(days) else last_day
+        # daily bars are stamped at exchange-local midnight of their session
+        return _utc(pd.Timestamp(first_day)), end_ts
+    if period == 'ytd':
+        return _utc(pd.Timestamp(year=last_day.year, month=1, day=1)), end_ts
+    return _utc(pd.Timestamp(last_day) - timedelta(days=PERIOD_DAYS[period])), end_ts
+
+
+def _utc(value) -> pd.Timestamp:
+    """naive values are exchange-local time"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(EXCHANGE_TZ)
+    return ts.tz_convert('UTC')
+
+
+class OHLCVStore:
+    """per-symbol bar files on disk, one memory-mappable .npy per (interval, symbol)"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(CACHE_DIR, 'ohlcv')
+        # one writer at a time per (interval, symbol); scans, charts and server lookups write concurrently
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((interval, symbol), threading.Lock())
+
+    def _path(self, symbol: str, interval: str, suffix: str) -> str:
+        return os.path.join(self.root, interval, f"{symbol}.{suffix}")
+
+    def meta(self, symbol: str, interval: str) -> Optional[Dict]:
+        """coverage metadata for a symbol, or None if nothing is stored"""
+        try:
+            with open(self._path(symbol, interval, 'json')) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def read(self, symbol: str, interval: str) -> np.ndarray:
+        """stored bars as a read-only memory-mapped record array"""
+        try:
+            return np.load(self._path(symbol, interval, 'npy'), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return np.empty(0, dtype=BAR_DTYPE)
+
+    def read_frame(self, symbol: str, interval: str, start: Optional[pd.Timestamp] = None,
+                   end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """stored bars in [start, end) as an OHLCV frame indexed in exchange time"""
+        bars = self.read(symbol, interval)
+        lo = 0 if start is None else np.searchsorted(bars['ts'], start.value, side='left')
+        hi = len(bars) if end is None else np.searchsorted(bars['ts'], end.value, side='left')
+        window = bars[lo:hi]
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(window['ts']), utc=True)).tz_convert(EXCHANGE_TZ)
+        return pd.DataFrame({field: np.asarray(window[field]) for field in PRICE_FIELDS}, index=index)
+
+    def adjusted_since(self, symbol: str, interval: str, frame: pd.DataFrame,
+                       tolerance: float = ADJUSTMENT_TOLERANCE) -> bool:
+        """whether refetched bars disagree with the finished stored bars they overlap
+
+        Yahoo back-adjusts the whole series after a split or dividend, so a
+        moved close on a bar we already hold means the stored history is stale.
+        """
+        # the last stored bar may have been partial when it was written
+        stored = self.read(symbol, interval)[:-1]
+        fresh = _frame_to_bars(frame)
+        _, old, new = np.intersect1d(stored['ts'], fresh['ts'], assume_unique=True, return_indices=True)
+        if not len(old):
+            return False
+        return not np.allclose(fresh['Close'][new], stored['Close'][old], rtol=tolerance, atol=0, equal_nan=True)
+
+    def write(self, symbol: str, interval: str, frame: pd.DataFrame, covered_start: Optional[pd.Timestamp],
+              fetched_through: pd.Timestamp, replace: bool = False) -> int:
+        """merge new bars into the stored series and return the stored bar count
+
+        New bars win over stored ones from the first new timestamp onward, so a
+        partial last bar from an earlier fetch is overwritten by the final one.
+        """
+        new = _frame_to_bars(frame)
+        with self._lock(symbol, interval):
+            return self._write(symbol, interval, new, covered_start, fetched_through, replace)
+
+    def _write(self, symbol: str, interval: str, new: np.ndarray, covered_start: Optional[pd.Timestamp],
+               fetched_through: pd.Timestamp, replace: bool) -> int:
+        old = np.empty(0, dtype=BAR_DTYPE) if replace else np.array(self.read(symbol, interval))
+        if len(new) and len(old):
+            old = old[old['ts'] < new['ts'][0]]
+        bars = np.concatenate([old, new]) if len(old) else new
+
+        os.makedirs(os.path.join(self.root, interval), exist_ok=True)
+        data_path = self._path(symbol, interval, 'npy')
+        tmp_path = _tmp_path(data_path)
+        with open(tmp_path, 'wb') as f:
+            np.save(f, bars)
+        os.replace(tmp_path, data_path)
+
+        previous = None if replace else self.meta(symbol, interval)
+        if previous is not None:
+            # coverage only grows; None means "from the first available bar"
+            if covered_start is None or previous['covered_start'] is None:
+                covered_start = None
+            else:
+                covered_start = min(covered_start, pd.Timestamp(previous['covered_start'], tz='UTC'))
+
+        meta = {
+            'covered_start': None if covered_start is None else covered_start.value,
+            'fetched_through': fetched_through.value,
+            'fetched_at': time.time(),
+            'bars': int(len(bars)),
+        }
+        meta_path = self._path(symbol, interval, 'json')
+        tmp_path = _tmp_path(meta_path)
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+        return len(bars)
+
+
+def _tmp_path(path: str) -> str:
+    """temp file beside path, unique to this process and thread so concurrent writers never share one"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _frame_to_bars(frame: pd.DataFrame) -> np.ndarray:
+    """OHLCV frame -> sorted bar records, dropping rows without a close"""
+    if frame is None or frame.empty or 'Close' not in frame.columns:
+        return np.empty(0, dtype=BAR_DTYPE)
+    frame = frame[frame['Close'].notna()]
+    index = frame.index
+    if index.tz is None:
+        index = index.tz_localize(EXCHANGE_TZ)
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    bars['ts'] = index.tz_convert('UTC').as_unit('ns').asi8
+    for field in PRICE_FIELDS:
+        bars[field] = frame[field].to_numpy(dtype='f8') if field in frame.columns else np.nan
+    return np.sort(bars, order='ts')
@@ -0,0 +1,66 @@
+# market data providers
+#
+# every module fetches prices, info and symbol listings through the provider
+# returned by get_provider(). Pick a backend with STOCK_DATA_PROVIDER:
+#   yfinance (default)      live Yahoo Finance data
+#   synthetic               generated OHLCV, no network
+#   record:<directory>      live data, captured to <directory>
+#   replay:<directory>      captured data only, no network
+import os
+from typing import Optional
+
+from src.providers.base import MarketDataProvider, ProviderError, RateLimitError, PRICE_FIELDS
+from src.providers.cached import CachedProvider
+from src.providers.multi_resolution import MultiResolutionProvider
+from src.providers.replay import RecordingProvider, ReplayProvider
+from src.providers.synthetic import SyntheticProvider
+
+_provider: Optional[MarketDataProvider] = None
+
+
+def provider_from_spec(spec: str) -> MarketDataProvider:
+    """build a provider from a 'name[:directory]' spec"""
+    name, _, argument = spec.partition(':')
+    name = name.strip().lower()
+
+    # yfinance is slow to import, so it is only loaded for live providers
+    if name in ('', 'yfinance', 'yahoo'):
+        from src.providers.yfinance_provider import YFinanceProvider
+        return YFinanceProvider()
+    if name == 'synthetic':
+        return SyntheticProvider()
+    if name == 'record' and argument:
+        from src.providers.yfinance_provider import YFinanceProvider
+        return RecordingProvider(YFinanceProvider(), argument)
+    if name == 'replay' and argument:
+        return ReplayProvider(argument)
+    raise ValueError(f"Unknown data provider: {spec}")
+
+
+def __getattr__(name: str):
+    # keep `from src.providers import YFinanceProvider` working without an eager import
+    if name == 'YFinanceProvider':
+        from src.providers.yfinance_provider import YFinanceProvider
+        return YFinanceProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_provider() -> MarketDataProvider:
+    """get the process-wide provider, creating it from the environment on first use"""
+    global _provider
+    if _provider is None:
+        _provider = provider_from_spec(os.environ.get('STOCK_DATA_PROVIDER', 'yfinance'))
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider) -> None:
+    """replace the process-wide provider"""
+    global _provider
+    _provider = provider
+
+
+__all__ = [
+    'MarketDataProvider', 'ProviderError', 'RateLimitError', 'PRICE_FIELDS',
+    'YFinanceProvider', 'CachedProvider', 'MultiResolutionProvider', 'RecordingProvider', 'ReplayProvider', 'SyntheticProvider',
+    'provider_from_spec', 'get_provider', 'set_provider',
+]
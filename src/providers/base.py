@@ -0,0 +1,73 @@
+# import required modules
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+import pandas as pd
+
+from utils.constants import PRICE_FIELDS
+
+
+class ProviderError(Exception):
+    """raised when a provider cannot serve a request"""
+
+
+class RateLimitError(ProviderError):
+    """raised when the upstream source throttles us (HTTP 429)"""
+
+
+class MarketDataProvider(ABC):
+    """source of price history, quote info and symbol listings"""
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """get OHLCV history for one symbol (period/start/end/interval kwargs)"""
+
+    def bulk_history(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        """get OHLCV history for many symbols as a (field, symbol) column frame"""
+        frames = {}
+        for symbol in symbols:
+            try:
+                hist = self.history(symbol, **kwargs)
+            except ProviderError:
+                continue
+            if hist is not None and not hist.empty:
+                frames[symbol] = hist[[col for col in PRICE_FIELDS if col in hist.columns]]
+
+        if not frames:
+            return pd.DataFrame()
+
+        wide = pd.concat(frames, axis=1)  # (symbol, field)
+        return wide.swaplevel(0, 1, axis=1).sort_index(axis=1, level=0)
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """get quote and fundamental info for one symbol"""
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """get fresh quote fields for many symbols from one bulk daily-bar request"""
+        wide = self.bulk_history(symbols, period='5d', interval='1d')
+        if wide is None or wide.empty or not isinstance(wide.columns, pd.MultiIndex):
+            return {}
+
+        quotes = {}
+        tickers = set(wide.columns.get_level_values(1))
+        for symbol in symbols:
+            if symbol not in tickers or ('Close', symbol) not in wide.columns:
+                continue
+            close = wide[('Close', symbol)].dropna()
+            if close.empty:
+                continue
+            quote = {'currentPrice': float(close.iloc[-1]), 'regularMarketPrice': float(close.iloc[-1])}
+            if len(close) > 1:
+                quote['previousClose'] = float(close.iloc[-2])
+            if ('Volume', symbol) in wide.columns:
+                volume = wide[('Volume', symbol)].reindex(close.index)
+                if volume.notna().iloc[-1]:
+                    quote['volume'] = int(volume.iloc[-1])
+            quotes[symbol] = quote
+        return quotes
+
+    @abstractmethod
+    def symbol_universe(self, scope: str) -> List[str]:
+        """get raw listed symbols for a scope ('sp500' or 'all')"""
@@ -0,0 +1,171 @@
+# import required modules
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+from src.metrics import get_metrics
+from src.providers.base import MarketDataProvider, PRICE_FIELDS
+from src.ohlcv_store import OHLCVStore, resolve_window
+
+
+class CachedProvider(MarketDataProvider):
+    """serve history from a local OHLCVStore, fetching only bars newer than what is stored"""
+
+    name = "cached"
+
+    def __init__(self, inner: MarketDataProvider, store: Optional[OHLCVStore] = None,
+                 refresh_after: float = 60.0):
+        self.inner = inner
+        self.store = store or OHLCVStore()
+        # open-ended requests younger than this are answered from disk alone
+        self.refresh_after = refresh_after
+        # bumped each time a symbol's history is replaced after a re-adjustment, so caches of
+        # values derived from the old bars can tell they're stale
+        self.generations: Dict[str, int] = defaultdict(int)
+
+    def _plan(self, symbol: str, interval: str, start: Optional[pd.Timestamp],
+              end: Optional[pd.Timestamp]) -> Optional[Dict[str, Any]]:
+        """request kwargs needed to bring a symbol up to date, or None if already covered"""
+        meta = self.store.meta(symbol, interval)
+        if meta is None:
+            return {'mode': 'full'}
+
+        covered_start = meta['covered_start']
+        if start is None and covered_start is not None:
+            return {'mode': 'full'}
+        if start is not None and covered_start is not None and start.value < covered_start:
+            return {'mode': 'full'}
+
+        if end is not None:
+            if end.value <= meta['fetched_through']:
+                return None
+        elif time.time() - meta['fetched_through'] / 1e9 < self.refresh_after:
+            # only a recent open-ended fetch reaches up to now
+            return None
+
+        bars = self.store.read(symbol, interval)
+        if len(bars) == 0:
+            return {'mode': 'full'}
+        # refetch from the session before the last stored bar so a partial bar gets replaced
+        # and at least one finished bar overlaps, to spot a re-adjusted series
+        anchor = pd.Timestamp(int(bars['ts'][max(len(bars) - 2, 0)]), tz='UTC').tz_convert('America/New_York')
+        return {'mode': 'incremental', 'start': anchor.strftime('%Y-%m-%d')}
+
+    def covers(self, symbol: str, interval: str, start: Optional[pd.Timestamp]) -> bool:
+        """whether stored bars reach back to `start`, so at most newer bars need fetching"""
+        meta = self.store.meta(symbol, interval)
+        if meta is None:
+            return False
+        covered_start = meta['covered_start']
+        if covered_start is None:
+            return True
+        return start is not None and start.value >= covered_start
+
+    def bulk_history(self, symbols: List[str], period: Optional[str] = None, start=None, end=None,
+                     interval: str = "1d", **kwargs) -> pd.DataFrame:
+        window_start, window_end = resolve_window(period, start, end)
+
+        # group symbols by the request that brings them up to date
+        groups = defaultdict(list)
+        for symbol in symbols:
+            plan = self._plan(symbol, interval, window_start, window_end)
+            if plan is not None:
+                groups[(plan['mode'], plan.get('start'))].append(symbol)
+        metrics = get_metrics()
+        stale = sum(len(group) for group in groups.values())
+        metrics.cache_lookup('ohlcv', True, len(symbols) - stale)
+        metrics.cache_lookup('ohlcv', False, stale)
+
+        fetched_through = window_end if window_end is not None else pd.Timestamp.now(tz='UTC')
+        adjusted = []
+        for (mode, fetch_start), group in groups.items():
+            if mode == 'full':
+                # replace the stored series outright so it never has gaps; periods are sent as the
+                # session-anchored window start, since upstream doesn't know intraday periods
+                request = {'start': start if start is not None else window_start} if window_start is not None else (
+                    {'period': period} if period else {})
+                covered_start, replace = window_start, True
+            else:
+                request = {'start': fetch_start}
+                covered_start, replace = window_start, False
+            if end is not None:
+                request['end'] = end
+
+            try:
+                wide = self.inner.bulk_history(group, interval=interval, **request, **kwargs)
+            except Exception:
+                if mode == 'full':
+                    raise
+                # serve the stored (slightly stale) bars for this group
+                continue
+            if wide is not None and not wide.empty:
+                # decoded size of the response; the wire size isn't visible through the provider
+                metrics.inc('download_bytes_total', int(wide.memory_usage(index=True).sum()), source='history')
+            for symbol, frame in _split_symbols(wide, group).items():
+                if mode == 'incremental' and self.store.adjusted_since(symbol, interval, frame):
+                    adjusted.append(symbol)
+                elif frame['Close'].notna().any() or mode == 'incremental':
+                    self.store.write(symbol, interval, frame, covered_start, fetched_through, replace=replace)
+        if adjusted:
+            metrics.inc('store_readjusted_total', len(adjusted), interval=interval)
+            self._refetch(adjusted, interval, end, fetched_through, **kwargs)
+
+        frames = {}
+        for symbol in symbols:
+            frame = self.store.read_frame(symbol, interval, window_start, window_end)
+            if not frame.empty:
+                frames[symbol] = frame
+        if not frames:
+            return pd.DataFrame()
+        wide = pd.concat(frames, axis=1)
+        return wide.swaplevel(0, 1, axis=1).sort_index(axis=1, level=0)
+
+    def _refetch(self, symbols: List[str], interval: str, end, fetched_through: pd.Timestamp, **kwargs):
+        """replace the whole stored series of symbols whose history upstream has re-adjusted"""
+        groups = defaultdict(list)
+        for symbol in symbols:
+            groups[self.store.meta(symbol, interval)['covered_start']].append(symbol)
+        for covered, group in groups.items():
+            covered_start = None if covered is None else pd.Timestamp(covered, tz='UTC')
+            request = {'period': 'max'} if covered_start is None else {'start': covered_start}
+            if end is not None:
+                request['end'] = end
+            try:
+                wide = self.inner.bulk_history(group, interval=interval, **request, **kwargs)
+            except Exception:
+                # keep the stored bars; the next incremental fetch will spot the mismatch again
+                continue
+            for symbol, frame in _split_symbols(wide, group).items():
+                if frame['Close'].notna().any():
+                    self.store.write(symbol, interval, frame, covered_start, fetched_through, replace=True)
+                    self.generations[symbol] += 1
+
+    def history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        wide = self.bulk_history([symbol], **kwargs)
+        if wide.empty:
+            return pd.DataFrame(columns=PRICE_FIELDS)
+        return wide.xs(symbol, axis=1, level=1)[PRICE_FIELDS]
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return self.inner.info(symbol)
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        # quotes must be fresh, so they bypass the store
+        return self.inner.quotes(symbols)
+
+    def symbol_universe(self, scope: str) -> List[str]:
+        return self.inner.symbol_universe(scope)
+
+
+def _split_symbols(wide: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """(field, symbol) frame -> one OHLCV frame per symbol present"""
+    if wide is None or wide.empty:
+        return {}
+    if not isinstance(wide.columns, pd.MultiIndex):
+        return {symbols[0]: wide} if len(symbols) == 1 else {}
+    tickers = wide.columns.get_level_values(1)
+    return {
+        symbol: wide.xs(symbol, axis=1, level=1).reindex(columns=PRICE_FIELDS)
+        for symbol in symbols if symbol in tickers
+    }
@@ -0,0 +1,97 @@
+# import required modules
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+from src.metrics import get_metrics
+from src.providers.base import MarketDataProvider, PRICE_FIELDS
+from src.providers.cached import CachedProvider
+from src.ohlcv_store import resolve_window
+from src.resample import can_resample, resample_ohlcv
+
+# intervals kept in the store; every other bar size is derived from one of these
+BASE_INTERVALS = ('1m', '5m', '1h', '1d')
+# base fetched for each bar size when nothing usable is stored yet
+FETCH_BASE: Dict[str, str] = {
+    '1m': '1m', '2m': '1m', '5m': '5m', '15m': '5m', '30m': '5m', '60m': '1h', '1h': '1h', '90m': '5m',
+    '1d': '1d', '1wk': '1d', '1mo': '1d', '3mo': '1d',
+}
+# how many days back one Yahoo request can reach for each intraday interval
+INTRADAY_LIMIT_DAYS: Dict[str, int] = {
+    '1m': 7, '2m': 60, '5m': 60, '15m': 60, '30m': 60, '60m': 730, '1h': 730, '90m': 60,
+}
+
+
+class MultiResolutionProvider(MarketDataProvider):
+    """serve every bar size from one stored base interval per symbol, resampled locally
+
+    A request for 15m, 1h, 1wk, ... bars is answered from the finest base
+    (1m, 5m, 1h or 1d) the store already holds for the window, or else from
+    one fetch of the base that bar size maps to, so the menu paths that
+    each pick their own interval share downloads and agree with each other.
+    """
+
+    name = "multi-resolution"
+
+    def __init__(self, cached: CachedProvider):
+        self.cached = cached
+
+    def _available(self, interval: str, start: Optional[pd.Timestamp]) -> bool:
+        """whether upstream serves `interval` bars as far back as `start`"""
+        limit = INTRADAY_LIMIT_DAYS.get(interval)
+        if limit is None:
+            return True
+        return start is not None and start >= pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=limit)
+
+    def source_interval(self, symbol: str, interval: str, start: Optional[pd.Timestamp]) -> str:
+        """interval to read from the store (fetching if needed) for `interval` bars from `start` on"""
+        if interval not in FETCH_BASE:
+            return interval
+        candidates = [base for base in BASE_INTERVALS
+                      if can_resample(base, interval) and self._available(base, start)]
+        if interval not in candidates:
+            candidates.append(interval)
+        if len(candidates) > 1:
+            for base in candidates:
+                if self.cached.covers(symbol, base, start):
+                    return base
+        preferred = FETCH_BASE[interval]
+        return preferred if preferred in candidates else candidates[-1]
+
+    def bulk_history(self, symbols: List[str], period: Optional[str] = None, start=None, end=None,
+                     interval: str = "1d", **kwargs) -> pd.DataFrame:
+        window_start, _ = resolve_window(period, start, end)
+        groups = defaultdict(list)
+        for symbol in symbols:
+            groups[self.source_interval(symbol, interval, window_start)].append(symbol)
+
+        metrics = get_metrics()
+        parts = []
+        for source, group in groups.items():
+            wide = self.cached.bulk_history(group, period=period, start=start, end=end, interval=source, **kwargs)
+            if source != interval and wide is not None and not wide.empty:
+                with metrics.span('resample', source=source, interval=interval, symbols=len(group)):
+                    wide = resample_ohlcv(wide, interval)
+                metrics.inc('resampled_symbols_total', len(group), source=source, interval=interval)
+            if wide is not None and not wide.empty:
+                parts.append(wide)
+
+        if not parts:
+            return pd.DataFrame()
+        wide = parts[0] if len(parts) == 1 else pd.concat(parts, axis=1)
+        return wide.sort_index(axis=1, level=0)
+
+    def history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        wide = self.bulk_history([symbol], **kwargs)
+        if wide.empty:
+            return pd.DataFrame(columns=PRICE_FIELDS)
+        return wide.xs(symbol, axis=1, level=1)[PRICE_FIELDS]
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return self.cached.info(symbol)
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        return self.cached.quotes(symbols)
+
+    def symbol_universe(self, scope: str) -> List[str]:
+        return self.cached.symbol_universe(scope)
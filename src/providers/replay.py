@@ -0,0 +1,163 @@
+# import required modules
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.ohlcv_store import resolve_window
+from src.providers.base import MarketDataProvider, ProviderError
+
+# arguments that change how a call is made, not what it returns
+TRANSPORT_KWARGS = ('timeout', 'threads', 'progress', 'proxy', 'session')
+# the requested window is cut from the recorded bars on replay, so it isn't part of a key
+WINDOW_KWARGS = ('period', 'start', 'end')
+
+
+def _request_key(method: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """stable file name for one provider call, ignoring transport options and the date window"""
+    kwargs = {name: value for name, value in kwargs.items()
+              if name not in TRANSPORT_KWARGS and name not in WINDOW_KWARGS}
+    if method == 'history':
+        # a missing interval means daily bars
+        kwargs.setdefault('interval', '1d')
+    payload = json.dumps([method, list(args), sorted(kwargs.items())], default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _symbol_frames(wide: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """(field, symbol) frame -> one frame per symbol that has prices"""
+    if wide is None or wide.empty:
+        return {}
+    if not isinstance(wide.columns, pd.MultiIndex):
+        return {symbols[0]: wide} if len(symbols) == 1 else {}
+    tickers = set(wide.columns.get_level_values(1))
+    frames = {symbol: wide.xs(symbol, axis=1, level=1) for symbol in symbols if symbol in tickers}
+    return {symbol: frame for symbol, frame in frames.items() if frame['Close'].notna().any()}
+
+
+def _window(bars: Dict[str, Any], period=None, start=None, end=None) -> pd.DataFrame:
+    """the recorded bars inside the requested window, periods counted back from when they were recorded"""
+    frame = bars['frame']
+    lower, upper = resolve_window(period, start, end, now=bars['recorded'])
+    index = frame.index
+    if index.tz is None:
+        # naive stamps are exchange-local wall time
+        lower, upper = [None if bound is None else bound.tz_convert('America/New_York').tz_localize(None)
+                        for bound in (lower, upper)]
+    keep = np.ones(len(index), dtype=bool)
+    if lower is not None:
+        keep &= index >= lower
+    if upper is not None:
+        keep &= index < upper
+    return frame[keep]
+
+
+class _FixtureStore:
+    """pickled responses laid out as <directory>/<method>/<key>.pkl"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def path(self, method: str, key: str) -> str:
+        return os.path.join(self.directory, method, f"{key}.pkl")
+
+    def load(self, method: str, key: str):
+        with open(self.path(method, key), 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, method: str, key: str, value):
+        path = self.path(method, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def merge_bars(self, key: str, frame: pd.DataFrame):
+        """add bars to a symbol's recording; bars fetched again replace the older copy"""
+        with self._lock:
+            try:
+                stored = self.load('history', key)['frame']
+                frame = pd.concat([stored, frame])
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            except FileNotFoundError:
+                pass
+            self.save('history', key, {'frame': frame, 'recorded': pd.Timestamp.now(tz='UTC')})
+
+
+class RecordingProvider(MarketDataProvider):
+    """pass calls through to another provider and capture every response to disk
+
+    Price history is kept per symbol and interval, merged across calls, so
+    a replay can serve any window the recording covers.
+    """
+
+    name = "record"
+
+    def __init__(self, inner: MarketDataProvider, directory: str):
+        self.inner = inner
+        self.store = _FixtureStore(directory)
+
+    def _record(self, method: str, *args, **kwargs):
+        value = getattr(self.inner, method)(*args, **kwargs)
+        self.store.save(method, _request_key(method, args, kwargs), value)
+        return value
+
+    def history(self, symbol: str, **kwargs):
+        frame = self.inner.history(symbol, **kwargs)
+        if frame is not None and not frame.empty:
+            self.store.merge_bars(_request_key('history', (symbol,), kwargs), frame)
+        return frame
+
+    def bulk_history(self, symbols: List[str], **kwargs):
+        symbols = list(symbols)
+        wide = self.inner.bulk_history(symbols, **kwargs)
+        for symbol, frame in _symbol_frames(wide, symbols).items():
+            self.store.merge_bars(_request_key('history', (symbol,), kwargs), frame)
+        return wide
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return self._record('info', symbol)
+
+    def symbol_universe(self, scope: str) -> List[str]:
+        return self._record('symbol_universe', scope)
+
+
+class ReplayProvider(MarketDataProvider):
+    """serve responses captured by RecordingProvider without touching the network"""
+
+    name = "replay"
+
+    def __init__(self, directory: str, fallback: Optional[MarketDataProvider] = None):
+        if not os.path.isdir(directory):
+            raise ValueError(f"Replay directory not found: {directory}")
+        self.store = _FixtureStore(directory)
+        self.fallback = fallback
+
+    def _replay(self, method: str, *args, **kwargs):
+        key = _request_key(method, args, kwargs)
+        try:
+            return self.store.load(method, key)
+        except FileNotFoundError:
+            if self.fallback is not None:
+                return getattr(self.fallback, method)(*args, **kwargs)
+            raise ProviderError(f"No recorded response for {method}{args}")
+
+    def history(self, symbol: str, **kwargs):
+        bars = self._replay('history', symbol, **kwargs)
+        if not isinstance(bars, dict):
+            # answered by the fallback provider
+            return bars
+        return _window(bars, kwargs.get('period'), kwargs.get('start'), kwargs.get('end'))
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return self._replay('info', symbol)
+
+    def symbol_universe(self, scope: str) -> List[str]:
+        return self._replay('symbol_universe', scope)
@@ -0,0 +1,189 @@
+# import required modules
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from src.providers.base import MarketDataProvider, ProviderError, RateLimitError, PRICE_FIELDS
+from src.ohlcv_store import resolve_window
+from utils.constants import PERIOD_DAYS
+
+# pandas frequency for each yfinance interval string
+INTERVAL_FREQ: Dict[str, str] = {
+    "1m": "1min", "2m": "2min", "5m": "5min", "15m": "15min", "30m": "30min",
+    "60m": "60min", "90m": "90min", "1h": "60min",
+    "1d": "B", "5d": "5B", "1wk": "W-FRI", "1mo": "BMS", "3mo": "BQS",
+}
+
+
+class SyntheticProvider(MarketDataProvider):
+    """deterministic random-walk OHLCV with injectable latency and failures"""
+
+    name = "synthetic"
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 symbol_failure_rate: float = 0.0, rate_limit: Optional[float] = None,
+                 universe_size: int = 500, now: Optional[datetime] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.symbol_failure_rate = symbol_failure_rate
+        # requests per second above which calls are rejected like an HTTP 429
+        self.rate_limit = rate_limit
+        self._recent: List[float] = []
+        self.universe_size = universe_size
+        self.now = now
+        self.seed = seed
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def _round_trip(self):
+        """simulate one network request"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter) if self.jitter else self.latency
+            failed = self._rng.random() < self.failure_rate
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                self._recent = [t for t in self._recent if now - t < 1.0]
+                self._recent.append(now)
+                if len(self._recent) > self.rate_limit:
+                    raise RateLimitError("synthetic rate limit exceeded")
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise ProviderError("synthetic request failure")
+
+    def _symbol_seed(self, symbol: str) -> int:
+        return zlib.crc32(symbol.encode()) ^ self.seed
+
+    def _symbol_fails(self, symbol: str) -> bool:
+        # failures are stable per symbol so repeated runs agree
+        return (self._symbol_seed(symbol) % 10_000) / 10_000 < self.symbol_failure_rate
+
+    def _index(self, period: Optional[str] = None, start=None, end=None, interval: str = "1d") -> pd.DatetimeIndex:
+        """build the bar timestamps a real request would return"""
+        end_ts = _naive_eastern(end if end is not None else (self.now or datetime.now()))
+        if start is not None:
+            start_ts = _naive_eastern(start)
+        elif period == "max":
+            start_ts = end_ts - timedelta(days=PERIOD_DAYS["max"])
+        else:
+            # like Yahoo, a period ends at the latest session (a weekend '1d' is Friday)
+            start_ts = _naive_eastern(resolve_window(period, now=end_ts)[0])
+
+        freq = INTERVAL_FREQ.get(interval, "B")
+        if freq.endswith("min"):
+            days = pd.bdate_range(start_ts.normalize(), end_ts.normalize())
+            step = pd.Timedelta(freq)
+            session = pd.timedelta_range("09:30:00", "15:59:00", freq=step)
+            index = pd.DatetimeIndex([day + offset for day in days for offset in session])
+            index = index[(index >= start_ts) & (index <= end_ts)]
+        else:
+            index = pd.date_range(start_ts.normalize(), end_ts.normalize(), freq=freq)
+            index = index[index < end_ts] if end is not None else index
+        return index.tz_localize("America/New_York")
+
+    def _ohlcv(self, symbol: str, index: pd.DatetimeIndex) -> pd.DataFrame:
+        """price path that is a pure function of (symbol, timestamp) so overlapping requests agree"""
+        if len(index) == 0:
+            return pd.DataFrame(columns=PRICE_FIELDS)
+
+        seed = self._symbol_seed(symbol)
+        rng = np.random.default_rng(seed)
+        base = 20 + seed % 480
+        amplitude = rng.uniform(0.05, 0.4, 3)
+        cycle_days = rng.uniform(3, 300, 3)
+        phase = rng.uniform(0, 2 * np.pi, 3)
+        drift = rng.normal(0.00015, 0.0003)
+
+        minutes = index.as_unit('ns').asi8 // 60_000_000_000
+        days = minutes / 1440.0
+        # drift is anchored at 2024-01-01 so prices stay in a realistic range
+        trend = drift * (days - 19723) + (amplitude[:, None] * np.sin(days / cycle_days[:, None] + phase[:, None])).sum(axis=0)
+        # per-bar noise keyed by timestamp, uniform in [-0.5, 0.5)
+        noise = ((minutes.astype(np.uint64) * np.uint64(2654435761) + np.uint64(seed)) % np.uint64(10_000)) / 10_000 - 0.5
+
+        close = base * np.exp(trend + noise * 0.02)
+        open_ = close * np.exp(-noise * 0.008)
+        spread = close * (0.002 + np.abs(noise) * 0.01)
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread
+        volume = (100_000 * (1 + seed % 50) * (1 + np.abs(noise))).astype(np.int64)
+        return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                            index=index)
+
+    def history(self, symbol: str, period: Optional[str] = None, start=None, end=None,
+                interval: str = "1d", **kwargs) -> pd.DataFrame:
+        self._round_trip()
+        if self._symbol_fails(symbol):
+            return pd.DataFrame(columns=PRICE_FIELDS)
+        return self._ohlcv(symbol, self._index(period, start, end, interval))
+
+    def bulk_history(self, symbols: List[str], period: Optional[str] = None, start=None, end=None,
+                     interval: str = "1d", **kwargs) -> pd.DataFrame:
+        self._round_trip()
+        index = self._index(period, start, end, interval)
+        frames = {}
+        for symbol in symbols:
+            if self._symbol_fails(symbol):
+                # yfinance reports failed tickers as all-NaN columns
+                frames[symbol] = pd.DataFrame(np.nan, index=index, columns=PRICE_FIELDS)
+            else:
+                frames[symbol] = self._ohlcv(symbol, index)
+        if not frames:
+            return pd.DataFrame()
+        wide = pd.concat(frames, axis=1)
+        return wide.swaplevel(0, 1, axis=1).sort_index(axis=1, level=0)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        self._round_trip()
+        if self._symbol_fails(symbol):
+            return {}
+        hist = self._ohlcv(symbol, self._index("1y"))
+        close = hist['Close']
+        price = float(close.iloc[-1])
+        return {
+            'symbol': symbol,
+            'longName': f"{symbol} Synthetic Inc.",
+            'sector': 'Synthetic',
+            'industry': 'Simulation',
+            'currentPrice': price,
+            'regularMarketPrice': price,
+            'marketCap': price * 1e8,
+            'fiftyTwoWeekHigh': float(close.max()),
+            'fiftyTwoWeekLow': float(close.min()),
+            'volume': int(hist['Volume'].iloc[-1]),
+            'averageVolume': int(hist['Volume'].mean()),
+            'trailingPE': 20.0,
+            'dividendYield': 0.01,
+        }
+
+    def symbol_universe(self, scope: str) -> List[str]:
+        size = self.universe_size if scope == 'sp500' else self.universe_size * 12
+        return [synthetic_symbol(i) for i in range(size)]
+
+
+def _naive_eastern(value) -> pd.Timestamp:
+    """timestamps are generated as naive exchange-local time"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("America/New_York").tz_localize(None)
+    return ts
+
+
+def synthetic_symbol(i: int) -> str:
+    """map an integer to a short letters-only ticker (A..Z, AA.., ...)"""
+    # no W/R/P/Q, so a five-letter name never ends in the special suffixes clean_symbols drops
+    letters = "ABCDEFGHIJKLMNOSTUVXYZ"
+    name = ""
+    i += 1
+    while i:
+        i, rem = divmod(i - 1, len(letters))
+        name = letters[rem] + name
+    return name
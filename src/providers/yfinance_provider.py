@@ -0,0 +1,75 @@
+# import required modules
+from typing import Any, Dict, List
+import pandas as pd
+import yfinance as yf
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:
+    # yfinance releases before 0.2.55 have no rate-limit exception to translate
+    class YFRateLimitError(Exception):
+        """never raised; stands in for the exception older yfinance lacks"""
+
+from src.providers.base import MarketDataProvider, RateLimitError
+
+SP500_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+ALL_TICKERS_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqtraded.txt"
+
+
+class YFinanceProvider(MarketDataProvider):
+    """live data from Yahoo Finance"""
+
+    name = "yfinance"
+
+    def __init__(self, session=None):
+        self.session = session
+
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        if self.session is not None:
+            return yf.Ticker(symbol, session=self.session)
+        return yf.Ticker(symbol)
+
+    def history(self, symbol: str, **kwargs) -> pd.DataFrame:
+        try:
+            return self._ticker(symbol).history(**kwargs)
+        except YFRateLimitError as e:
+            raise RateLimitError(str(e)) from e
+
+    def bulk_history(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        options = {
+            'group_by': 'column',
+            'auto_adjust': True,
+            'progress': False,
+            'threads': True,
+        }
+        if self.session is not None:
+            options['session'] = self.session
+        options.update(kwargs)
+        try:
+            return yf.download(list(symbols), **options)
+        except YFRateLimitError as e:
+            raise RateLimitError(str(e)) from e
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        try:
+            return self._ticker(symbol).info
+        except YFRateLimitError as e:
+            raise RateLimitError(str(e)) from e
+
+    def symbol_universe(self, scope: str) -> List[str]:
+        if scope == 'sp500':
+            sp500_df = pd.read_html(SP500_URL)[0]
+            return sp500_df['Symbol'].tolist()
+
+        df = pd.read_csv(ALL_TICKERS_URL, sep='|', comment='#')
+
+        # filter active stocks
+        if 'Test Issue' in df.columns:
+            df = df[df['Test Issue'] == 'N']
+        if 'ETF' in df.columns:
+            df = df[df['ETF'] == 'N']
+
+        # get symbol column
+        symbol_col = [col for col in df.columns if 'symbol' in col.lower()]
+        if not symbol_col:
+            raise ValueError("Could not find symbol column in data")
+        return df[symbol_col[0]].tolist()
@@ -0,0 +1,69 @@
+# import required modules
+import heapq
+import itertools
+import threading
+from typing import List, Tuple
+import pandas as pd
+
+from src.cross_section import RESULT_COLUMNS
+
+
+class StreamingTopK:
+    """running top-K gainers and losers over a stream of result batches in O(K) memory
+
+    Gainers live in a min-heap keyed on change (the weakest gainer is evicted
+    first) and losers in a min-heap keyed on negated change.
+    """
+
+    def __init__(self, k: int, key: str = 'Change%'):
+        self.k = k
+        self.key = key
+        self.count = 0
+        self._gainers: List[Tuple] = []
+        self._losers: List[Tuple] = []
+        self._columns = list(RESULT_COLUMNS)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def push(self, rows: pd.DataFrame):
+        """fold a batch of result rows into both heaps"""
+        if rows.empty:
+            return
+        columns = list(rows.columns)
+        position = columns.index(self.key)
+        with self._lock:
+            for row in rows.itertuples(index=False, name=None):
+                value = row[position]
+                if value != value:  # NaN
+                    continue
+                self.count += 1
+                order = next(self._sequence)
+                self._offer(self._gainers, (value, -order, row))
+                self._offer(self._losers, (-value, -order, row))
+            self._columns = columns
+
+    def _offer(self, heap: List[Tuple], entry: Tuple):
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def leaderboard(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """current (gainers, losers), best first"""
+        with self._lock:
+            gainers = [entry[2] for entry in sorted(self._gainers, reverse=True)]
+            losers = [entry[2] for entry in sorted(self._losers, reverse=True)]
+            columns = self._columns
+        return (pd.DataFrame(gainers, columns=columns).reset_index(drop=True),
+                pd.DataFrame(losers, columns=columns).reset_index(drop=True))
+
+    def status(self) -> str:
+        """one-line summary of the current leader and laggard"""
+        with self._lock:
+            if not self._gainers:
+                return ""
+            best = max(self._gainers)
+            worst = max(self._losers)
+        symbol_at = self._columns.index('Symbol')
+        return (f"Top {best[2][symbol_at]} {best[0]:+.2f}% | "
+                f"Bottom {worst[2][symbol_at]} {-worst[0]:+.2f}% | {self.count} ranked")
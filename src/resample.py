@@ -0,0 +1,86 @@
+# import required modules
+from typing import Dict, Optional
+import pandas as pd
+
+EXCHANGE_TZ = 'America/New_York'
+# regular session open; intraday bars are counted from here
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+
+# bar length of each intraday interval string, in minutes
+INTRADAY_MINUTES: Dict[str, int] = {
+    '1m': 1, '2m': 2, '5m': 5, '15m': 15, '30m': 30, '60m': 60, '1h': 60, '90m': 90,
+}
+# intervals built from daily bars, with the calendar unit that labels them
+CALENDAR_INTERVALS: Dict[str, Optional[str]] = {'1d': None, '1wk': 'W', '1mo': 'M', '3mo': 'Q'}
+
+# how each OHLCV field combines across the bars of one bin
+AGGREGATIONS: Dict[str, str] = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def can_resample(source: str, target: str) -> bool:
+    """whether `target` bars can be built exactly from `source` bars"""
+    if source == target:
+        return True
+    if source in INTRADAY_MINUTES and target in INTRADAY_MINUTES:
+        return INTRADAY_MINUTES[target] % INTRADAY_MINUTES[source] == 0
+    # daily and longer bars come from whole sessions only
+    return source == '1d' and target in CALENDAR_INTERVALS
+
+
+def bar_labels(index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    """the `interval` bar each timestamp falls in, labelled the way Yahoo labels it
+
+    Intraday bins start at the 09:30 session open (so 1h bars are 09:30,
+    10:30, ...), daily bars are the session date at midnight, weekly bars
+    the Monday and monthly/quarterly bars the first day, all exchange-local.
+    """
+    aware = index.tz is not None
+    local = index.tz_convert(EXCHANGE_TZ).tz_localize(None) if aware else index
+    days = local.normalize()
+
+    if interval in INTRADAY_MINUTES:
+        step = pd.Timedelta(minutes=INTRADAY_MINUTES[interval])
+        labels = days + SESSION_OPEN + ((local - days - SESSION_OPEN) // step) * step
+    elif interval == '1d':
+        labels = days
+    elif interval == '1wk':
+        labels = days - pd.to_timedelta(days.weekday, unit='D')
+    elif interval in CALENDAR_INTERVALS:
+        labels = days.to_period(CALENDAR_INTERVALS[interval]).to_timestamp()
+    else:
+        raise ValueError(f"Invalid interval. Must be one of {list(INTRADAY_MINUTES) + list(CALENDAR_INTERVALS)}")
+    return pd.DatetimeIndex(labels).tz_localize(EXCHANGE_TZ) if aware else pd.DatetimeIndex(labels)
+
+
+def _aggregate(frame: pd.DataFrame, labels: pd.DatetimeIndex, how: str) -> pd.DataFrame:
+    grouped = frame.groupby(labels, sort=True)
+    if how == 'sum':
+        # a bin with no volume reported stays NaN rather than 0
+        return grouped.sum(min_count=1)
+    return grouped.agg(how)
+
+
+def resample_ohlcv(frame: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """coarser OHLCV bars from finer ones: first open, highest high, lowest low, last close, summed volume
+
+    Works on a single-symbol frame or a (field, symbol) wide frame; NaN
+    bars (a symbol not trading yet) are skipped within a bin and bins
+    with no close at all are dropped.
+    """
+    if frame is None or frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+        return frame
+    labels = bar_labels(frame.index, interval)
+
+    if isinstance(frame.columns, pd.MultiIndex):
+        fields = [field for field in AGGREGATIONS if field in frame.columns.get_level_values(0)]
+        parts = {field: _aggregate(frame[field], labels, AGGREGATIONS[field]) for field in fields}
+        bars = pd.concat(parts, axis=1)
+        closes = bars['Close'] if 'Close' in parts else None
+        keep = closes.notna().any(axis=1) if closes is not None else slice(None)
+    else:
+        fields = [field for field in AGGREGATIONS if field in frame.columns]
+        bars = pd.concat({field: _aggregate(frame[field], labels, AGGREGATIONS[field]) for field in fields}, axis=1)
+        keep = bars['Close'].notna() if 'Close' in bars.columns else slice(None)
+    bars = bars[keep]
+    bars.index.name = frame.index.name
+    return bars
@@ -0,0 +1,334 @@
+# HTTP service mode
+#
+# a small asyncio HTTP/1.1 server (standard library only) over one shared
+# StockAnalysis, so every client reads through the same warm price store,
+# universe cache and info cache. Routes (GET, JSON unless noted):
+#   /health
+#   /movers?period=1d&scope=sp500&limit=20
+#   /volatility?period=3mo&scope=sp500&limit=20&metric=Realized Vol%
+#   /custom-period?start=YYYY-MM-DD&end=YYYY-MM-DD&scope=sp500&limit=50
+#   /info/<TICKER>  or  /info?symbols=AAPL,MSFT
+#   /history/<TICKER>?period=1mo
+#   /chart/<TICKER>.png?period=6mo          (image/png)
+#   /metrics                                (Prometheus text)
+#   /metrics.json                           (run report)
+#
+# identical requests that arrive while one is running share its result
+# (single-flight), and scan results are reused for `result_ttl` seconds.
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from utils.constants import TIME_PERIODS
+
+SCOPES = {'sp500': True, 'all': False}
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """an error answered with a status code and a JSON message"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SingleFlight:
+    """coalesce concurrent calls with the same key into one, and keep results for `ttl` seconds
+
+    At most `max_results` results are kept; expired ones are dropped as new
+    ones come in, and past the cap the oldest go first.
+    """
+
+    def __init__(self, ttl: float = 0, max_results: int = 256):
+        self.ttl = ttl
+        self.max_results = max_results
+        self.calls = 0
+        self.coalesced = 0
+        self._running: Dict[Tuple, asyncio.Future] = {}
+        # oldest first, so expired results are always at the front
+        self._results: 'OrderedDict[Tuple, Tuple[float, Any]]' = OrderedDict()
+
+    def _store(self, key: Tuple, result: Any):
+        now = time.monotonic()
+        self._results.pop(key, None)
+        self._results[key] = (now, result)
+        while self._results:
+            oldest = next(iter(self._results.values()))
+            if now - oldest[0] < self.ttl and len(self._results) <= self.max_results:
+                break
+            self._results.popitem(last=False)
+
+    async def run(self, key: Tuple, call: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            self.coalesced += 1
+            return cached[1]
+
+        running = self._running.get(key)
+        if running is not None:
+            self.coalesced += 1
+            # shield so one client disconnecting doesn't cancel the shared call
+            return await asyncio.shield(running)
+
+        self.calls += 1
+        future = asyncio.ensure_future(call())
+        self._running[key] = future
+        future.add_done_callback(lambda _: self._running.pop(key, None))
+        result = await asyncio.shield(future)
+        if self.ttl > 0:
+            self._store(key, result)
+        return result
+
+
+class StockService:
+    """route HTTP requests to a shared StockAnalysis
+
+    Scans run one at a time on a dedicated thread (they share the fetch
+    scheduler); lookups, history and charts use a small thread pool.
+    """
+
+    def __init__(self, analysis=None, result_ttl: float = 30, workers: int = 4):
+        if analysis is None:
+            from src.stock_analysis import StockAnalysis
+            analysis = StockAnalysis()
+        self.analysis = analysis
+        self.flights = SingleFlight(result_ttl)
+        self._scans = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scan')
+        self._lookups = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lookup')
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.routes = {
+            'health': self.health,
+            'movers': self.movers,
+            'volatility': self.volatility,
+            'custom-period': self.custom_period,
+            'info': self.info,
+            'history': self.history,
+            'chart': self.chart,
+            'metrics': self.metrics,
+            'metrics.json': self.metrics_report,
+        }
+
+    # --- request handling -------------------------------------------------
+
+    async def handle(self, path: str, query: Dict[str, str]) -> Tuple[int, str, bytes]:
+        """(status, content type, body) for one GET request"""
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+        route = self.routes.get(parts[0] if parts else 'health')
+        try:
+            if route is None:
+                raise HTTPError(404, f"Unknown path: {path}")
+            result = await route(parts[1:], query)
+        except HTTPError as e:
+            return e.status, 'application/json', _json({'error': str(e)})
+        except ValueError as e:
+            return 400, 'application/json', _json({'error': str(e)})
+        except Exception as e:
+            return 500, 'application/json', _json({'error': str(e)})
+        if isinstance(result, tuple):
+            return 200, result[0], result[1]
+        return 200, 'application/json', _json(result)
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            # headers are read and ignored; every response closes the connection
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            try:
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            except ValueError:
+                return
+            if method not in ('GET', 'HEAD'):
+                status, content_type, body = 405, 'application/json', _json({'error': f"{method} not allowed"})
+            else:
+                url = urlsplit(target)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, content_type, body = await self.handle(url.path, query)
+
+            head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n")
+            writer.write(head.encode('latin-1') + (body if method != 'HEAD' else b''))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000) -> int:
+        """start listening; returns the bound port (useful with port=0)"""
+        self._server = await asyncio.start_server(self._on_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8000):
+        port = await self.start(host, port)
+        print(f"Serving stock analysis API on http://{host}:{port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    def run_in_thread(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """serve from a daemon thread (for tests and notebooks); returns the bound port"""
+        started = threading.Event()
+        bound = {}
+
+        def run():
+            loop = asyncio.new_event_loop()
+            bound['port'] = loop.run_until_complete(self.start(host, port))
+            self._loop = loop
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True, name='stock-service').start()
+        started.wait()
+        return bound['port']
+
+    def close(self):
+        loop = self._loop
+        if self._server is not None:
+            if loop is not None:
+                loop.call_soon_threadsafe(self._server.close)
+                loop.call_soon_threadsafe(loop.stop)
+            else:
+                self._server.close()
+        self._scans.shutdown(wait=False, cancel_futures=True)
+        self._lookups.shutdown(wait=False, cancel_futures=True)
+
+    # --- routes -----------------------------------------------------------
+
+    async def _scan(self, key: Tuple, call: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await self.flights.run(key, lambda: loop.run_in_executor(self._scans, call, *args))
+
+    async def _lookup(self, key: Tuple, call: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await self.flights.run(key, lambda: loop.run_in_executor(self._lookups, call, *args))
+
+    async def health(self, parts, query) -> Dict[str, Any]:
+        return {'status': 'ok', 'calls': self.flights.calls, 'coalesced': self.flights.coalesced}
+
+    async def metrics(self, parts, query) -> Tuple[str, bytes]:
+        from src.metrics import get_metrics
+        return 'text/plain; version=0.0.4', get_metrics().to_prometheus().encode('utf-8')
+
+    async def metrics_report(self, parts, query) -> Dict[str, Any]:
+        from src.metrics import get_metrics
+        report = get_metrics().report()
+        # the span log grows with uptime; scrapers want the totals
+        report.pop('spans')
+        return report
+
+    async def movers(self, parts, query) -> Dict[str, Any]:
+        period = _choice(query, 'period', '1d', list(TIME_PERIODS))
+        scope = _choice(query, 'scope', 'sp500', list(SCOPES))
+        limit = _int(query, 'limit', 20, minimum=1)
+        gainers, losers, count = await self._scan(
+            ('movers', period, scope, limit), self.analysis.get_gainers_losers, period, limit, SCOPES[scope])
+        return {'period': period, 'scope': scope, 'count': count,
+                'gainers': _records(gainers), 'losers': _records(losers)}
+
+    async def volatility(self, parts, query) -> Dict[str, Any]:
+        period = query.get('period', '3mo')
+        scope = _choice(query, 'scope', 'sp500', list(SCOPES))
+        limit = _int(query, 'limit', 20, minimum=1)
+        metric = query.get('metric', 'Realized Vol%')
+        most, least, count = await self._scan(
+            ('volatility', period, scope, limit, metric),
+            self.analysis.get_volatility_ranking, period, limit, SCOPES[scope], metric)
+        return {'period': period, 'scope': scope, 'metric': metric, 'count': count,
+                'most': _records(most), 'least': _records(least)}
+
+    async def custom_period(self, parts, query) -> Dict[str, Any]:
+        start, end = query.get('start'), query.get('end')
+        if not start or not end:
+            raise HTTPError(400, "start and end (YYYY-MM-DD) are required")
+        scope = _choice(query, 'scope', 'sp500', list(SCOPES))
+        limit = _int(query, 'limit', 0)
+        df = await self._scan(('custom-period', start, end, scope),
+                              self.analysis.get_custom_period_data, start, end, SCOPES[scope])
+        return {'start': start, 'end': end, 'scope': scope, 'count': len(df),
+                'results': _records(df.head(limit) if limit else df)}
+
+    async def info(self, parts, query) -> Dict[str, Any]:
+        symbols = [parts[0]] if parts else [s for s in query.get('symbols', '').split(',') if s]
+        if not symbols:
+            raise HTTPError(400, "give a ticker (/info/AAPL) or ?symbols=AAPL,MSFT")
+        symbols = tuple(symbol.strip().upper() for symbol in symbols)
+        infos = await self._lookup(('info',) + symbols, self.analysis.info_cache.get_many, symbols)
+        missing = [symbol for symbol in symbols if not infos.get(symbol)]
+        if len(symbols) == 1 and missing:
+            raise HTTPError(404, f"No info for {symbols[0]}")
+        return {'symbols': infos, 'missing': missing}
+
+    async def history(self, parts, query) -> Dict[str, Any]:
+        ticker = _ticker(parts)
+        period = _choice(query, 'period', '1mo', list(TIME_PERIODS))
+        data = await self._lookup(('history', ticker, period), self.analysis.display_stock_graph, ticker, period)
+        return {'ticker': ticker, 'period': period, 'bars': _records(data.rename_axis('Date').reset_index())}
+
+    async def chart(self, parts, query) -> Tuple[str, bytes]:
+        ticker = _ticker(parts)
+        if ticker.endswith('.PNG'):
+            ticker = ticker[:-4]
+        period = _choice(query, 'period', '6mo', list(TIME_PERIODS))
+        png = await self._lookup(('chart', ticker, period), self._render_chart, ticker, period)
+        return 'image/png', png
+
+    def _render_chart(self, ticker: str, period: str) -> bytes:
+        from src.visualization import StockVisualizer
+
+        data = self.analysis.display_stock_graph(ticker, period)
+        # figures live on their own Agg canvas, so lookup threads render in parallel
+        return StockVisualizer().render_chart(data, ticker, period)
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value).encode('utf-8')
+
+
+def _records(df) -> list:
+    """frame rows as JSON-safe dicts (NaN -> null, timestamps -> ISO strings)"""
+    if df is None or df.empty:
+        return []
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+def _choice(query: Dict[str, str], name: str, default: str, allowed: list) -> str:
+    value = query.get(name, default)
+    if value not in allowed:
+        raise HTTPError(400, f"Invalid {name} '{value}'. Must be one of {allowed}")
+    return value
+
+
+def _int(query: Dict[str, str], name: str, default: int, minimum: int = 0) -> int:
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer")
+    if value < minimum:
+        raise HTTPError(400, f"{name} must be at least {minimum}")
+    return value
+
+
+def _ticker(parts: list) -> str:
+    if not parts:
+        raise HTTPError(400, "ticker is required")
+    return parts[0].upper()
+
+
+def serve(host: str = '127.0.0.1', port: int = 8000, analysis=None, result_ttl: float = 30):
+    """run the HTTP service until interrupted"""
+    service = StockService(analysis, result_ttl)
+    try:
+        asyncio.run(service.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -1,131 +1,103 @@
-from typing import Tuple, List, Dict, Optional
-import yfinance as yf
+import threading
+from collections import OrderedDict
+from typing import Tuple, List, Optional
 import pandas as pd
-import numpy as np
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
-from functools import lru_cache
-import requests
 from datetime import datetime, timedelta
-from utils.validators import validate_ticker, validate_dates
+from utils.validators import validate_dates
 from utils.constants import TIME_PERIODS, INTRADAY_PERIODS, REGULAR_PERIODS
 from src.menu import Menu
-from utils.logging import log_failed_analysis
+from utils.logging import SCAN_SOURCE, FailureJournal, get_failure_journal
+from src.batch_fetch import BatchFetcher
+from src.async_fetch import AsyncFetchScheduler, BatchResult
+from src.info_cache import InfoCache, get_info_cache
+from src.metrics import get_metrics
+from src.providers import CachedProvider, MarketDataProvider, MultiResolutionProvider, get_provider
+from src.ohlcv_store import OHLCVStore
+from src.cross_section import ScanResults, summarize_returns
+from src.universe import UniverseCache
+from src.ranking import StreamingTopK
+from src.multi_period import MultiPeriodMovers, fetch_start, period_returns
+from src.indicators import SMA, IndicatorSet
+from src.volatility import VolatilityEngine, VOLATILITY_COLUMNS
 
 class StockAnalysis:
-    def __init__(self):
-        self.session = self._init_session()
+    def __init__(self, provider: Optional[MarketDataProvider] = None, store: Optional[OHLCVStore] = None,
+                 journal: Optional[FailureJournal] = None):
+        self.provider = provider or get_provider()
+        # scans and charts read history through the local store
+        self.cached_provider = CachedProvider(self.provider, store)
+        # any bar size is derived from one stored base interval per symbol
+        self.bar_provider = MultiResolutionProvider(self.cached_provider)
         self.cache = {}
         
         self.batch_size = 50
-        self.all_symbols = self._get_all_stock_symbols(False)
+        self.fetcher = BatchFetcher(self.batch_size, self.bar_provider)
+        self.scheduler = AsyncFetchScheduler(self.fetcher)
+        # symbol lists load lazily on the first scan of each scope
+        self.universe = UniverseCache(self.provider)
+        self.info_cache = get_info_cache() if provider is None else InfoCache(self.provider)
+        # (ticker, period) -> (generation, values, indicators), least recently drawn first
+        self._chart_indicators: 'OrderedDict[Tuple[str, str], Tuple]' = OrderedDict()
+        self._chart_indicators_lock = threading.Lock()
+        self.chart_indicator_limit = 256
+        # symbols that keep failing scans are left out of later universes
+        self.journal = journal or get_failure_journal()
+        self.exclude_failing = True
 
-    def _init_session(self) -> requests.Session:
-        """Initialize a session for faster HTTP requests"""
-        session = requests.Session()
-        return session
-
-    @lru_cache(maxsize=1)
-    def _get_all_stock_symbols(self, analyze_all: bool = False) -> List[str]:
+    def _get_all_stock_symbols(self, analyze_sp500: bool = True) -> List[str]:
         """get stock symbols based on analysis scope"""
+        scope = 'sp500' if analyze_sp500 else 'all'
         try:
-            if not analyze_all:  # get S&P 500 only
-                sp500_url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-                sp500_df = pd.read_html(sp500_url)[0]
-                symbols = sp500_df['Symbol'].tolist()
-                
-                # clean symbols
-                symbols = [sym.strip().upper() for sym in symbols if isinstance(sym, str)]
-                symbols = list(set(symbols))
-                # Filter out warrants and special securities
-                symbols = [sym for sym in symbols if sym.isalnum() and 
-                          not any(x in sym for x in ['W', 'R', 'P', 'Q'])]
-                
-                if len(symbols) >= 400:
-                    return sorted(symbols)
-                    
-                raise ValueError("Could not fetch S&P 500 list")
-                
-            else:  # get all NYSE and NASDAQ listings
-                try:
-                    all_tickers_url = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqtraded.txt"
-                    df = pd.read_csv(all_tickers_url, sep='|', comment='#')
-                    
-                    # filter active stocks
-                    if 'Test Issue' in df.columns:
-                        df = df[df['Test Issue'] == 'N']
-                    if 'ETF' in df.columns:
-                        df = df[df['ETF'] == 'N']
-                    
-                    # get symbol column
-                    symbol_col = [col for col in df.columns if 'symbol' in col.lower()]
-                    if symbol_col:
-                        symbols = df[symbol_col[0]].tolist()
-                    else:
-                        raise ValueError("Could not find symbol column in data")
-                    
-                    # clean symbols and filter out warrants/special securities
-                    symbols = [str(sym).strip().upper() for sym in symbols if isinstance(sym, (str, int, float))]
-                    symbols = [sym for sym in symbols if sym and sym.isalnum() and 
-                              not any(x in sym for x in ['W', 'R', 'P', 'Q'])]
-                    symbols = [sym for sym in symbols if not any(x in sym for x in ['TEST', 'DUMMY'])]
-                    symbols = list(set(symbols))
-                    
-                    if len(symbols) > 1000:
-                        return sorted(symbols)
-                        
-                except Exception as e:
-                    raise ValueError(f"Error fetching from NASDAQ: {str(e)}")
-                    
-                raise ValueError("Could not fetch complete stock list")
-                
+            with get_metrics().span('universe', scope=scope):
+                symbols = self.universe.get(scope)
+                excluded = self.journal.systematic_failures() if self.exclude_failing else set()
+            if excluded:
+                kept = [symbol for symbol in symbols if symbol not in excluded]
+                if len(kept) < len(symbols):
+                    print(f"\nSkipping {len(symbols) - len(kept)} symbols that failed repeated scans "
+                          "(see: python main.py failures)")
+                return kept
+            return symbols
         except Exception as e:
             print(f"\nWarning: Could not fetch stock list: {str(e)}")
             print("Falling back to default S&P 500 stocks...")
             return self._get_default_sp500_symbols()
 
-    def _process_batch(self, symbols: List[str], period: str) -> List[Dict]:
-        """Process a batch of symbols with early exit on consecutive failures"""
-        results = []
-        failed_symbols = []
-        consecutive_failures = 0
+    def _log_failed_symbols(self, failed_symbols: List[str], label: str, total: int, source: str = SCAN_SOURCE):
+        """Record symbols that could not be priced; only open-ended scans count toward exclusion"""
+        if failed_symbols:
+            self.journal.record_many(failed_symbols, label, "not priced", source=source,
+                                     scan_failure_rate=round(len(failed_symbols) / max(total, 1), 4))
+
+    def _collect_results(self, symbols: List[str], period: str = None, **history_kwargs) -> ScanResults:
+        """Fetch all symbols concurrently, summarizing each batch into one compact result array"""
+        if period is not None:
+            history_kwargs['period'] = period
+        total_symbols = len(symbols)
+        processed = 0
+        results = ScanResults(total_symbols)
+        metrics = get_metrics()
         
-        for symbol in symbols:
-            try:
-                clean_symbol = symbol.strip('$').strip()
-                stock = yf.Ticker(clean_symbol)
-                hist = stock.history(period=period)
-                
-                if not hist.empty and len(hist) > 0:
-                    start_price = hist['Close'].iloc[0]
-                    end_price = hist['Close'].iloc[-1]
-                    percent_change = ((end_price - start_price) / start_price) * 100
-                    volume = int(hist['Volume'].mean()) if 'Volume' in hist.columns else 0
-                    
-                    results.append({
-                        'Symbol': clean_symbol,
-                        'Change%': round(percent_change, 2),
-                        'Start Price': round(start_price, 2),
-                        'End Price': round(end_price, 2),
-                        'Volume': volume
-                    })
-                    consecutive_failures = 0  # Reset counter on success
-                
-                time.sleep(0.1)
-                
-            except Exception:
-                failed_symbols.append(clean_symbol)
-                consecutive_failures += 1
-                if consecutive_failures >= 3:
-                    print("\nMultiple failures detected. Proceeding with available data...")
-                    break
-                continue
+        def on_result(result: BatchResult):
+            nonlocal processed
+            with metrics.span('compute'):
+                results.add(result.closes, result.volumes)
+            if result.retry_pass == 0:
+                processed += len(result.symbols)
+                self._update_progress_bar(processed, total_symbols)
         
-        if failed_symbols:
-            with open('failed_analysis.txt', 'a') as f:
-                f.write(f"\nBatch failed symbols for period {period}:\n")
-                f.write(", ".join(failed_symbols) + "\n")
+        with metrics.span('fetch', symbols=total_symbols):
+            _, stats = self.scheduler.fetch(symbols, on_result, keep_frames=False, **history_kwargs)
         
+        print("\n")  # New line after progress bar
+        print(stats.summary())
+        
+        if period is not None:
+            self._log_failed_symbols(stats.missing, period, total_symbols)
+        else:
+            # a custom window can predate a listing, so its misses say nothing about the symbol today
+            self._log_failed_symbols(stats.missing, f"{history_kwargs.get('start')} to {history_kwargs.get('end')}",
+                                     total_symbols, source='custom')
         return results
 
     def get_gainers_losers(self, period: str, limit: int = 20, analyze_sp500: bool = None) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
@@ -143,47 +115,161 @@ class StockAnalysis:
             symbols = self._get_all_stock_symbols(analyze_sp500)
             print(f"\nAnalyzing {'S&P 500' if analyze_sp500 else 'all available'} stocks...")
             
-            # get all stock data
+            # rank each batch as it lands so only the top/bottom rows are kept
+            print("\nFetching data... (Ctrl+C stops early with partial results)")
+            if period in REGULAR_PERIODS:
+                # measured like the multi-period scan: from the close before the period to the last close
+                ranking = MultiPeriodMovers([period], limit).rankings[period]
+                summarize = lambda closes, volumes: period_returns(closes, volumes, [period])[period]
+                start = fetch_start([period], datetime.now().date())
+                window = {'period': 'max'} if start is None else {'start': start.strftime('%Y-%m-%d')}
+                window['interval'] = '1d'
+            else:
+                ranking = StreamingTopK(limit)
+                summarize = summarize_returns
+                window = {'period': period, 'interval': self._scan_interval(period)}
             total_symbols = len(symbols)
             processed = 0
-            results = []
             
-            print("\nFetching data...")
-            smaller_batches = [symbols[i:i + 50] for i in range(0, len(symbols), 50)]
+            metrics = get_metrics()
             
-            for batch in smaller_batches:
-                results.extend(self._process_batch(batch, period))
-                processed += len(batch)
-                self._update_progress_bar(processed, total_symbols)
+            def on_result(result: BatchResult):
+                nonlocal processed
+                if not result.closes.empty:
+                    with metrics.span('compute'):
+                        table = summarize(result.closes, result.volumes)
+                    with metrics.span('rank'):
+                        ranking.push(table)
+                if result.retry_pass == 0:
+                    processed += len(result.symbols)
+                self._update_progress_bar(processed, total_symbols, status=ranking.status())
             
-            print("\n")  # New line after progress bar
+            try:
+                with metrics.span('fetch', period=period, symbols=total_symbols):
+                    results, stats = self.scheduler.fetch(symbols, on_result, keep_frames=False, **window)
+                print("\n")  # New line after progress bar
+                print(stats.summary())
+                self._log_failed_symbols(stats.missing, period, total_symbols)
+            except KeyboardInterrupt:
+                print(f"\n\nScan stopped early after {processed}/{total_symbols} symbols; showing partial results")
             
-            if not results:
+            if ranking.count == 0:
                 return pd.DataFrame(), pd.DataFrame(), 0
             
-            # convert to dataframe
-            df = pd.DataFrame(results)
+            with metrics.span('rank'):
+                gainers, losers = ranking.leaderboard()
+            return gainers, losers, ranking.count
             
-            # adjust limit based on available data
-            available_stocks = len(df)
-            actual_limit = min(limit, available_stocks)
+        except Exception as e:
+            raise ValueError(f"Error analyzing stocks: {str(e)}")
+
+    def get_multi_period_movers(self, periods: Optional[List[str]] = None, limit: int = 20,
+                                analyze_sp500: bool = None) -> Tuple[pd.DataFrame, int]:
+        """get top gainers and losers for several periods from one fetch of daily bars"""
+        try:
+            periods = list(periods or REGULAR_PERIODS)
+            movers = MultiPeriodMovers(periods, limit)
             
-            # sort and get top gainers/losers
-            gainers = df.nlargest(actual_limit, 'Change%').reset_index(drop=True)
-            losers = df.nsmallest(actual_limit, 'Change%').reset_index(drop=True)
+            if analyze_sp500 is None:
+                analyze_sp500 = Menu.get_analysis_scope()
             
-            return gainers, losers, available_stocks
+            symbols = self._get_all_stock_symbols(analyze_sp500)
+            print(f"\nAnalyzing {'S&P 500' if analyze_sp500 else 'all available'} stocks "
+                  f"for {', '.join(movers.periods)}...")
+            
+            # the longest period's window holds every shorter one
+            start = fetch_start(movers.periods, datetime.now().date())
+            window = {'period': 'max'} if start is None else {'start': start.strftime('%Y-%m-%d')}
+            total_symbols = len(symbols)
+            processed = 0
+            metrics = get_metrics()
+            
+            def on_result(result: BatchResult):
+                nonlocal processed
+                if not result.closes.empty:
+                    with metrics.span('compute'):
+                        movers.push(result.closes, result.volumes)
+                if result.retry_pass == 0:
+                    processed += len(result.symbols)
+                self._update_progress_bar(processed, total_symbols)
+            
+            with metrics.span('fetch', period=','.join(movers.periods), symbols=total_symbols):
+                _, stats = self.scheduler.fetch(symbols, on_result, keep_frames=False, interval='1d', **window)
+            print("\n")  # New line after progress bar
+            print(stats.summary())
+            self._log_failed_symbols(stats.missing, ','.join(movers.periods), total_symbols)
+            
+            with metrics.span('rank'):
+                report = movers.report()
+            return report, stats.priced
             
         except Exception as e:
             raise ValueError(f"Error analyzing stocks: {str(e)}")
 
-    def _update_progress_bar(self, current: int, total: int, bar_length: int = 50):
-        """Display progress bar"""
+    def get_volatility_ranking(self, period: str, limit: int = 20, analyze_sp500: bool = None,
+                               metric: str = 'Realized Vol%') -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+        """get the most and least volatile stocks for period"""
+        try:
+            # volatility estimators need daily OHLC bars
+            if period not in REGULAR_PERIODS:
+                raise ValueError(f"Invalid period. Must be one of {list(REGULAR_PERIODS.keys())}")
+            if metric not in VOLATILITY_COLUMNS:
+                raise ValueError(f"Invalid metric. Must be one of {VOLATILITY_COLUMNS}")
+            
+            if analyze_sp500 is None:
+                analyze_sp500 = Menu.get_analysis_scope()
+            
+            symbols = self._get_all_stock_symbols(analyze_sp500)
+            print(f"\nAnalyzing {'S&P 500' if analyze_sp500 else 'all available'} stocks...")
+            print("\nFetching data...")
+            
+            total_symbols = len(symbols)
+            processed = 0
+            metrics = get_metrics()
+            # long histories are worth shipping to worker processes
+            with VolatilityEngine(parallel=period in ('5y', '10y', 'max')) as engine:
+                def on_result(result: BatchResult):
+                    nonlocal processed
+                    with metrics.span('compute'):
+                        engine.submit(result.fields)
+                    if result.retry_pass == 0:
+                        processed += len(result.symbols)
+                        self._update_progress_bar(processed, total_symbols)
+                
+                with metrics.span('fetch', period=period, symbols=total_symbols):
+                    results, stats = self.scheduler.fetch(symbols, on_result, keep_frames=False, period=period,
+                                                          interval=self._scan_interval(period))
+                print("\n")  # New line after progress bar
+                print(stats.summary())
+                self._log_failed_symbols(stats.missing, period, total_symbols)
+                
+                with metrics.span('compute'):
+                    df = engine.results()
+            
+            if df.empty:
+                return pd.DataFrame(), pd.DataFrame(), 0
+            
+            actual_limit = min(limit, len(df))
+            with metrics.span('rank'):
+                most = df.nlargest(actual_limit, metric).reset_index(drop=True)
+                least = df.nsmallest(actual_limit, metric).reset_index(drop=True)
+            return most, least, len(df)
+            
+        except Exception as e:
+            raise ValueError(f"Error analyzing volatility: {str(e)}")
+
+    def _update_progress_bar(self, current: int, total: int, bar_length: int = 50, status: str = ""):
+        """Display progress bar, optionally followed by a live status line"""
         percent = float(current) * 100 / total
         arrow = '-' * int(percent/100 * bar_length - 1) + '>'
         spaces = ' ' * (bar_length - len(arrow))
+        status = f"  {status}" if status else ""
         
-        print('\rProgress: [%s%s] %.2f%%' % (arrow, spaces, percent), end='', flush=True)
+        print('\rProgress: [%s%s] %.2f%%%s\033[K' % (arrow, spaces, percent, status), end='', flush=True)
+
+    def _scan_interval(self, period: str) -> str:
+        """bar size a movers scan measures a period on: minute bars for intraday periods, else daily"""
+        return self._get_interval(period) if period in INTRADAY_PERIODS else '1d'
 
     def _get_interval(self, period: str) -> str:
         """Get appropriate interval based on period"""
@@ -197,12 +283,9 @@ class StockAnalysis:
         else:
             return '1d'  # Default interval for longer periods
 
-    @lru_cache(maxsize=100)
     def get_stock_info(self, ticker: str, period: str) -> pd.DataFrame:
         """Get stock information for a specific ticker and period"""
         try:
-            stock = yf.Ticker(ticker, session=self.session)
-            
             is_intraday = period in INTRADAY_PERIODS
             
             if is_intraday:
@@ -228,7 +311,8 @@ class StockAnalysis:
                     interval = "5m"
                 
                 try:
-                    hist_data = stock.history(
+                    hist_data = self.bar_provider.history(
+                        ticker,
                         start=start_time,
                         end=end_time,
                         interval=interval
@@ -247,7 +331,8 @@ class StockAnalysis:
                     )
             
             else:
-                hist_data = stock.history(
+                hist_data = self.bar_provider.history(
+                    ticker,
                     period=period,
                     interval=self._get_interval(period)
                 )
@@ -266,7 +351,7 @@ class StockAnalysis:
                 (summary_data['Close'] - summary_data['Open']) / summary_data['Open'] * 100
             ).round(2)
             
-            info = stock.info
+            info = self.info_cache.get(ticker)
             
             print(f"\nCurrent Information for {ticker.upper()}")
             print("-" * 80)
@@ -283,13 +368,14 @@ class StockAnalysis:
         except Exception as e:
             raise ValueError(f"Error fetching data for {ticker}: {str(e)}")
 
-    def get_custom_period_data(self, start_date: str, end_date: str) -> pd.DataFrame:
+    def get_custom_period_data(self, start_date: str, end_date: str, analyze_sp500: bool = None) -> pd.DataFrame:
         """Get stock data for custom date range"""
         # Get validated and potentially adjusted dates
         start_date, end_date = validate_dates(start_date, end_date)
         
-        # Get user preference for analysis scope (True means S&P 500 only)
-        analyze_sp500 = Menu.get_analysis_scope()
+        # Get user preference for analysis scope if not provided (True means S&P 500 only)
+        if analyze_sp500 is None:
+            analyze_sp500 = Menu.get_analysis_scope()
         
         # Get symbols based on user preference (analyze_sp500=True means analyze S&P 500 only)
         symbols = self._get_all_stock_symbols(analyze_sp500)
@@ -303,34 +389,12 @@ class StockAnalysis:
         
         interval = self._determine_interval(delta)
         
-        all_data = []
         print(f"\nAnalyzing stocks for period {start_date} to {end_date}...")
-        
-        for symbol in symbols:
-            try:
-                stock = yf.Ticker(symbol)
-                hist = stock.history(start=start_date, end=end_date, interval=interval)
-                if not hist.empty:
-                    start_price = hist['Close'].iloc[0]
-                    end_price = hist['Close'].iloc[-1]
-                    percent_change = ((end_price - start_price) / start_price) * 100
-                    
-                    all_data.append({
-                        'Symbol': symbol,
-                        'Change%': round(percent_change, 2),
-                        'Start Price': round(start_price, 2),
-                        'End Price': round(end_price, 2),
-                        'Volume': int(hist['Volume'].mean())
-                    })
-            except Exception as e:
-                print(f"\nWarning: Could not process {symbol}: {str(e)}")
-                continue
-        
-        if not all_data:
+        results = self._collect_results(symbols, start=start_date, end=end_date, interval=interval)
+        if not len(results):
             return pd.DataFrame()
-        
-        result_df = pd.DataFrame(all_data)
-        return result_df.sort_values('Change%', ascending=False)
+        with get_metrics().span('rank'):
+            return results.to_frame('Change%', ascending=False)
 
     def _determine_interval(self, delta: timedelta) -> str:
         """Determine appropriate interval based on date range"""
@@ -352,14 +416,38 @@ class StockAnalysis:
     def display_stock_graph(self, ticker: str, period: str) -> pd.DataFrame:
         """Prepare data for visualization"""
         try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period)
-            
+            data = self.bar_provider.history(ticker, period=period, interval=self._scan_interval(period))
+            if data.empty:
+                return data
+
+            # moving averages are folded in bar by bar; a redraw only feeds bars newer than the last one
+            key = (ticker.upper(), period)
+            generation = self.cached_provider.generations.get(ticker, 0)
+            with self._chart_indicators_lock:
+                # taken out while in use, so a concurrent redraw of the same chart builds its own
+                cached = self._chart_indicators.pop(key, None)
+            values, indicators = None, None
+            # a re-adjusted history makes every cached average stale
+            if cached is not None and cached[0] == generation:
+                _, values, indicators = cached
+            if indicators is None:
+                indicators = IndicatorSet({'SMA_20': SMA(20), 'SMA_50': SMA(50)})
+            fresh = indicators.update_frame(data)
+            if values is not None and not fresh.empty:
+                values = pd.concat([values[values.index < fresh.index[0]], fresh])
+            elif values is None:
+                values = fresh
+            with self._chart_indicators_lock:
+                self._chart_indicators[key] = (generation, values, indicators)
+                while len(self._chart_indicators) > self.chart_indicator_limit:
+                    self._chart_indicators.popitem(last=False)
+
+            values = values.reindex(data.index)
             if len(data) >= 20:
-                data['SMA_20'] = data['Close'].rolling(window=20).mean()
+                data['SMA_20'] = values['SMA_20']
             if len(data) >= 50:
-                data['SMA_50'] = data['Close'].rolling(window=50).mean()
-            
+                data['SMA_50'] = values['SMA_50']
+
             return data
             
         except Exception as e:
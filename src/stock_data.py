@@ -1,8 +1,8 @@
 # import required modules
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
 from utils.validators import validate_ticker, validate_dates
+from src.providers import get_provider
 
 class StockData:
     def __init__(self):
@@ -16,8 +16,8 @@ class StockData:
         # get data based on input type
         if start_date and end_date:
             validate_dates(start_date, end_date)
-            self.data = yf.download(ticker, start=start_date, end=end_date)
+            self.data = get_provider().history(ticker, start=start_date, end=end_date)
         else:
-            self.data = yf.download(ticker, period=period)
+            self.data = get_provider().history(ticker, period=period)
             
         return self.data
\ No newline at end of file
@@ -1,14 +1,14 @@
 # import required modules
-import yfinance as yf
 import pandas as pd
 from typing import Dict, Any
+from src.info_cache import get_info_cache
+from src.providers import get_provider
 
 class StockInfo:
     @staticmethod
     def get_basic_info(ticker: str) -> Dict[str, Any]:
         """get basic stock info"""
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = get_info_cache().get(ticker)
         
         # return key stock metrics
         return {
@@ -26,5 +26,4 @@ class StockInfo:
     @staticmethod
     def get_historical_data(ticker: str, period: str) -> pd.DataFrame:
         """get historical prices"""
-        stock = yf.Ticker(ticker)
-        return stock.history(period=period)
\ No newline at end of file
+        return get_provider().history(ticker, period=period)
\ No newline at end of file
@@ -0,0 +1,120 @@
+# import required modules
+import bisect
+import difflib
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from src.info_cache import InfoCache, get_info_cache
+from src.providers import MarketDataProvider, get_provider
+from src.universe import UniverseCache
+
+
+class SymbolIndex:
+    """in-memory set of known tickers with a sorted array for prefix and fuzzy suggestions"""
+
+    def __init__(self, symbols: Iterable[str] = (), provider: Optional[MarketDataProvider] = None,
+                 info_cache: Optional[InfoCache] = None):
+        self.provider = provider or get_provider()
+        # probes go through the info cache so a following info lookup is free
+        self.info_cache = info_cache or InfoCache(self.provider)
+        self._known = set()
+        self._sorted: List[str] = []
+        self._lock = threading.Lock()
+        self.add(symbols)
+
+    @classmethod
+    def from_universe(cls, universe: UniverseCache, info_cache: Optional[InfoCache] = None) -> 'SymbolIndex':
+        """index every cached listing; fetch the full listing once if nothing is cached"""
+        symbols = set()
+        for scope in ('all', 'sp500'):
+            symbols.update(universe.cached_symbols(scope) or [])
+        if not symbols:
+            try:
+                symbols.update(universe.get('all'))
+            except Exception:
+                # offline with no cache: every lookup falls back to a probe
+                pass
+        return cls(symbols, universe.provider, info_cache)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._known
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def add(self, symbols: Iterable[str]):
+        """add tickers to the index"""
+        with self._lock:
+            self._known.update(sym.upper() for sym in symbols)
+            self._sorted = sorted(self._known)
+
+    def _probe(self, ticker: str) -> bool:
+        """one network lookup for a ticker the index doesn't know"""
+        try:
+            info = self.info_cache.get(ticker)
+        except Exception:
+            return False
+        if info and isinstance(info, dict) and any([
+            info.get('regularMarketPrice'),
+            info.get('currentPrice'),
+            info.get('ask'),
+            info.get('bid')
+        ]):
+            self.add([ticker])
+            return True
+        return False
+
+    def is_valid(self, ticker: str, probe: bool = True) -> bool:
+        """check a ticker against the index, probing the network only if it is unknown"""
+        ticker = ticker.upper()
+        if ticker in self._known:
+            return True
+        return probe and self._probe(ticker)
+
+    def validate_many(self, tickers: Iterable[str], probe: bool = True) -> Dict[str, bool]:
+        """validate many tickers in memory; only unknown ones are probed"""
+        results = {}
+        for ticker in tickers:
+            ticker = ticker.upper()
+            results[ticker] = ticker in self._known
+        if probe:
+            for ticker in [t for t, ok in results.items() if not ok]:
+                results[ticker] = self._probe(ticker)
+        return results
+
+    def with_prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """known tickers starting with prefix"""
+        prefix = prefix.upper()
+        start = bisect.bisect_left(self._sorted, prefix)
+        matches = []
+        for symbol in self._sorted[start:start + limit]:
+            if not symbol.startswith(prefix):
+                break
+            matches.append(symbol)
+        return matches
+
+    def suggest(self, ticker: str, limit: int = 5) -> List[str]:
+        """'did you mean' candidates: close spellings first, then completions of the typed prefix"""
+        ticker = ticker.upper()
+        if not ticker:
+            return []
+        # compare only against tickers sharing the first letter to keep this cheap
+        start = bisect.bisect_left(self._sorted, ticker[0])
+        end = bisect.bisect_left(self._sorted, chr(ord(ticker[0]) + 1))
+        candidates = self._sorted[start:end] or self._sorted
+        suggestions = difflib.get_close_matches(ticker, candidates, n=limit, cutoff=0.6)
+        for symbol in self.with_prefix(ticker, limit):
+            if symbol not in suggestions and symbol != ticker:
+                suggestions.append(symbol)
+        return suggestions[:limit]
+
+
+_index: Optional[SymbolIndex] = None
+
+
+def get_symbol_index() -> SymbolIndex:
+    """process-wide symbol index built from the cached universe listings"""
+    global _index
+    if _index is None:
+        _index = SymbolIndex.from_universe(UniverseCache(), get_info_cache())
+    return _index
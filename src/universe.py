@@ -0,0 +1,127 @@
+# import required modules
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+import pandas as pd
+
+from utils.constants import CACHE_DIR
+from src.metrics import get_metrics
+from src.providers import MarketDataProvider, get_provider
+
+# smallest believable listing per scope; anything shorter is treated as a failed fetch
+MIN_UNIVERSE_SIZE: Dict[str, int] = {'sp500': 400, 'all': 1000}
+
+# NASDAQ fifth-letter suffixes for warrants, rights, preferreds and bankruptcies
+SPECIAL_SUFFIXES = ('W', 'R', 'P', 'Q')
+
+
+def clean_symbols(raw: List) -> List[str]:
+    """normalize, filter and de-duplicate a raw listing with vectorized string ops"""
+    symbols = pd.Series(raw, dtype=object).dropna().astype(str)
+    symbols = symbols.str.strip().str.upper().str.replace('.', '-', regex=False)
+
+    # plain tickers plus an optional share class (BRK-B)
+    valid = symbols.str.fullmatch(r'[A-Z0-9]{1,5}(-[A-Z])?')
+    special = (symbols.str.len() == 5) & symbols.str[-1].isin(SPECIAL_SUFFIXES)
+    placeholder = symbols.str.contains('TEST|DUMMY', regex=True)
+
+    symbols = symbols[valid & ~special & ~placeholder]
+    return sorted(symbols.unique().tolist())
+
+
+class UniverseCache:
+    """symbol listings per scope, persisted to disk and refreshed in the background after `ttl` seconds"""
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None, directory: Optional[str] = None,
+                 ttl: float = 24 * 3600):
+        self.provider = provider or get_provider()
+        self.directory = directory or os.path.join(CACHE_DIR, 'universe')
+        self.ttl = ttl
+        self._entries: Dict[str, Dict] = {}
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, scope: str) -> str:
+        return os.path.join(self.directory, f"{scope}.json")
+
+    def _load(self, scope: str) -> Optional[Dict]:
+        try:
+            with open(self._path(scope)) as f:
+                entry = json.load(f)
+            return entry if entry.get('symbols') else None
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save(self, scope: str, entry: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(scope) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(scope))
+
+    def cached_symbols(self, scope: str) -> Optional[List[str]]:
+        """symbols for scope from memory or disk only, never the network"""
+        with self._lock:
+            entry = self._entries.get(scope)
+        entry = entry or self._load(scope)
+        return entry['symbols'] if entry else None
+
+    def refresh(self, scope: str) -> List[str]:
+        """fetch, clean and persist a fresh listing for scope"""
+        symbols = clean_symbols(self.provider.symbol_universe(scope))
+        if len(symbols) < MIN_UNIVERSE_SIZE.get(scope, 1):
+            raise ValueError(f"Could not fetch complete {scope} stock list ({len(symbols)} symbols)")
+
+        entry = {'symbols': symbols, 'fetched_at': time.time()}
+        with self._lock:
+            self._entries[scope] = entry
+        self._save(scope, entry)
+        return symbols
+
+    def _refresh_in_background(self, scope: str):
+        """start one background refresh per scope; failures keep the stale entry"""
+        with self._lock:
+            thread = self._refreshing.get(scope)
+            if thread is not None and thread.is_alive():
+                return
+
+            def run():
+                try:
+                    self.refresh(scope)
+                except Exception:
+                    pass
+
+            thread = threading.Thread(target=run, name=f"universe-refresh-{scope}", daemon=True)
+            self._refreshing[scope] = thread
+            thread.start()
+
+    def get(self, scope: str) -> List[str]:
+        """symbols for scope; stale entries are served immediately while a refresh runs"""
+        with self._lock:
+            entry = self._entries.get(scope)
+        if entry is None:
+            entry = self._load(scope)
+            if entry is not None:
+                with self._lock:
+                    self._entries[scope] = entry
+
+        get_metrics().cache_lookup('universe', entry is not None)
+        if entry is None:
+            return self.refresh(scope)
+        if time.time() - entry['fetched_at'] > self.ttl:
+            self._refresh_in_background(scope)
+        return entry['symbols']
+
+    def invalidate(self, scope: Optional[str] = None):
+        """drop cached listings (all scopes if none given) from memory and disk"""
+        scopes = [scope] if scope else list(MIN_UNIVERSE_SIZE)
+        with self._lock:
+            for name in scopes:
+                self._entries.pop(name, None)
+        for name in scopes:
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
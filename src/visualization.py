@@ -1,41 +1,169 @@
 # import required modules
-import matplotlib.pyplot as plt
+import io
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.metrics import get_metrics
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax', None)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """indices of the points Largest-Triangle-Three-Buckets keeps, `threshold` of them
+
+    Keeps the first and last point and, from each bucket in between, the
+    point forming the largest triangle with the previous pick and the next
+    bucket's mean; peaks and troughs survive, flat stretches thin out.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    picks = np.empty(threshold, dtype=int)
+    picks[0], picks[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        mean_x = x[end:next_end].mean() if next_end > end else x[-1]
+        mean_y = y[end:next_end].mean() if next_end > end else y[-1]
+        areas = np.abs((x[previous] - mean_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (mean_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        picks[bucket + 1] = previous
+    return picks
+
+
+def minmax_bins(y: np.ndarray, bins: int) -> np.ndarray:
+    """indices of the lowest and highest point in each of `bins` equal bins, in order"""
+    n = len(y)
+    if 2 * bins >= n or bins < 1:
+        return np.arange(n)
+
+    size = -(-n // bins)
+    rows = -(-n // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(rows, size)
+    offsets = np.arange(rows) * size
+    picks = np.concatenate([offsets + np.nanargmin(padded, axis=1), offsets + np.nanargmax(padded, axis=1)])
+    return np.unique(np.concatenate([[0, n - 1], picks]))
+
+
+def _bin_max(values: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(first index, max value) of each of `bins` equal bins"""
+    n = len(values)
+    size = -(-n // bins)
+    starts = np.arange(0, n, size)
+    return starts, np.maximum.reduceat(values, starts)
+
 
 class StockVisualizer:
+    """price/volume charts, interactive or rendered headless to image bytes
+
+    Series longer than the plot's pixel width are downsampled first (LTTB
+    by default, or min/max per pixel bin) and volume is drawn as one filled
+    area rather than a bar per row, so `max` histories and minute bars
+    render in a fraction of a second.
+    """
+
+    def __init__(self, width: float = 12, height: float = 8, dpi: int = 100,
+                 downsample: Optional[str] = 'lttb'):
+        if downsample not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Invalid downsample method. Must be one of {list(DOWNSAMPLE_METHODS)}")
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self.downsample = downsample
+
     def plot_stock_data(self, data: pd.DataFrame, ticker: str, period: str):
         """create stock price chart"""
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=(self.width, self.height), dpi=self.dpi)
+        self._draw(fig, data, ticker, period)
+        # the window can be resized, so fit the layout to the labels
+        fig.tight_layout()
+        plt.show()
+
+    def render_chart(self, data: pd.DataFrame, ticker: str, period: str, format: str = 'png') -> bytes:
+        """render stock price chart to PNG or SVG bytes (Agg, no display needed)"""
+        buffer = io.BytesIO()
+        self.save_stock_chart(data, ticker, period, buffer, format)
+        return buffer.getvalue()
+
+    def save_stock_chart(self, data: pd.DataFrame, ticker: str, period: str, path, format: Optional[str] = None):
+        """render stock price chart to an image file or buffer (format from the extension by default)"""
+        with get_metrics().span('render', ticker=ticker, period=period):
+            fig = self.create_figure(data, ticker, period)
+            fig.savefig(path, format=format)
+
+    def create_figure(self, data: pd.DataFrame, ticker: str, period: str) -> Figure:
+        """build the price/volume figure on its own Agg canvas (no pyplot state, safe across threads)"""
+        fig = Figure(figsize=(self.width, self.height), dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        self._draw(fig, data, ticker, period)
+        return fig
+
+    def _points(self, data: pd.DataFrame) -> np.ndarray:
+        """row positions to plot: every row, or a downsampled subset for long series"""
+        pixels = int(self.width * self.dpi)
+        close = data['Close'].to_numpy(dtype=float)
+        if self.downsample is None or len(close) <= pixels:
+            return np.arange(len(close))
+        if self.downsample == 'minmax':
+            return minmax_bins(close, pixels // 2)
+        x = data.index.as_unit('ns').asi8 if isinstance(data.index, pd.DatetimeIndex) else np.arange(len(close))
+        return lttb(x, close, pixels)
+
+    def _draw(self, fig: Figure, data: pd.DataFrame, ticker: str, period: str):
         # check for data
+        data = data[data['Close'].notna()] if not data.empty else data
         if data.empty:
             raise ValueError("No data available to plot")
-        
+
         # create subplots
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), height_ratios=[2, 1])
-        
+        ax1, ax2 = fig.subplots(2, 1, height_ratios=[2, 1], sharex=True)
+
         # plot price data
-        ax1.plot(data.index, data['Close'], label='Close Price', color='#1f77b4', linewidth=1)
-        
+        points = self._points(data)
+        shown = data.iloc[points]
+        ax1.plot(shown.index, shown['Close'], label='Close Price', color='#1f77b4', linewidth=1)
+
         # add moving averages
-        if 'SMA_20' in data.columns:
-            ax1.plot(data.index, data['SMA_20'], label='20-day SMA', color='#ff7f0e', linestyle='--', alpha=0.7)
-        if 'SMA_50' in data.columns:
-            ax1.plot(data.index, data['SMA_50'], label='50-day SMA', color='#2ca02c', linestyle='--', alpha=0.7)
-        
+        if 'SMA_20' in shown.columns:
+            ax1.plot(shown.index, shown['SMA_20'], label='20-day SMA', color='#ff7f0e', linestyle='--', alpha=0.7)
+        if 'SMA_50' in shown.columns:
+            ax1.plot(shown.index, shown['SMA_50'], label='50-day SMA', color='#2ca02c', linestyle='--', alpha=0.7)
+
         # configure price plot
         ax1.set_title(f'{ticker} Stock Price ({period})', pad=20)
         ax1.set_ylabel('Price ($)')
         ax1.grid(True, linestyle='--', alpha=0.7)
         ax1.legend(loc='upper left')
-        
-        # plot volume data
-        ax2.bar(data.index, data['Volume'], color='#7f7f7f', alpha=0.5)
+
+        # plot volume data as a single filled area (per-bin peaks when downsampled)
+        volume = data['Volume'].fillna(0).to_numpy(dtype=float)
+        pixels = int(self.width * self.dpi)
+        if len(volume) > pixels:
+            starts, volume = _bin_max(volume, pixels)
+            index = data.index[starts]
+        else:
+            index = data.index
+        ax2.fill_between(index, 0, volume, step='post', color='#7f7f7f', alpha=0.5, linewidth=0)
         ax2.set_ylabel('Volume')
         ax2.grid(True, linestyle='--', alpha=0.7)
-        
+
         # format date labels
-        plt.gcf().autofmt_xdate()
-        
-        # adjust layout and display
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        fig.autofmt_xdate()
+
+        # fixed margins in inches: tight_layout would draw the whole figure an extra time
+        fig.subplots_adjust(left=0.9 / self.width, right=1 - 0.2 / self.width,
+                            bottom=0.8 / self.height, top=1 - 0.55 / self.height, hspace=0.08)
+        return fig
@@ -0,0 +1,121 @@
+# import required modules
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+VOLATILITY_COLUMNS = ['Realized Vol%', 'Parkinson%', 'Garman-Klass%', 'Rogers-Satchell%', 'EWMA Vol%']
+
+
+def volatility_arrays(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      periods_per_year: float = 252, ewma_lambda: float = 0.94) -> Dict[str, np.ndarray]:
+    """annualized volatility estimators for every column of time x symbol OHLC arrays
+
+    All estimators skip NaN bars, so late listings and halted days only shrink
+    the sample. A symbol needs two valid returns (or bars) to get a value.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_return = np.diff(np.log(close), axis=0)
+        log_hl = np.log(high / low)
+        log_co = np.log(close / open_)
+        log_hc = np.log(high / close)
+        log_ho = np.log(high / open_)
+        log_lc = np.log(low / close)
+        log_lo = np.log(low / open_)
+
+        def annualized(variance: np.ndarray, samples: np.ndarray) -> np.ndarray:
+            variance = np.where(samples >= 2, variance, np.nan)
+            return np.sqrt(np.clip(variance, 0, None) * periods_per_year) * 100
+
+        def mean(values: np.ndarray):
+            samples = (~np.isnan(values)).sum(axis=0)
+            return np.nansum(values, axis=0) / samples, samples
+
+        # close-to-close
+        return_count = (~np.isnan(log_return)).sum(axis=0)
+        return_mean = np.nansum(log_return, axis=0) / return_count
+        realized = np.nansum((log_return - return_mean) ** 2, axis=0) / (return_count - 1)
+
+        # range based estimators
+        parkinson, range_count = mean(log_hl ** 2 / (4 * math.log(2)))
+        garman_klass, _ = mean(0.5 * log_hl ** 2 - (2 * math.log(2) - 1) * log_co ** 2)
+        rogers_satchell, _ = mean(log_hc * log_ho + log_lc * log_lo)
+
+        # EWMA (RiskMetrics) variance as of the last bar, weights normalized over valid returns
+        steps = np.arange(log_return.shape[0])[::-1]
+        weights = ((1 - ewma_lambda) * ewma_lambda ** steps)[:, None] * ~np.isnan(log_return)
+        ewma = np.nansum(weights * log_return ** 2, axis=0) / weights.sum(axis=0)
+
+    return {
+        'Realized Vol%': annualized(realized, return_count),
+        'Parkinson%': annualized(parkinson, range_count),
+        'Garman-Klass%': annualized(garman_klass, range_count),
+        'Rogers-Satchell%': annualized(rogers_satchell, range_count),
+        'EWMA Vol%': annualized(ewma, return_count),
+    }
+
+
+def volatility_metrics(fields: Dict[str, pd.DataFrame], periods_per_year: float = 252,
+                       ewma_lambda: float = 0.94) -> pd.DataFrame:
+    """volatility table (one row per symbol) from {field: time x symbol} OHLC frames"""
+    close = fields.get('Close')
+    if close is None or close.empty:
+        return pd.DataFrame(columns=['Symbol'] + VOLATILITY_COLUMNS)
+
+    def array(name: str) -> np.ndarray:
+        frame = fields.get(name, close).reindex(index=close.index, columns=close.columns)
+        return frame.to_numpy(dtype='f8', na_value=np.nan)
+
+    metrics = volatility_arrays(array('Open'), array('High'), array('Low'), array('Close'),
+                                periods_per_year, ewma_lambda)
+    table = pd.DataFrame({'Symbol': close.columns.to_numpy(), **metrics})
+    table = table.dropna(subset=['Realized Vol%'])
+    table[VOLATILITY_COLUMNS] = table[VOLATILITY_COLUMNS].round(2)
+    return table.reset_index(drop=True)
+
+
+class VolatilityEngine:
+    """compute volatility for batches as they arrive, optionally in a process pool
+
+    With parallel=True each batch's OHLC arrays are shipped to a worker process,
+    which pays off for long (10y/max) histories where the math outweighs the
+    pickling.
+    """
+
+    def __init__(self, periods_per_year: float = 252, ewma_lambda: float = 0.94,
+                 parallel: bool = False, processes: Optional[int] = None):
+        self.periods_per_year = periods_per_year
+        self.ewma_lambda = ewma_lambda
+        self.parallel = parallel
+        self._pool = ProcessPoolExecutor(max_workers=processes) if parallel else None
+        self._pending: List[Future] = []
+        self._tables: List[pd.DataFrame] = []
+
+    def submit(self, fields: Dict[str, pd.DataFrame]):
+        """queue one batch of {field: time x symbol} frames"""
+        if not fields or fields.get('Close') is None or fields['Close'].empty:
+            return
+        if self._pool is None:
+            self._tables.append(volatility_metrics(fields, self.periods_per_year, self.ewma_lambda))
+        else:
+            self._pending.append(self._pool.submit(volatility_metrics, fields, self.periods_per_year, self.ewma_lambda))
+
+    def results(self) -> pd.DataFrame:
+        """wait for queued batches and return one combined table"""
+        self._tables.extend(future.result() for future in self._pending)
+        self._pending = []
+        tables = [table for table in self._tables if not table.empty]
+        if not tables:
+            return pd.DataFrame(columns=['Symbol'] + VOLATILITY_COLUMNS)
+        return pd.concat(tables, ignore_index=True)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
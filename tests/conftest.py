@@ -0,0 +1,9 @@
+# shared pytest setup
+import os
+import sys
+import tempfile
+
+# keep bar stores, journals and the calendar cache out of the user's cache directory;
+# set before any project module reads CACHE_DIR
+os.environ['STOCK_ANALYZER_CACHE'] = tempfile.mkdtemp(prefix='stock-analyzer-tests-')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
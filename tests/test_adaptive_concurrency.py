@@ -0,0 +1,68 @@
+# tests for the AIMD concurrency controller and the per-scan stats it feeds
+from src.adaptive_concurrency import AIMDController
+from src.async_fetch import AsyncFetchScheduler
+from src.batch_fetch import BatchFetcher
+from src.providers.base import RateLimitError
+
+from tests.test_async_fetch import ScriptedProvider
+
+
+def test_successes_raise_limits_additively():
+    controller = AIMDController(concurrency=2, rate=4.0, rate_step=1.0)
+    for _ in range(2):
+        controller.record_success()
+    assert (controller.concurrency, controller.rate) == (3, 5.0)
+    for _ in range(2):
+        controller.record_success()
+    # the next step needs as many successes as the new concurrency
+    assert controller.concurrency == 3
+    controller.record_success()
+    assert controller.concurrency == 4
+    assert controller.peak_concurrency == 4
+
+
+def test_rate_limit_halves_limits_once_per_cooldown():
+    controller = AIMDController(concurrency=8, rate=8.0, cooldown=60.0)
+    controller.record_failure(rate_limited=True)
+    controller.record_failure(rate_limited=True)
+    assert (controller.concurrency, controller.rate) == (4, 4.0)
+    assert controller.decreases == 1
+
+
+def test_isolated_errors_do_not_decrease():
+    controller = AIMDController(concurrency=8, error_threshold=0.25)
+    controller.record_failure()
+    assert controller.concurrency == 8
+
+
+class ThrottledProvider(ScriptedProvider):
+    """answers 429 to the first request"""
+
+    def bulk_history(self, symbols, **kwargs):
+        if not self.calls:
+            self.calls.append({'symbols': list(symbols), 'kwargs': kwargs})
+            raise RateLimitError("too many requests")
+        return super().bulk_history(symbols, **kwargs)
+
+
+def test_rate_limited_request_backs_off_and_retries():
+    controller = AIMDController(concurrency=4, rate=100.0)
+    scheduler = AsyncFetchScheduler(BatchFetcher(10, ThrottledProvider()), controller=controller, backoff=0.0)
+    _, stats = scheduler.fetch(['AAA'], period='5d')
+
+    assert stats.rate_limited == 1
+    assert stats.priced == 1
+    assert controller.decreases == 1
+    assert stats.final_concurrency == 2
+
+
+def test_peak_concurrency_is_per_scan():
+    controller = AIMDController(concurrency=1, rate=100.0, cooldown=0.0)
+    scheduler = AsyncFetchScheduler(BatchFetcher(1, ScriptedProvider()), controller=controller, backoff=0.0)
+    _, first = scheduler.fetch([f"S{i}" for i in range(12)], period='5d')
+    assert first.peak_concurrency > 1
+
+    # the learned limit carries over, but a scan that never reaches the old peak doesn't report it
+    controller.record_failure(rate_limited=True)
+    _, second = scheduler.fetch(['AAA'], period='5d')
+    assert second.peak_concurrency == second.final_concurrency < first.peak_concurrency
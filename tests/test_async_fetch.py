@@ -0,0 +1,119 @@
+# tests for the async fetch scheduler's retries, requeue passes and timeouts
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.adaptive_concurrency import AIMDController
+from src.async_fetch import AsyncFetchScheduler
+from src.batch_fetch import BatchFetcher
+from src.providers.base import MarketDataProvider, ProviderError
+
+
+class ScriptedProvider(MarketDataProvider):
+    """bulk history that fails, stalls or leaves symbols unpriced on cue"""
+
+    name = "scripted"
+
+    def __init__(self, fail_calls: int = 0, slow=(), delay: float = 0.0, missing=(), missing_once=()):
+        self.fail_calls = fail_calls
+        self.slow = set(slow)
+        self.delay = delay
+        self.missing = set(missing)
+        self.missing_once = set(missing_once)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def bulk_history(self, symbols, **kwargs):
+        started = time.monotonic()
+        with self._lock:
+            call = {'symbols': list(symbols), 'kwargs': kwargs, 'started': started}
+            self.calls.append(call)
+            number = len(self.calls)
+            unpriced = self.missing | self.missing_once
+            self.missing_once -= set(symbols)
+        if number <= self.fail_calls:
+            raise ProviderError("upstream error")
+        if self.slow & set(symbols):
+            time.sleep(self.delay)
+        call['finished'] = time.monotonic()
+
+        index = pd.date_range('2026-10-12', periods=5, freq='B', tz='America/New_York')
+        columns = {}
+        for symbol in symbols:
+            values = np.full(len(index), np.nan) if symbol in unpriced else np.linspace(10, 11, len(index))
+            for field in ('Open', 'High', 'Low', 'Close', 'Volume'):
+                columns[(field, symbol)] = values
+        return pd.DataFrame(columns, index=index)
+
+    def history(self, symbol, **kwargs):
+        return self.bulk_history([symbol], **kwargs).xs(symbol, axis=1, level=1)
+
+    def info(self, symbol):
+        return {}
+
+    def symbol_universe(self, scope):
+        return []
+
+
+def scheduler(provider, batch_size=10, controller=None, **options) -> AsyncFetchScheduler:
+    options = {'rate': 1000.0, 'backoff': 0.0, **options}
+    return AsyncFetchScheduler(BatchFetcher(batch_size, provider), controller=controller, **options)
+
+
+def test_failed_request_is_retried():
+    provider = ScriptedProvider(fail_calls=1)
+    results, stats = scheduler(provider, retries=1).fetch(['AAA', 'BBB'], period='5d')
+
+    assert stats.requests == 2
+    assert stats.retries == 1
+    assert stats.priced == 2
+    assert results[0].attempts == 2
+    assert list(results[0].closes.columns) == ['AAA', 'BBB']
+
+
+def test_exhausted_retries_report_the_error():
+    provider = ScriptedProvider(fail_calls=10)
+    results, stats = scheduler(provider, retries=1, retry_passes=0).fetch(['AAA'], period='5d')
+
+    assert stats.requests == 2
+    assert stats.missing == ['AAA']
+    assert results[0].error == "ProviderError: upstream error"
+
+
+def test_unpriced_symbols_are_requeued_once():
+    provider = ScriptedProvider(missing_once={'BBB'}, missing={'CCC'})
+    results, stats = scheduler(provider, retries=0, retry_passes=1).fetch(['AAA', 'BBB', 'CCC'], period='5d')
+
+    assert stats.requeued == 2
+    assert stats.priced == 2
+    assert stats.missing == ['CCC']
+    assert [result.retry_pass for result in results] == [0, 1]
+    assert list(results[1].closes.columns) == ['BBB']
+
+
+def test_timeout_is_passed_down_and_does_not_block_the_scan():
+    provider = ScriptedProvider(slow={'SLOW'}, delay=1.0)
+    started = time.monotonic()
+    results, stats = scheduler(provider, batch_size=1, timeout=0.2, retries=0, retry_passes=0).fetch(
+        ['SLOW', 'AAA'], period='5d')
+
+    # the scan doesn't wait for the stalled worker thread to finish
+    assert time.monotonic() - started < 0.9
+    assert stats.missing == ['SLOW']
+    assert results[0].error == 'TimeoutError'
+    assert all(call['kwargs']['timeout'] == 0.2 for call in provider.calls)
+
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_returns():
+    provider = ScriptedProvider(slow={'SLOW'}, delay=0.5)
+    controller = AIMDController(concurrency=1, max_concurrency=1, rate=1000.0)
+    results, stats = scheduler(provider, batch_size=1, controller=controller, timeout=0.2, retries=0,
+                               retry_passes=0).fetch(['SLOW', 'AAA'], period='5d')
+
+    slow, other = provider.calls
+    # the next batch only starts once the abandoned call is done, so it isn't left queued behind it
+    assert other['started'] >= slow['finished']
+    assert stats.missing == ['SLOW']
+    assert list(results[1].closes.columns) == ['AAA']
@@ -0,0 +1,48 @@
+# tests for batch chart frames and writing charts to a directory and a contact sheet
+import numpy as np
+import pandas as pd
+
+from src.async_fetch import BatchResult
+from src.chart_batch import ChartBatch, _chart_frames
+from src.ohlcv_store import OHLCVStore
+from src.providers.synthetic import SyntheticProvider
+from src.stock_analysis import StockAnalysis
+from utils.logging import FailureJournal
+
+
+def test_moving_averages_skip_the_batch_index_gaps():
+    index = pd.bdate_range('2026-05-01', periods=90)
+    closes = pd.DataFrame({'AAA': np.linspace(100, 190, 90), 'GAPS': np.linspace(50, 140, 90)}, index=index)
+    # GAPS didn't trade on every third session the batch covers
+    closes.iloc[::3, 1] = np.nan
+    fields = {name: closes for name in ('Open', 'High', 'Low', 'Close')}
+    fields['Volume'] = closes * 0 + 1e6
+    result = BatchResult(['AAA', 'GAPS'], closes, fields['Volume'], [], fields=fields)
+
+    frames = _chart_frames(result)
+    for symbol in ('AAA', 'GAPS'):
+        traded = closes[symbol].dropna()
+        np.testing.assert_allclose(frames[symbol]['SMA_20'], traded.rolling(20).mean(), equal_nan=True)
+        np.testing.assert_allclose(frames[symbol]['SMA_50'], traded.rolling(50).mean(), equal_nan=True)
+    assert frames['GAPS']['SMA_50'].notna().sum() == len(frames['GAPS']) - 49
+
+
+def test_directory_and_sheet_share_one_fetch(tmp_path):
+    analysis = StockAnalysis(SyntheticProvider(), OHLCVStore(str(tmp_path / 'ohlcv')),
+                             FailureJournal(str(tmp_path / 'failures.jsonl')))
+    fetches = []
+    fetch = analysis.scheduler.fetch
+
+    def counted(symbols, *args, **kwargs):
+        fetches.append(list(symbols))
+        return fetch(symbols, *args, **kwargs)
+
+    analysis.scheduler.fetch = counted
+    paths, count, missing = ChartBatch(analysis, workers=1).write(
+        ['AAA', 'BBB'], '3mo', directory=str(tmp_path / 'charts'), sheet=str(tmp_path / 'sheet.png'))
+
+    assert fetches == [['AAA', 'BBB']]
+    assert sorted(path.name for path in (tmp_path / 'charts').iterdir()) == ['AAA_3mo.png', 'BBB_3mo.png']
+    assert len(paths) == count == 2
+    assert missing == []
+    assert (tmp_path / 'sheet.png').stat().st_size > 0
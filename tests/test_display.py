@@ -0,0 +1,42 @@
+# tests for the paged table formatter, checked against DataFrame.to_string
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.display import format_pages
+
+
+def result_table(rows: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        'Symbol': [f"S{i}" * (i % 3 + 1) for i in range(rows)],
+        'Change%': rng.normal(0, 20, rows).round(2),
+        'Start Price': rng.uniform(1, 5000, rows).round(2),
+        'End Price': rng.uniform(1, 5000, rows).round(2),
+        'Volume': rng.integers(0, 10**9, rows),
+    })
+
+
+@pytest.mark.parametrize('page_rows', [500, 3])
+def test_plain_tables_read_like_to_string(page_rows):
+    df = pd.DataFrame({
+        'Symbol': ['A', 'BRKB', 'CC', 'DDDDD'],
+        'Open': [12.3456, 1.5, np.nan, -0.25],
+        'Bars': [1, 200, 3, 40],
+        'Annualized Volatility': [0.25, 1.123456789, 3.0, 12.0],
+    })
+    assert '\n'.join(format_pages(df, page_rows)) == df.to_string(index=False)
+
+
+@pytest.mark.parametrize('page_rows', [500, 3])
+def test_result_tables_get_percent_and_currency(page_rows):
+    df = result_table()
+    expected = df.copy()
+    expected['Change%'] = expected['Change%'].apply(lambda x: f"{x:+.2f}%")
+    expected['Start Price'] = expected['Start Price'].apply(lambda x: f"${x:,.2f}")
+    expected['End Price'] = expected['End Price'].apply(lambda x: f"${x:,.2f}")
+    expected['Volume'] = expected['Volume'].apply(lambda x: f"{x:,}")
+
+    pages = list(format_pages(df, page_rows))
+    assert len(pages) == -(-len(df) // page_rows)
+    assert '\n'.join(pages) == expected.to_string(index=False)
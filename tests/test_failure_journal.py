@@ -0,0 +1,89 @@
+# tests for the failure journal and the systematic-failure exclusion set built from it
+import json
+import time
+
+import pytest
+
+from utils.logging import FailureJournal, classify_error
+
+DAY = 86400
+
+
+def scan_failure(symbol: str, days_ago: float, rate: float = 0.1, source: str = 'scan') -> dict:
+    return {'ts': time.time() - days_ago * DAY, 'symbol': symbol, 'period': '1d', 'error': 'not priced',
+            'error_class': 'NoData', 'source': source, 'scan_failure_rate': rate}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return FailureJournal(str(tmp_path / 'failures.jsonl'), flush_interval=0.01)
+
+
+def write_journal(journal: FailureJournal, entries):
+    with open(journal.path, 'w') as f:
+        f.writelines(json.dumps(entry) + '\n' for entry in entries)
+
+
+def test_exclusion_thresholds(journal):
+    write_journal(journal, [
+        # three separate days: excluded
+        *(scan_failure('DEAD', days) for days in (0, 1, 2)),
+        # twice on one day counts once
+        *(scan_failure('FLAKY', days) for days in (0, 0, 1)),
+        # failures during scans where most symbols failed say nothing about the symbol
+        *(scan_failure('OUTAGE', days, rate=0.9) for days in (0, 1, 2)),
+        # lookups, custom date windows and chart renders outside open-ended scans don't count
+        *(scan_failure('LOOKUP', days, source='analysis') for days in (0, 1, 2)),
+        *(scan_failure('LISTED', days, source='custom') for days in (0, 1, 2)),
+        *(scan_failure('CHART', days, source='chart') for days in (0, 1, 2)),
+        # only failures inside the window count
+        *(scan_failure('OLD', days) for days in (0, 20, 21)),
+    ])
+    assert journal.systematic_failures() == {'DEAD'}
+    assert journal.systematic_failures(min_days=2) == {'DEAD', 'FLAKY'}
+    assert journal.systematic_failures(max_scan_failure_rate=0.95) == {'DEAD', 'OUTAGE'}
+    assert journal.systematic_failures(window_days=30) == {'DEAD', 'OLD'}
+
+
+def test_new_failures_reach_the_exclusion_set_without_rereading(journal, monkeypatch):
+    write_journal(journal, [scan_failure('AAA', days) for days in (1, 2)])
+    assert journal.systematic_failures() == set()
+
+    def read_again(*args, **kwargs):
+        raise AssertionError("the journal files were read again")
+
+    monkeypatch.setattr(journal, '_read', read_again)
+    journal.record('AAA', '1d', 'not priced', source='scan', scan_failure_rate=0.1)
+    journal.flush()
+    assert journal.systematic_failures() == {'AAA'}
+
+
+def test_first_load_reads_files_outside_the_writer_lock(journal, monkeypatch):
+    write_journal(journal, [scan_failure('AAA', days) for days in (1, 2)])
+    read = journal._read
+
+    def read_unlocked(*args, **kwargs):
+        # a batch written while the files are read is picked up from pending
+        assert not journal._index_lock.locked()
+        journal._write([scan_failure('AAA', 0)])
+        return read(*args, **kwargs)
+
+    monkeypatch.setattr(journal, '_read', read_unlocked)
+    assert journal.systematic_failures() == {'AAA'}
+
+
+def test_recorded_entries_are_journaled(journal):
+    journal.record_many(['AAA', 'BBB'], '5d', 'ValueError: No data for AAA', scan_failure_rate=0.2)
+    journal.record('AAA', '1mo', 'timed out', source='analysis')
+    rows = journal.summary(by=('symbol',))
+
+    assert [(row['symbol'], row['failures']) for row in rows] == [('AAA', 2), ('BBB', 1)]
+    assert [entry['error_class'] for entry in journal.entries()] == ['NoData', 'NoData', 'Timeout']
+    with pytest.raises(ValueError):
+        journal.summary(by=('exchange',))
+
+
+def test_classify_error():
+    assert classify_error('YFRateLimitError: Too Many Requests') == 'RateLimit'
+    assert classify_error('KeyError: Close') == 'KeyError'
+    assert classify_error('something odd happened') == 'Other'
@@ -0,0 +1,69 @@
+# tests for the streaming indicators, checked against pandas rolling / ewm
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicators import EMA, SMA, BollingerBands, Indicator, IndicatorSet, RollingStd
+
+ET = 'America/New_York'
+
+
+def closes(count: int = 120, seed: int = 0) -> np.ndarray:
+    return 100 + np.random.default_rng(seed).normal(0, 1, count).cumsum()
+
+
+def run(indicator: Indicator, values) -> np.ndarray:
+    return np.array([indicator.update({'Close': value}) for value in values])
+
+
+def test_indicator_is_abstract():
+    with pytest.raises(TypeError):
+        Indicator()
+
+
+@pytest.mark.parametrize('indicator, expected', [
+    (SMA(20), lambda series: series.rolling(20).mean()),
+    (RollingStd(20), lambda series: series.rolling(20).std()),
+    (EMA(12), lambda series: series.ewm(span=12, adjust=False).mean()),
+])
+def test_matches_pandas(indicator, expected):
+    series = pd.Series(closes())
+    np.testing.assert_allclose(run(indicator, series), expected(series), rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('make, expected', [
+    (lambda: SMA(10), lambda series: series.rolling(10).mean()),
+    (lambda: RollingStd(10), lambda series: series.rolling(10).std()),
+    (lambda: EMA(10), lambda series: series.ewm(span=10, adjust=False).mean()),
+])
+def test_missing_closes_are_skipped(make, expected):
+    values = closes()
+    values[[5, 40, 41, 90]] = np.nan
+    values[60] = np.inf
+    output = run(make(), values)
+
+    # every later value still matches the series with the missing bars dropped
+    present = np.isfinite(values)
+    np.testing.assert_allclose(output[present], expected(pd.Series(values[present])), rtol=1e-9, equal_nan=True)
+    assert math.isfinite(output[-1])
+
+
+def test_indicator_set_revises_the_forming_bar_and_resumes(tmp_path):
+    index = pd.date_range('2026-10-16 09:30', periods=60, freq='1min', tz=ET)
+    values = closes(60)
+    frame = pd.DataFrame({'Open': values, 'High': values + 0.5, 'Low': values - 0.5, 'Close': values,
+                          'Volume': 1000.0}, index=index)
+    expected = IndicatorSet({'sma': SMA(5), 'bands': BollingerBands(10)}).update_frame(frame)
+
+    indicators = IndicatorSet({'sma': SMA(5), 'bands': BollingerBands(10)})
+    partial = frame.iloc[:40].copy()
+    # the last polled bar is still forming and gets revised by the next poll
+    partial.iloc[-1, partial.columns.get_loc('Close')] += 3
+    indicators.update_frame(partial)
+    path = str(tmp_path / 'state.json')
+    indicators.save(path)
+    resumed = IndicatorSet.load(path).update_frame(frame.iloc[39:])
+
+    pd.testing.assert_frame_equal(resumed, expected.iloc[39:], check_freq=False)
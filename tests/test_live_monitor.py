@@ -0,0 +1,145 @@
+# tests for the rolling live-movers window and the polling monitor, driven by a scripted provider and clock
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.live_monitor import NEVER, LiveMoversMonitor, RollingWindow, _ns
+from src.providers.base import MarketDataProvider
+
+ET = 'America/New_York'
+OPEN = pd.Timestamp('2026-10-16 09:30', tz=ET)
+
+
+def et(text: str) -> pd.Timestamp:
+    return pd.Timestamp(f"2026-10-16 {text}", tz=ET)
+
+
+def price(symbol: str, ts: pd.Timestamp) -> float:
+    minute = (ts - OPEN) // pd.Timedelta(minutes=1)
+    return {'AAA': 100.0 + minute, 'BBB': 200.0 - 0.5 * minute, 'NEW': 50.0 + 2 * minute}[symbol]
+
+
+class ScriptedProvider(MarketDataProvider):
+    """minute bars up to a settable `now`: BBB halts after 10:56 and NEW lists at 11:02"""
+
+    name = "scripted"
+    trading = {'AAA': (et('09:30'), et('16:00')), 'BBB': (et('09:30'), et('10:56')),
+               'NEW': (et('11:02'), et('16:00'))}
+
+    def __init__(self, now: pd.Timestamp):
+        self.now = now
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def history(self, symbol, **kwargs):
+        return self.bulk_history([symbol], **kwargs).xs(symbol, axis=1, level=1)
+
+    def bulk_history(self, symbols, start=None, interval='1m', **kwargs):
+        with self._lock:
+            self.requests.append((tuple(symbols), pd.Timestamp(start)))
+        columns = {}
+        for symbol in symbols:
+            first, last = self.trading[symbol]
+            index = pd.date_range(max(first, pd.Timestamp(start)), min(last, self.now), freq='1min')
+            closes = pd.Series([price(symbol, ts) for ts in index], index=index, dtype=float)
+            for field in ('Open', 'High', 'Low', 'Close'):
+                columns[field, symbol] = closes
+            columns['Volume', symbol] = pd.Series(1000.0, index=index)
+        wide = pd.DataFrame(columns)
+        return wide if not wide.empty else pd.DataFrame()
+
+    def info(self, symbol):
+        return {}
+
+    def symbol_universe(self, scope):
+        return []
+
+
+def bars(symbols, start: str, end: str, volume: float = 1000.0):
+    index = pd.date_range(et(start), et(end), freq='1min')
+    closes = pd.DataFrame({symbol: [price(symbol, ts) for ts in index] for symbol in symbols}, index=index)
+    return closes, pd.DataFrame(volume, index=index, columns=symbols)
+
+
+def row(frame: pd.DataFrame, symbol: str) -> pd.Series:
+    return frame.set_index('Symbol').loc[symbol]
+
+
+def test_window_evicts_old_bars_and_measures_from_the_last_close_before_it():
+    window = RollingWindow(['AAA', 'BBB'], pd.Timedelta(minutes=5))
+    window.update(*bars(['AAA', 'BBB'], '10:50', '10:56'))
+    window.update(*bars(['AAA'], '10:57', '11:00'))
+
+    # the window is (10:55, 11:00]; older rows are gone
+    assert list(pd.to_datetime(window.times, utc=True)) == list(pd.date_range(et('10:56'), et('11:00'), freq='1min'))
+    gainers, _ = window.leaderboard(2)
+    aaa = row(gainers, 'AAA')
+    assert aaa['Start Price'] == price('AAA', et('10:55'))
+    assert aaa['End Price'] == price('AAA', et('11:00'))
+    assert aaa['Change%'] == round((price('AAA', et('11:00')) / price('AAA', et('10:55')) - 1) * 100, 2)
+    assert aaa['Volume'] == 1000
+    # BBB last traded at 10:56, still inside the window
+    assert row(gainers, 'BBB')['End Price'] == price('BBB', et('10:56'))
+
+    # once 10:56 leaves the window, BBB's last close becomes its base and carries forward
+    window.update(*bars(['AAA'], '11:01', '11:03'))
+    gainers, losers = window.leaderboard(2)
+    bbb = row(gainers, 'BBB')
+    assert bbb['Start Price'] == bbb['End Price'] == price('BBB', et('10:56'))
+    assert bbb['Change%'] == 0
+    assert row(gainers, 'AAA')['Start Price'] == price('AAA', et('10:58'))
+    assert window.volume_count.tolist() == [5, 0]
+
+
+def test_a_revised_bar_replaces_the_partial_one():
+    window = RollingWindow(['AAA'], pd.Timedelta(minutes=5))
+    closes, volumes = bars(['AAA'], '10:55', '11:00')
+    window.update(closes, volumes)
+    # the forming 11:00 bar is polled again with a later close and the full minute's volume
+    window.update(closes.iloc[-1:] + 3, volumes.iloc[-1:] * 4)
+    # a bar reported without a trade keeps the close already held
+    window.update(closes.iloc[-2:-1] * np.nan, volumes.iloc[-2:-1] * np.nan)
+
+    gainers, _ = window.leaderboard(1)
+    assert row(gainers, 'AAA')['End Price'] == price('AAA', et('11:00')) + 3
+    assert row(gainers, 'AAA')['Volume'] == (4 * 1000 + 4000) // 5
+    assert window.closes[-2, 0] == price('AAA', et('10:59'))
+
+
+@pytest.fixture
+def monitor():
+    provider = ScriptedProvider(et('11:00'))
+    clock = SimpleNamespace(now=et('11:00'))
+    monitor = LiveMoversMonitor(SimpleNamespace(provider=provider), window='5m', limit=3, interval='1m',
+                                clock=lambda: clock.now.tz_convert('UTC'))
+    # one symbol per request, so each symbol's poll start is visible
+    monitor.scheduler.fetcher.batch_size = 1
+    monitor.start(['AAA', 'BBB', 'NEW'])
+    return monitor, provider, clock
+
+
+def test_polls_resume_from_each_symbols_last_bar(monitor):
+    monitor, provider, clock = monitor
+    assert monitor.seen.tolist() == [NEVER] * 3
+
+    monitor.poll()
+    # first polls reach back over the window and the bar before it
+    assert sorted(provider.requests) == [((symbol,), et('10:54')) for symbol in ('AAA', 'BBB', 'NEW')]
+    newest = int(_ns(pd.DatetimeIndex([et('11:00')]))[0])
+    assert monitor.seen.tolist() == [newest, int(_ns(pd.DatetimeIndex([et('10:56')]))[0]), NEVER]
+
+    provider.requests.clear()
+    provider.now = clock.now = et('11:03')
+    monitor.poll()
+    # seen symbols resume from their newest bar (it may have been forming); NEW is still new
+    assert sorted(provider.requests) == [(('AAA',), et('11:00')), (('BBB',), et('10:56')), (('NEW',), et('10:57'))]
+    assert monitor.seen[2] == int(_ns(pd.DatetimeIndex([et('11:03')]))[0])
+
+    gainers, losers = monitor.leaderboard()
+    assert row(gainers, 'NEW')['Start Price'] == price('NEW', et('11:02'))
+    assert row(gainers, 'AAA')['Start Price'] == price('AAA', et('10:58'))
+    assert row(losers, 'BBB')['Change%'] == 0
+    assert monitor.cycles == 2
@@ -0,0 +1,118 @@
+# tests for deriving every movers period from one daily fetch
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.multi_period import MultiPeriodMovers, anchor_date, fetch_start, period_returns
+from src.ohlcv_store import OHLCVStore
+from src.providers.synthetic import SyntheticProvider
+from src.stock_analysis import StockAnalysis
+from utils.logging import FailureJournal
+
+PERIODS = ['1d', '5d', '1mo', '3mo', '6mo', 'ytd', '1y', '2y', 'max']
+
+
+def daily_frames():
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range('2024-01-02', '2026-10-16')
+    symbols = ['AAA', 'BBB', 'NEW', 'GAPS', 'HALT']
+    closes = pd.DataFrame(100 + rng.normal(0, 1, (len(index), len(symbols))).cumsum(axis=0),
+                          index=index, columns=symbols)
+    volumes = pd.DataFrame(rng.integers(1_000, 100_000, closes.shape).astype(float), index=index, columns=symbols)
+    # listed three months ago, missing days now and then, halted for the last week
+    closes.loc[:'2026-07-15', 'NEW'] = np.nan
+    closes.iloc[rng.choice(len(index), 60, replace=False), 3] = np.nan
+    closes.iloc[-5:, 4] = np.nan
+    volumes[closes.isna()] = np.nan
+    return closes, volumes
+
+
+def reference(closes: pd.DataFrame, volumes: pd.DataFrame, period: str) -> pd.DataFrame:
+    """the same result rows computed symbol by symbol"""
+    last_session = closes.index[-1].date()
+    if period in ('1d', '5d'):
+        anchor_row = len(closes) - 1 - {'1d': 1, '5d': 5}[period]
+    elif period == 'max':
+        anchor_row = 0
+    else:
+        anchor_row = int((closes.index <= pd.Timestamp(anchor_date(period, last_session))).sum()) - 1
+
+    rows = []
+    for symbol in closes.columns:
+        series = closes[symbol]
+        valid = np.flatnonzero(series.notna().to_numpy())
+        base, last = max(anchor_row, valid[0]), valid[-1]
+        if last <= base:
+            continue
+        start, end = series.ffill().iloc[base], series.iloc[last]
+        rows.append({
+            'Symbol': symbol,
+            'Change%': round((end - start) / start * 100, 2),
+            'Start Price': round(start, 2),
+            'End Price': round(end, 2),
+            'Volume': int(volumes[symbol].iloc[base + 1:last + 1].mean()),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_period_returns_match_per_period_computation(period):
+    closes, volumes = daily_frames()
+    result = period_returns(closes, volumes, PERIODS)[period]
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), reference(closes, volumes, period),
+                                  check_dtype=False)
+
+
+def test_anchor_dates_and_fetch_start():
+    friday = date(2026, 10, 16)
+    assert anchor_date('ytd', friday) == date(2025, 12, 31)
+    assert anchor_date('3mo', friday) == date(2026, 7, 16)
+    assert anchor_date('max', friday) is None
+    with pytest.raises(ValueError):
+        anchor_date('1h', friday)
+
+    # one fetch reaches back far enough for the longest period
+    assert fetch_start(['1d', '1y', '3mo'], friday) <= anchor_date('1y', friday)
+    assert fetch_start(['5d'], friday) <= date(2026, 10, 9)
+    assert fetch_start(['1mo', 'max'], friday) is None
+
+
+def test_movers_rank_every_period_from_batches():
+    closes, volumes = daily_frames()
+    movers = MultiPeriodMovers(['5d', '1y'], limit=2)
+    for columns in (['AAA', 'BBB'], ['NEW', 'GAPS', 'HALT']):
+        movers.push(closes[columns], volumes[columns])
+
+    for period, (gainers, losers, ranked) in movers.leaderboards().items():
+        expected = reference(closes, volumes, period)
+        assert ranked == len(expected)
+        assert list(gainers['Symbol']) == list(expected.nlargest(2, 'Change%')['Symbol'])
+        assert list(losers['Symbol']) == list(expected.nsmallest(2, 'Change%')['Symbol'])
+
+    report = movers.report()
+    assert list(report.columns[:3]) == ['Period', 'Side', 'Rank']
+    assert list(report['Period'].unique()) == ['5d', '1y']
+
+
+def test_invalid_period_is_rejected():
+    with pytest.raises(ValueError):
+        MultiPeriodMovers(['1h'])
+
+
+def test_single_period_scan_matches_the_multi_period_scan(tmp_path):
+    analysis = StockAnalysis(SyntheticProvider(), OHLCVStore(str(tmp_path / 'ohlcv')),
+                             FailureJournal(str(tmp_path / 'failures.jsonl')))
+    periods = ['1d', '5d', '1y']
+    report, _ = analysis.get_multi_period_movers(periods, limit=5, analyze_sp500=True)
+
+    for period in periods:
+        gainers, losers, ranked = analysis.get_gainers_losers(period, limit=5, analyze_sp500=True)
+        assert ranked > 0
+        # both measure from the close before the period, so 1d is not flat
+        assert (gainers['Change%'] != 0).all()
+        for side, frame in (('gainer', gainers), ('loser', losers)):
+            rows = report[(report['Period'] == period) & (report['Side'] == side)]
+            pd.testing.assert_frame_equal(frame.reset_index(drop=True),
+                                          rows.drop(columns=['Period', 'Side', 'Rank']).reset_index(drop=True))
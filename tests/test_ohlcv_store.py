@@ -0,0 +1,152 @@
+# tests for the bar store, its session-anchored windows and the caching provider over it
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ohlcv_store import OHLCVStore, resolve_window
+from src.providers.base import MarketDataProvider
+from src.providers.cached import CachedProvider
+
+ET = 'America/New_York'
+
+
+def et(text: str) -> pd.Timestamp:
+    return pd.Timestamp(text, tz=ET)
+
+
+@pytest.mark.parametrize('now, period, expected', [
+    # Sunday: every period ends at Friday's session
+    ('2026-10-18 12:00', '1d', '2026-10-16 00:00'),
+    ('2026-10-18 12:00', '1h', '2026-10-16 15:00'),
+    ('2026-10-18 12:00', '5d', '2026-10-12 00:00'),
+    ('2026-10-18 12:00', '1mo', '2026-09-15 00:00'),
+    ('2026-10-18 12:00', 'ytd', '2026-01-01 00:00'),
+    # Monday before the open: still Friday
+    ('2026-10-19 08:00', '1d', '2026-10-16 00:00'),
+    ('2026-10-19 08:00', '12h', '2026-10-16 04:00'),
+    # Monday in session: the window ends now
+    ('2026-10-19 10:00', '1d', '2026-10-19 00:00'),
+    ('2026-10-19 10:00', '1h', '2026-10-19 09:00'),
+    # Thanksgiving is skipped and the day after closes early
+    ('2026-11-30 08:00', '5d', '2026-11-20 00:00'),
+    ('2026-11-28 12:00', '1h', '2026-11-27 12:00'),
+])
+def test_resolve_window_anchors_to_latest_session(now, period, expected):
+    start, end = resolve_window(period, now=et(now))
+    assert start == et(expected)
+    assert end is None
+
+
+def test_resolve_window_keeps_explicit_bounds():
+    start, end = resolve_window('1y', start='2026-10-01', end='2026-10-08')
+    assert start == et('2026-10-01')
+    assert end == et('2026-10-08')
+    assert resolve_window('max') == (None, None)
+
+
+def test_resolve_window_rejects_unknown_period():
+    with pytest.raises(ValueError):
+        resolve_window('2w')
+
+
+def _exchange_time(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize(ET) if ts.tz is None else ts
+
+
+def _price(index: pd.DatetimeIndex) -> np.ndarray:
+    return 100.0 + np.asarray((index.tz_localize(None) - pd.Timestamp('2026-08-03')).days, dtype=float)
+
+
+class FakeProvider(MarketDataProvider):
+    """weekday bars whose close is a function of the date, times a settable adjustment factor"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.scale = 1.0
+        self.requests = []
+
+    def history(self, symbol, **kwargs):
+        return self.bulk_history([symbol], **kwargs).xs(symbol, axis=1, level=1)
+
+    def bulk_history(self, symbols, start=None, end=None, interval='1d', **kwargs):
+        self.requests.append({'symbols': list(symbols), 'start': start, 'end': end})
+        index = pd.bdate_range('2026-08-03', '2026-10-16').tz_localize(ET)
+        if start is not None:
+            index = index[index >= _exchange_time(start)]
+        if end is not None:
+            index = index[index < _exchange_time(end)]
+        closes = self.scale * _price(index)
+        columns = {(field, symbol): closes for field in ('Open', 'High', 'Low', 'Close') for symbol in symbols}
+        columns.update({('Volume', symbol): np.full(len(index), 1e6) for symbol in symbols})
+        return pd.DataFrame(columns, index=index)
+
+    def info(self, symbol):
+        return {}
+
+    def symbol_universe(self, scope):
+        return []
+
+
+@pytest.fixture
+def cached(tmp_path):
+    return CachedProvider(FakeProvider(), OHLCVStore(str(tmp_path)), refresh_after=0)
+
+
+def test_incremental_fetch_overlaps_a_finished_bar(cached):
+    cached.bulk_history(['AAA'], start='2026-09-01', end='2026-10-10')
+    wide = cached.bulk_history(['AAA'], start='2026-09-01', end='2026-10-15')
+
+    # stored through Friday 10-09, so the refetch starts at the session before it
+    assert cached.inner.requests[-1]['start'] == '2026-10-08'
+    assert len(cached.inner.requests) == 2
+    assert wide.index[-1] == et('2026-10-14')
+    assert wide.index.is_unique
+
+
+def test_readjusted_history_is_refetched_in_full(cached):
+    cached.bulk_history(['AAA', 'BBB'], start='2026-09-01', end='2026-10-10')
+    # a split halves every past close upstream
+    cached.inner.scale = 0.5
+    wide = cached.bulk_history(['AAA', 'BBB'], start='2026-09-01', end='2026-10-17')
+
+    assert cached.inner.requests[-1]['start'] == et('2026-09-01')
+    assert cached.inner.requests[-1]['symbols'] == ['AAA', 'BBB']
+    np.testing.assert_allclose(wide['Close', 'AAA'].to_numpy(), 0.5 * _price(wide.index))
+    assert wide.index[0] == et('2026-09-01')
+    assert wide.index[-1] == et('2026-10-16')
+    assert cached.generations['AAA'] == cached.generations['BBB'] == 1
+
+
+def test_unchanged_history_is_not_refetched(cached):
+    cached.bulk_history(['AAA'], start='2026-09-01', end='2026-10-10')
+    cached.bulk_history(['AAA'], start='2026-09-01', end='2026-10-17')
+    assert [request['start'] for request in cached.inner.requests] == ['2026-09-01', '2026-10-08']
+
+
+def test_concurrent_writes_of_one_symbol(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    index = pd.bdate_range('2026-09-01', '2026-10-16').tz_localize(ET)
+    frame = pd.DataFrame({field: _price(index) for field in ('Open', 'High', 'Low', 'Close', 'Volume')}, index=index)
+    errors = []
+
+    def write(times):
+        try:
+            for _ in range(times):
+                store.write('AAA', '1d', frame, index[0].tz_convert('UTC'), pd.Timestamp.now(tz='UTC'), replace=True)
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write, args=(20,)) for _ in range(6)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert errors == []
+    assert store.meta('AAA', '1d')['bars'] == len(index)
+    np.testing.assert_array_equal(store.read('AAA', '1d')['Close'], _price(index))
+    assert sorted(path.name for path in (tmp_path / '1d').iterdir()) == ['AAA.json', 'AAA.npy']
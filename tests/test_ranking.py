@@ -0,0 +1,50 @@
+# tests for the streaming top-K leaderboard, checked against pandas nlargest / nsmallest
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ranking import StreamingTopK
+
+
+def result_rows(count: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # rounded so plenty of values tie, plus a few unpriced rows
+    change = np.round(rng.normal(0, 3, count), 1)
+    change[rng.choice(count, count // 20, replace=False)] = np.nan
+    return pd.DataFrame({
+        'Symbol': [f"S{i:04d}" for i in range(count)],
+        'Change%': change,
+        'Volume': rng.integers(1_000, 1_000_000, count),
+    })
+
+
+@pytest.mark.parametrize('k, batch', [(1, 7), (10, 50), (20, 1), (25, 333)])
+def test_leaderboard_matches_nlargest_and_nsmallest(k, batch):
+    rows = result_rows(1000)
+    top = StreamingTopK(k)
+    for i in range(0, len(rows), batch):
+        top.push(rows.iloc[i:i + batch])
+    gainers, losers = top.leaderboard()
+
+    # ties keep the row that arrived first, like keep='first'
+    pd.testing.assert_frame_equal(gainers, rows.nlargest(k, 'Change%').reset_index(drop=True))
+    pd.testing.assert_frame_equal(losers, rows.nsmallest(k, 'Change%').reset_index(drop=True))
+    assert top.count == rows['Change%'].notna().sum()
+
+
+def test_fewer_rows_than_k():
+    rows = result_rows(8, seed=3)
+    top = StreamingTopK(20)
+    top.push(rows)
+    gainers, losers = top.leaderboard()
+
+    assert len(gainers) == len(losers) == rows['Change%'].notna().sum()
+    pd.testing.assert_frame_equal(gainers, rows.dropna().sort_values('Change%', ascending=False, kind='stable')
+                                  .reset_index(drop=True))
+
+
+def test_status_names_leader_and_laggard():
+    top = StreamingTopK(5)
+    assert top.status() == ""
+    top.push(pd.DataFrame({'Symbol': ['AAA', 'BBB', 'CCC'], 'Change%': [1.5, -2.25, 0.0], 'Volume': [1, 2, 3]}))
+    assert top.status() == "Top AAA +1.50% | Bottom BBB -2.25% | 3 ranked"
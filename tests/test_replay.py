@@ -0,0 +1,55 @@
+# tests for recording provider calls and replaying them through the caching layer
+import functools
+
+import pandas as pd
+import pytest
+
+from src import ohlcv_store
+from src.ohlcv_store import OHLCVStore
+from src.providers import cached
+from src.providers.base import ProviderError
+from src.providers.cached import CachedProvider
+from src.providers.replay import RecordingProvider, ReplayProvider
+from src.providers.synthetic import SyntheticProvider
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """a 3mo scan of three symbols recorded below the cache, as main.py runs with record:<dir>"""
+    directory = str(tmp_path / 'fixtures')
+    provider = CachedProvider(RecordingProvider(SyntheticProvider(), directory), OHLCVStore(str(tmp_path / 'a')))
+    wide = provider.bulk_history(['AAA', 'BBB', 'CCC'], period='3mo', timeout=5.0)
+    return directory, wide
+
+
+def test_replay_through_the_cache_on_a_later_day(recorded, tmp_path, monkeypatch):
+    directory, wide = recorded
+    # the cache anchors periods at the session it runs in, so its request dates move on by a day
+    tomorrow = pd.Timestamp.now(tz='UTC') + pd.Timedelta(days=1)
+    monkeypatch.setattr(cached, 'resolve_window', functools.partial(ohlcv_store.resolve_window, now=tomorrow))
+    provider = CachedProvider(ReplayProvider(directory), OHLCVStore(str(tmp_path / 'b')))
+
+    # a different timeout and batches split differently than when recording
+    replayed = pd.concat([provider.bulk_history(['AAA'], period='3mo', timeout=30.0),
+                          provider.bulk_history(['BBB', 'CCC'], period='3mo')], axis=1).sort_index(axis=1)
+
+    assert not replayed.empty
+    expected = wide.loc[replayed.index[0]:]
+    pd.testing.assert_frame_equal(replayed, expected, check_freq=False)
+
+
+def test_replay_cuts_the_requested_window(recorded):
+    directory, wide = recorded
+    replay = ReplayProvider(directory)
+
+    start = wide.index[-10]
+    frame = replay.history('AAA', start=start, end=wide.index[-2], interval='1d')
+    # the recording keeps the provider's dtypes, the cache its own stamp unit and float volumes
+    pd.testing.assert_frame_equal(frame, wide.xs('AAA', axis=1, level=1).iloc[-10:-2], check_freq=False,
+                                  check_names=False, check_index_type=False, check_dtype=False)
+    # periods count back from when the bars were recorded
+    assert len(replay.history('BBB', period='5d')) == 5
+
+    with pytest.raises(ProviderError):
+        replay.history('ZZZ', period='5d')
+    assert replay.bulk_history(['AAA', 'ZZZ'], period='5d').columns.get_level_values(1).unique().tolist() == ['AAA']
@@ -0,0 +1,88 @@
+# tests for building coarser bars locally, checked against pandas' own resample
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ohlcv_store import OHLCVStore
+from src.providers.cached import CachedProvider
+from src.providers.multi_resolution import MultiResolutionProvider
+from src.providers.synthetic import SyntheticProvider
+from src.resample import AGGREGATIONS, can_resample, resample_ohlcv
+
+ET = 'America/New_York'
+
+
+def minute_bars(days: int = 3, seed: int = 0) -> pd.DataFrame:
+    """random 1m OHLCV bars over regular sessions, with a few missing closes"""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range('2026-10-12', periods=days)
+    index = pd.DatetimeIndex([day + pd.Timedelta(minutes=570 + i) for day in sessions for i in range(390)]).tz_localize(ET)
+    close = 100 + rng.normal(0, 0.1, len(index)).cumsum()
+    frame = pd.DataFrame({
+        'Open': close + rng.normal(0, 0.05, len(index)),
+        'High': close + 0.2,
+        'Low': close - 0.2,
+        'Close': close,
+        'Volume': rng.integers(100, 10_000, len(index)).astype(float),
+    }, index=index)
+    frame.iloc[rng.choice(len(index), 20, replace=False)] = np.nan
+    return frame
+
+
+def pandas_bars(frame: pd.DataFrame, rule: str, **kwargs) -> pd.DataFrame:
+    resampler = frame.resample(rule, **kwargs)
+    bars = pd.concat({field: resampler[field].agg(how) if how != 'sum' else resampler[field].sum(min_count=1)
+                      for field, how in AGGREGATIONS.items()}, axis=1)
+    return bars[bars['Close'].notna()]
+
+
+@pytest.mark.parametrize('interval, rule', [('5m', '5min'), ('15m', '15min'), ('30m', '30min'), ('1h', '60min')])
+def test_intraday_bins_match_pandas(interval, rule):
+    frame = minute_bars()
+    # Yahoo's intraday bins start at the 09:30 open, i.e. half past each hour
+    expected = pandas_bars(frame, rule, offset='30min')
+    pd.testing.assert_frame_equal(resample_ohlcv(frame, interval), expected, check_freq=False)
+
+
+def test_daily_and_calendar_bins_match_pandas():
+    frame = minute_bars(days=15)
+    daily = resample_ohlcv(frame, '1d')
+    pd.testing.assert_frame_equal(daily, pandas_bars(frame, 'D'), check_freq=False)
+
+    weekly = pandas_bars(daily, 'W-MON', label='left', closed='left')
+    pd.testing.assert_frame_equal(resample_ohlcv(daily, '1wk'), weekly, check_freq=False)
+    monthly = pandas_bars(daily, 'MS')
+    pd.testing.assert_frame_equal(resample_ohlcv(daily, '1mo'), monthly, check_freq=False)
+
+
+def test_wide_frames_resample_per_symbol():
+    one, two = minute_bars(seed=1), minute_bars(seed=2)
+    # the second symbol starts trading a day late
+    two.loc[two.index < pd.Timestamp('2026-10-13', tz=ET)] = np.nan
+    wide = pd.concat({'AAA': one, 'BBB': two}, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+    bars = resample_ohlcv(wide, '1h')
+    for symbol, frame in (('AAA', one), ('BBB', two)):
+        expected = resample_ohlcv(frame, '1h')
+        actual = bars.xs(symbol, axis=1, level=1)[list(AGGREGATIONS)].dropna(how='all')
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False, check_names=False)
+
+
+def test_can_resample_only_exact_multiples():
+    assert can_resample('5m', '15m')
+    assert can_resample('1h', '60m')
+    assert not can_resample('1h', '90m')
+    assert not can_resample('5m', '1m')
+    assert can_resample('1d', '1wk')
+    assert not can_resample('1h', '1d')
+
+
+def test_hourly_and_minute_bases(tmp_path):
+    provider = MultiResolutionProvider(CachedProvider(SyntheticProvider(), OHLCVStore(str(tmp_path))))
+    now = pd.Timestamp.now(tz='UTC')
+
+    # hourly bars are fetched as hourly bars, not built from twelve times as many 5m bars
+    assert provider.source_interval('AAA', '1h', now - pd.Timedelta(days=30)) == '1h'
+    # one minute-bar request reaches back a week
+    assert provider.source_interval('AAA', '2m', now - pd.Timedelta(days=3)) == '1m'
+    assert provider.source_interval('AAA', '2m', now - pd.Timedelta(days=10)) == '2m'
@@ -0,0 +1,167 @@
+# tests for the HTTP service, run against the synthetic provider through a local HTTP client
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from src.ohlcv_store import OHLCVStore
+from src.providers.synthetic import SyntheticProvider
+from src.server import SingleFlight, StockService
+from src.stock_analysis import StockAnalysis
+from utils.logging import FailureJournal
+
+
+def request(port: int, path: str, method: str = 'GET'):
+    """(status, decoded JSON body) for one request"""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(f"http://127.0.0.1:{port}{path}", method=method)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def analysis(tmp_path):
+    return StockAnalysis(SyntheticProvider(), OHLCVStore(str(tmp_path / 'ohlcv')),
+                         FailureJournal(str(tmp_path / 'failures.jsonl')))
+
+
+@pytest.fixture
+def serve():
+    services = []
+
+    def start(analysis, **options):
+        service = StockService(analysis, **options)
+        services.append(service)
+        return service, service.run_in_thread()
+
+    yield start
+    for service in services:
+        service.close()
+
+
+class SlowAnalysis:
+    """stands in for StockAnalysis: counts scans, each taking `delay` seconds"""
+
+    def __init__(self, delay: float = 0.3):
+        self.delay = delay
+        self.scans = 0
+
+    def get_gainers_losers(self, period, limit, analyze_sp500):
+        self.scans += 1
+        time.sleep(self.delay)
+        rows = pd.DataFrame({'Symbol': ['AAA'], 'Change%': [1.0]})
+        return rows, rows, 1
+
+
+def test_movers_and_history(analysis, serve):
+    _, port = serve(analysis)
+
+    status, body = request(port, '/movers?period=1mo&limit=5')
+    assert status == 200
+    assert len(body['gainers']) == len(body['losers']) == 5
+    assert body['count'] == 500
+
+    status, body = request(port, '/history/AAPL?period=6mo')
+    assert status == 200
+    assert body['ticker'] == 'AAPL'
+    assert body['bars'][-1]['SMA_50'] is not None
+
+
+@pytest.mark.parametrize('path, method, status', [
+    ('/nowhere', 'GET', 404),
+    ('/movers?period=2w', 'GET', 400),
+    ('/movers?limit=0', 'GET', 400),
+    ('/movers?limit=ten', 'GET', 400),
+    ('/volatility?limit=-1', 'GET', 400),
+    ('/history', 'GET', 400),
+    ('/custom-period?start=2026-10-01', 'GET', 400),
+    ('/movers', 'POST', 405),
+])
+def test_error_status_codes(analysis, serve, path, method, status):
+    _, port = serve(analysis)
+    code, body = request(port, path, method)
+    assert code == status
+    assert body['error']
+
+
+def test_concurrent_requests_share_one_scan(serve):
+    analysis = SlowAnalysis()
+    service, port = serve(analysis)
+    statuses = []
+    clients = [threading.Thread(target=lambda: statuses.append(request(port, '/movers?period=5d')[0]))
+               for _ in range(4)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+
+    assert statuses == [200] * 4
+    assert analysis.scans == 1
+    assert request(port, '/health')[1]['coalesced'] == 3
+
+
+def test_results_expire_after_ttl(serve):
+    analysis = SlowAnalysis(delay=0.0)
+    _, port = serve(analysis, result_ttl=0.3)
+
+    request(port, '/movers?period=5d')
+    request(port, '/movers?period=5d')
+    assert analysis.scans == 1
+    time.sleep(0.4)
+    request(port, '/movers?period=5d')
+    assert analysis.scans == 2
+    # a different request never shares a result
+    request(port, '/movers?period=5d&limit=3')
+    assert analysis.scans == 3
+
+
+def test_single_flight_evicts_expired_and_excess_results():
+    async def run():
+        flights = SingleFlight(ttl=0.2, max_results=3)
+
+        async def call():
+            return 1
+
+        for key in range(5):
+            await flights.run((key,), call)
+        assert list(flights._results) == [(2,), (3,), (4,)]
+        await asyncio.sleep(0.25)
+        await flights.run(('new',), call)
+        assert list(flights._results) == [('new',)]
+
+    asyncio.run(run())
+
+
+def test_concurrent_chart_lookups(analysis, serve):
+    _, port = serve(analysis, workers=4)
+    results = []
+    clients = [threading.Thread(target=lambda period=period: results.append(request(port, f'/history/MSFT?period={period}')[0]))
+               for period in ('1mo', '3mo', '6mo', '1y') * 2]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    assert results == [200] * 8
+
+
+def test_chart_indicator_cache_is_bounded_and_dropped_on_readjustment(analysis):
+    analysis.chart_indicator_limit = 2
+    analysis.display_stock_graph('AAA', '1y')
+    first = analysis._chart_indicators[('AAA', '1y')]
+    analysis.display_stock_graph('AAA', '1y')
+    assert analysis._chart_indicators[('AAA', '1y')][2] is first[2]
+
+    # upstream re-adjusted AAA's history, so its cached averages are rebuilt
+    analysis.cached_provider.generations['AAA'] += 1
+    analysis.display_stock_graph('AAA', '1y')
+    assert analysis._chart_indicators[('AAA', '1y')][2] is not first[2]
+
+    analysis.display_stock_graph('BBB', '1y')
+    analysis.display_stock_graph('CCC', '1y')
+    assert list(analysis._chart_indicators) == [('BBB', '1y'), ('CCC', '1y')]
@@ -1,5 +1,11 @@
 # import required modules
-from typing import Dict
+import os
+from typing import Dict, List
+
+# on-disk cache root for price history, symbol lists and calendars
+CACHE_DIR: str = os.environ.get(
+    "STOCK_ANALYZER_CACHE", os.path.join(os.path.expanduser("~"), ".stock_analyzer")
+)
 
 # menu options
 class MenuOptions:
@@ -8,6 +14,8 @@ class MenuOptions:
     STOCK_INFO = "3"
     OPTIONS = "4"
     GRAPH = "5"
+    VOLATILITY = "6"
+    LIVE_MONITOR = "7"
     EXIT = "0"
 
 # intraday time periods
@@ -36,4 +44,19 @@ REGULAR_PERIODS: Dict[str, str] = {
 }
 
 # combine all periods
-TIME_PERIODS: Dict[str, str] = {**INTRADAY_PERIODS, **REGULAR_PERIODS}
\ No newline at end of file
+TIME_PERIODS: Dict[str, str] = {**INTRADAY_PERIODS, **REGULAR_PERIODS}
+
+# price fields every provider returns
+PRICE_FIELDS: List[str] = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# minutes of trading each intraday period covers
+INTRADAY_PERIOD_MINUTES: Dict[str, int] = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "12h": 720}
+
+# periods counted in trading sessions; longer ones are calendar spans ending at the last session
+SESSION_PERIODS: Dict[str, int] = {"1d": 1, "5d": 5}
+
+# calendar days each yfinance period reaches back ("ytd" is computed, "max" ~20 years)
+PERIOD_DAYS: Dict[str, int] = {
+    "1d": 1, "5d": 7, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653, "max": 7305,
+}
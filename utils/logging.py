@@ -1,4 +1,269 @@
-def log_failed_analysis(symbol: str, period: str, error: str) -> None:
+# import required modules
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from utils.constants import CACHE_DIR
+
+# journal fields a query can group by
+GROUP_FIELDS = ('symbol', 'period', 'error_class', 'source')
+# failures from open-ended movers/volatility scans; only these can exclude a symbol from later scans
+# (custom date windows and chart renders miss valid symbols for reasons of their own)
+SCAN_SOURCE = 'scan'
+
+
+def classify_error(error: str) -> str:
+    """coarse error class for grouping, e.g. 'ValueError: No data for X' -> 'ValueError'"""
+    text = (error or '').strip()
+    lowered = text.lower()
+    if 'rate limit' in lowered or 'too many requests' in lowered:
+        return 'RateLimit'
+    if 'timeout' in lowered or 'timed out' in lowered:
+        return 'Timeout'
+    if 'no data' in lowered or 'not priced' in lowered or 'delisted' in lowered:
+        return 'NoData'
+    head = text.split(':', 1)[0]
+    # "SomeError: message" keeps the exception name, free text falls into one bucket
+    return head if head and ' ' not in head and len(head) < 40 else 'Other'
+
+
+class FailureJournal:
+    """structured (JSONL) log of failed lookups, written in the background
+
+    `record` only puts the entry on a queue, so scans never wait on the
+    disk; a writer thread appends batches every `flush_interval` seconds.
+    The file rotates to failures.jsonl.1, .2, ... once it passes `max_bytes`
+    or `max_age` seconds, keeping `backups` old files. Scan failures are
+    also kept in memory for `systematic_failures`, so scans never read it.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 5 * 2 ** 20,
+                 max_age: float = 7 * 24 * 3600, backups: int = 5, flush_interval: float = 1.0):
+        self.path = path or os.path.join(CACHE_DIR, 'failures', 'failures.jsonl')
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: 'queue.Queue[Dict[str, Any]]' = queue.Queue(maxsize=100_000)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # symbol -> [(ts, scan_failure_rate)] of scan failures; loaded from disk on first use
+        self._scan_failures: Optional[Dict[str, List[tuple]]] = None
+        # batches written while that first load reads the files
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._index_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    # --- writing ----------------------------------------------------------
+
+    def record(self, symbol: str, period: str, error: str, source: str = 'analysis', **fields):
+        """queue one failure; never blocks (entries are dropped if the queue is full)"""
+        entry = {
+            'ts': time.time(),
+            'symbol': symbol,
+            'period': period,
+            'error': error,
+            'error_class': classify_error(error),
+            'source': source,
+            **fields,
+        }
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def record_many(self, symbols: Iterable[str], period: str, error: str, source: str = SCAN_SOURCE, **fields):
+        for symbol in symbols:
+            self.record(symbol, period, error, source, **fields)
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name='failure-journal', daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            entries = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # gather whatever else arrives within the flush interval into one write
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entries.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(entries)
+            for _ in entries:
+                self._queue.task_done()
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._rotate_if_needed()
+            with open(self.path, 'a') as f:
+                f.write(''.join(json.dumps(entry, default=str) + '\n' for entry in entries))
+        except OSError:
+            # the journal is best effort; losing it must not break a scan
+            self.dropped += len(entries)
+        # after the write, so a batch a first load misses on disk is always in pending; a batch
+        # seen in both only repeats days already counted
+        with self._index_lock:
+            if self._scan_failures is not None:
+                _index(entries, self._scan_failures)
+            elif self._pending is not None:
+                self._pending.extend(entries)
+
+    def _rotate_if_needed(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        started = self._first_timestamp(self.path) or stat.st_mtime
+        if stat.st_size < self.max_bytes and time.time() - started < self.max_age:
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    @staticmethod
+    def _first_timestamp(path: str) -> Optional[float]:
+        try:
+            with open(path) as f:
+                return json.loads(f.readline()).get('ts')
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def flush(self):
+        """wait until everything recorded so far is on disk"""
+        if self._writer is not None:
+            self._queue.join()
+
+    # --- querying ---------------------------------------------------------
+
+    def files(self) -> List[str]:
+        """journal files, oldest first"""
+        rotated = [path for path in glob.glob(self.path + '.*') if path.rsplit('.', 1)[1].isdigit()]
+        rotated.sort(key=lambda path: int(path.rsplit('.', 1)[1]), reverse=True)
+        return rotated + ([self.path] if os.path.exists(self.path) else [])
+
+    def entries(self, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """every journaled failure (optionally only those after `since`), oldest first"""
+        self.flush()
+        return self._read(since)
+
+    def _read(self, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        for path in self.files():
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if since is None or entry.get('ts', 0) >= since:
+                        yield entry
+
+    def summary(self, by: Iterable[str] = ('symbol',), since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """failure counts grouped by the given fields, most frequent first"""
+        by = list(by)
+        invalid = [name for name in by if name not in GROUP_FIELDS]
+        if invalid:
+            raise ValueError(f"Invalid group field {', '.join(invalid)}. Must be one of {list(GROUP_FIELDS)}")
+
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for entry in self.entries(since):
+            key = tuple(entry.get(name) for name in by)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {**dict(zip(by, key)), 'failures': 0, 'first_seen': entry['ts'],
+                                       'last_seen': entry['ts'], 'last_error': entry.get('error')}
+            group['failures'] += 1
+            group['last_seen'] = max(group['last_seen'], entry['ts'])
+            group['last_error'] = entry.get('error')
+
+        rows = sorted(groups.values(), key=lambda group: (-group['failures'], -group['last_seen']))
+        for row in rows:
+            row['first_seen'] = datetime.fromtimestamp(row['first_seen']).isoformat(timespec='seconds')
+            row['last_seen'] = datetime.fromtimestamp(row['last_seen']).isoformat(timespec='seconds')
+        return rows
+
+    def systematic_failures(self, min_days: int = 3, window_days: float = 14,
+                            max_scan_failure_rate: float = 0.5) -> Set[str]:
+        """symbols that failed open-ended scans on at least `min_days` separate days within the window
+
+        Scans where most symbols failed (an outage, a closed market) say
+        nothing about individual symbols and are ignored. Answered from
+        memory: the journal is read once and the writer keeps it current.
+        """
+        if self._scan_failures is None:
+            self._load_scan_failures()
+        now = time.time()
+        with self._index_lock:
+            # failures past what rotation keeps on disk are forgotten here too
+            retained = now - self.max_age * (self.backups + 1)
+            cutoff = now - window_days * 86400
+            days: Dict[str, Set[str]] = defaultdict(set)
+            for symbol, failures in self._scan_failures.items():
+                failures[:] = [failure for failure in failures if failure[0] >= retained]
+                for ts, rate in failures:
+                    if ts >= cutoff and rate <= max_scan_failure_rate:
+                        days[symbol].add(datetime.fromtimestamp(ts).date().isoformat())
+        return {symbol for symbol, seen in days.items() if len(seen) >= min_days}
+
+    def _load_scan_failures(self):
+        """read the journal files once, without holding the lock the writer needs"""
+        with self._load_lock:
+            if self._scan_failures is not None:
+                return
+            with self._index_lock:
+                self._pending = []
+            loaded: Dict[str, List[tuple]] = defaultdict(list)
+            _index(self._read(), loaded)
+            with self._index_lock:
+                _index(self._pending, loaded)
+                self._pending = None
+                self._scan_failures = loaded
+
+
+def _index(entries: Iterable[Dict[str, Any]], index: Dict[str, List[tuple]]):
+    """add scan failures to the in-memory index behind systematic_failures"""
+    for entry in entries:
+        if entry.get('source') == SCAN_SOURCE:
+            index[entry['symbol']].append((entry['ts'], entry.get('scan_failure_rate', 0)))
+
+
+_journal: Optional[FailureJournal] = None
+
+
+def get_failure_journal() -> FailureJournal:
+    """process-wide failure journal"""
+    global _journal
+    if _journal is None:
+        _journal = FailureJournal()
+    return _journal
+
+
+def log_failed_analysis(symbol: str, period: str, error: str, source: str = 'analysis') -> None:
     """Log failed analysis attempts"""
-    with open('failed_analysis.txt', 'a') as f:
-        f.write(f"{symbol}: {error}\n") 
\ No newline at end of file
+    get_failure_journal().record(symbol, period, error, source)
@@ -0,0 +1,148 @@
+# import required modules
+import os
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Union
+import numpy as np
+import pytz
+
+from utils.constants import CACHE_DIR
+
+ET_TZ = pytz.timezone('US/Eastern')
+DateLike = Union[date, datetime, str]
+
+
+class TradingCalendar:
+    """NYSE sessions precomputed into sorted NumPy arrays and answered by binary search
+
+    days holds each session's exchange-local date (days since epoch); opens and
+    closes hold the session bounds in UTC nanoseconds.
+    """
+
+    def __init__(self, days: np.ndarray, opens: np.ndarray, closes: np.ndarray):
+        self.days = days
+        self.opens = opens
+        self.closes = closes
+
+    @classmethod
+    def build(cls, start: date, end: date, exchange: str = 'NYSE') -> 'TradingCalendar':
+        """construct the session arrays from pandas_market_calendars (slow, done once)"""
+        import pandas_market_calendars as mcal
+
+        schedule = mcal.get_calendar(exchange).schedule(start_date=start, end_date=end)
+        days = schedule.index.values.astype('datetime64[D]').astype(np.int64)
+        opens = schedule['market_open'].dt.tz_convert('UTC').dt.tz_localize(None).values.astype('datetime64[ns]').astype(np.int64)
+        closes = schedule['market_close'].dt.tz_convert('UTC').dt.tz_localize(None).values.astype('datetime64[ns]').astype(np.int64)
+        return cls(days, opens, closes)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['TradingCalendar']:
+        try:
+            with np.load(path) as data:
+                return cls(data['days'], data['opens'], data['closes'])
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, days=self.days, opens=self.opens, closes=self.closes)
+        os.replace(tmp_path, path)
+
+    def covers(self, day: date) -> bool:
+        return len(self.days) > 0 and self.days[0] <= _day_number(day) <= self.days[-1]
+
+    def is_session(self, day: DateLike) -> bool:
+        """whether the exchange trades on this date"""
+        number = _day_number(_local_date(day))
+        i = np.searchsorted(self.days, number)
+        return i < len(self.days) and self.days[i] == number
+
+    def is_open(self, moment: Optional[datetime] = None) -> bool:
+        """whether the exchange is inside a session at this instant"""
+        ns = _utc_ns(moment)
+        # last session opening at or before the instant
+        i = np.searchsorted(self.opens, ns, side='right') - 1
+        return i >= 0 and ns <= self.closes[i]
+
+    def last_session(self, day: DateLike) -> Optional[Tuple[date, datetime, datetime]]:
+        """(date, open, close) of the latest session on or before this date"""
+        i = np.searchsorted(self.days, _day_number(_local_date(day)), side='right') - 1
+        return self._session(i) if i >= 0 else None
+
+    def latest_session(self, moment: Optional[datetime] = None) -> Optional[Tuple[date, datetime, datetime]]:
+        """(date, open, close) of the latest session that opened at or before this instant"""
+        i = np.searchsorted(self.opens, _utc_ns(moment), side='right') - 1
+        return self._session(i) if i >= 0 else None
+
+    def sessions_before(self, moment: Optional[datetime], count: int) -> np.ndarray:
+        """dates of the last `count` sessions that opened at or before this instant, as datetime64[D]"""
+        i = int(np.searchsorted(self.opens, _utc_ns(moment), side='right'))
+        return self.days[max(i - count, 0):i].astype('datetime64[D]')
+
+    def next_session(self, day: DateLike) -> Optional[Tuple[date, datetime, datetime]]:
+        """(date, open, close) of the earliest session on or after this date"""
+        i = np.searchsorted(self.days, _day_number(_local_date(day)), side='left')
+        return self._session(i) if i < len(self.days) else None
+
+    def sessions_between(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """session dates in [start, end] as datetime64[D]"""
+        lo = np.searchsorted(self.days, _day_number(_local_date(start)), side='left')
+        hi = np.searchsorted(self.days, _day_number(_local_date(end)), side='right')
+        return self.days[lo:hi].astype('datetime64[D]')
+
+    def _session(self, i: int) -> Tuple[date, datetime, datetime]:
+        day = self.days[i].astype('datetime64[D]').item()
+        return day, _from_ns(self.opens[i]), _from_ns(self.closes[i])
+
+
+def _day_number(day: date) -> int:
+    return (day - date(1970, 1, 1)).days
+
+
+def _local_date(value: DateLike) -> date:
+    """exchange-local calendar date of a date, datetime or YYYY-MM-DD string"""
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(ET_TZ)
+        return value.date()
+    return value
+
+
+def _utc_ns(moment: Optional[datetime]) -> int:
+    """UTC nanoseconds of an instant; naive datetimes are exchange-local"""
+    if moment is None:
+        moment = datetime.now(pytz.utc)
+    elif moment.tzinfo is None:
+        moment = ET_TZ.localize(moment)
+    return int(moment.timestamp() * 1_000_000) * 1000
+
+
+def _from_ns(ns: np.int64) -> datetime:
+    return datetime.fromtimestamp(int(ns) / 1e9, tz=pytz.utc)
+
+
+_calendar: Optional[TradingCalendar] = None
+
+
+def get_trading_calendar(day: Optional[date] = None) -> TradingCalendar:
+    """process-wide NYSE calendar, loaded from disk or built once and cached there
+
+    The cached range runs from 1990 to two years past today and is rebuilt when
+    a lookup falls outside it.
+    """
+    global _calendar
+    day = day or datetime.now(ET_TZ).date()
+    if _calendar is not None and _calendar.covers(day):
+        return _calendar
+
+    path = os.path.join(CACHE_DIR, 'calendar', 'nyse.npz')
+    calendar = TradingCalendar.load(path)
+    if calendar is None or not calendar.covers(day) or not calendar.covers(datetime.now(ET_TZ).date()):
+        start = min(date(1990, 1, 1), day)
+        end = max(datetime.now(ET_TZ).date() + timedelta(days=730), day + timedelta(days=30))
+        calendar = TradingCalendar.build(start, end)
+        calendar.save(path)
+    _calendar = calendar
+    return calendar
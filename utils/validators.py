@@ -1,45 +1,35 @@
 # import required modules
 from datetime import datetime, timedelta
-import yfinance as yf
-import time
-import pandas_market_calendars as mcal
+from typing import Dict, List
 import pytz
 
+# the calendar (numpy) and symbol index (pandas, provider) load on first use
+
 def validate_ticker(ticker: str) -> bool:
     """check if ticker exists"""
     # check for empty ticker
     if not ticker:
         raise ValueError("Ticker symbol cannot be empty")
         
+    from src.symbol_index import get_symbol_index
+    
     ticker = ticker.upper()
-    max_retries = 3
-    retry_delay = 1  # seconds
+    index = get_symbol_index()
     
-    # try multiple times to validate ticker
-    for attempt in range(max_retries):
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            
-            # check if valid data returned
-            if info and isinstance(info, dict):
-                if any([
-                    info.get('regularMarketPrice'),
-                    info.get('currentPrice'),
-                    info.get('ask'),
-                    info.get('bid')
-                ]):
-                    return True
-            
-            time.sleep(retry_delay)
-            
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-            continue
+    # known tickers are answered in memory; unknown ones get a single probe
+    if index.is_valid(ticker):
+        return True
     
+    suggestions = index.suggest(ticker)
+    if suggestions:
+        raise ValueError(f"Invalid ticker symbol: {ticker}. Did you mean: {', '.join(suggestions)}?")
     raise ValueError(f"Invalid ticker symbol: {ticker}")
 
+def validate_tickers(tickers: List[str]) -> Dict[str, bool]:
+    """check many tickers at once, probing the network only for unknown ones"""
+    from src.symbol_index import get_symbol_index
+    return get_symbol_index().validate_many(tickers)
+
 def validate_dates(start_date: str, end_date: str) -> tuple[str, str]:
     """Validate and adjust dates for stock data availability."""
     try:
@@ -69,7 +59,6 @@ def validate_dates(start_date: str, end_date: str) -> tuple[str, str]:
 
 def is_market_open(check_date: datetime = None) -> bool:
     """Check if the market is open on a given date"""
-    nyse = mcal.get_calendar('NYSE')
     et_tz = pytz.timezone('US/Eastern')
     
     if check_date is None:
@@ -77,27 +66,21 @@ def is_market_open(check_date: datetime = None) -> bool:
     elif check_date.tzinfo is None:
         check_date = et_tz.localize(check_date)
     
-    # Get market schedule for the date
-    schedule = nyse.schedule(
-        start_date=check_date.date(),
-        end_date=check_date.date()
-    )
+    from utils.trading_calendar import get_trading_calendar
+    calendar = get_trading_calendar(check_date.date())
     
     # Check if market is open on this date
-    if schedule.empty:
+    if not calendar.is_session(check_date):
         return False
         
     # For current date, also check current time
     if check_date.date() == datetime.now(et_tz).date():
-        market_open = schedule.iloc[0]['market_open'].to_pydatetime()
-        market_close = schedule.iloc[0]['market_close'].to_pydatetime()
-        return market_open <= check_date <= market_close
+        return calendar.is_open(check_date)
         
     return True
 
 def get_last_trading_day(check_date: datetime = None) -> datetime:
     """Get the most recent trading day"""
-    nyse = mcal.get_calendar('NYSE')
     et_tz = pytz.timezone('US/Eastern')
     
     if check_date is None:
@@ -105,11 +88,11 @@ def get_last_trading_day(check_date: datetime = None) -> datetime:
     elif check_date.tzinfo is None:
         check_date = et_tz.localize(check_date)
     
-    # Look back up to 10 days to find last trading day
-    start_date = check_date.date() - timedelta(days=10)
-    schedule = nyse.schedule(start_date=start_date, end_date=check_date.date())
+    from utils.trading_calendar import get_trading_calendar
     
-    if not schedule.empty:
-        return schedule.iloc[-1]['market_close'].to_pydatetime()
+    # Look back up to 10 days to find last trading day
+    session = get_trading_calendar(check_date.date()).last_session(check_date)
+    if session is not None and session[0] >= check_date.date() - timedelta(days=10):
+        return session[2]
     
     raise ValueError("Could not determine last trading day")
\ No newline at end of file